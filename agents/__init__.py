@@ -3,17 +3,25 @@ HempQuarterz AI Agents
 Complete autonomous agent system for hemp business automation
 """
 
-from .core.base_agent import BaseAgent, rate_limited, track_performance
-from .core.orchestrator import Orchestrator
-from .research.research_agent import ResearchAgent
-from .content.content_agent import ContentAgent
-from .seo.seo_agent import SEOAgent
-from .outreach.outreach_agent import OutreachAgent
-from .monetization.monetization_agent import MonetizationAgent
-from .compliance.compliance_agent import ComplianceAgent
+import importlib
 
 __version__ = "1.0.0"
 
+# Exports are imported on first access, so importing a submodule such as
+# ``agents.utils.near_duplicates`` does not pull in every agent's dependencies
+_EXPORTS = {
+    "BaseAgent": ("core.base_agent", "BaseAgent"),
+    "rate_limited": ("core.base_agent", "rate_limited"),
+    "track_performance": ("core.base_agent", "track_performance"),
+    "Orchestrator": ("core.orchestrator", "HQzOrchestrator"),
+    "ResearchAgent": ("research.research_agent", "HempResearchAgent"),
+    "ContentAgent": ("content.content_agent", "HempContentAgent"),
+    "SEOAgent": ("seo.seo_agent", "HempSEOAgent"),
+    "OutreachAgent": ("outreach.outreach_agent", "OutreachAgent"),
+    "MonetizationAgent": ("monetization.monetization_agent", "MonetizationAgent"),
+    "ComplianceAgent": ("compliance.compliance_agent", "ComplianceAgent"),
+}
+
 __all__ = [
     "BaseAgent",
     "Orchestrator",
@@ -28,16 +36,27 @@ __all__ = [
 ]
 
 # Agent registry for dynamic loading
-AGENT_REGISTRY = {
-    "orchestrator": Orchestrator,
-    "research": ResearchAgent,
-    "content": ContentAgent,
-    "seo": SEOAgent,
-    "outreach": OutreachAgent,
-    "monetization": MonetizationAgent,
-    "compliance": ComplianceAgent
+_REGISTRY_EXPORTS = {
+    "orchestrator": "Orchestrator",
+    "research": "ResearchAgent",
+    "content": "ContentAgent",
+    "seo": "SEOAgent",
+    "outreach": "OutreachAgent",
+    "monetization": "MonetizationAgent",
+    "compliance": "ComplianceAgent"
 }
 
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        module_name, attr = _EXPORTS[name]
+        value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+        globals()[name] = value
+        return value
+    if name == "AGENT_REGISTRY":
+        return {key: __getattr__(export) for key, export in _REGISTRY_EXPORTS.items()}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_agent(agent_name: str, config: dict):
     """
     Factory function to get an agent instance by name
@@ -52,8 +71,9 @@ def get_agent(agent_name: str, config: dict):
     Raises:
         ValueError: If agent_name is not found in registry
     """
-    agent_class = AGENT_REGISTRY.get(agent_name.lower())
-    if not agent_class:
-        raise ValueError(f"Unknown agent: {agent_name}. Available agents: {list(AGENT_REGISTRY.keys())}")
+    export = _REGISTRY_EXPORTS.get(agent_name.lower())
+    if not export:
+        raise ValueError(f"Unknown agent: {agent_name}. Available agents: {list(_REGISTRY_EXPORTS.keys())}")
+    agent_class = __getattr__(export)
     
     return agent_class(config)
\ No newline at end of file
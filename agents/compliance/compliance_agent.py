@@ -17,9 +17,22 @@ from bs4 import BeautifulSoup
 
 from ..core.base_agent import BaseAgent, rate_limited, track_performance
 from ..utils.ai_utils import get_ai_client, AIProvider
+from ..utils.prompt_budget import PromptBuilder
+from ..research.scrapers.government_scraper import GovernmentScraper
 
 logger = logging.getLogger(__name__)
 
+# Report sections sent for the executive summary, most important first
+SUMMARY_SECTIONS = (
+    'summary',
+    'violations',
+    'recommendations',
+    'upcoming_changes',
+    'regulatory_updates',
+    'product_compliance',
+    'platform_compliance',
+)
+
 @dataclass
 class ComplianceCheck:
     """Represents a compliance check result"""
@@ -56,6 +69,7 @@ class ComplianceAgent(BaseAgent):
         }
         self.email_service = config.get('email_service')
         self.slack_webhook = config.get('slack_webhook_url')
+        self.government_scraper = GovernmentScraper()
         
     @track_performance
     @rate_limited(calls_per_minute=10)
@@ -68,9 +82,13 @@ class ComplianceAgent(BaseAgent):
             # Get list of jurisdictions to monitor
             jurisdictions = await self._get_monitored_jurisdictions()
             
+            # Only new or changed items come back, so impact analysis below
+            # runs on real changes rather than everything on the page
+            scraped_changes = await self.government_scraper.scrape_changes()
+            
             for jurisdiction in jurisdictions:
                 # Check for updates from regulatory sources
-                jurisdiction_changes = await self._check_jurisdiction_updates(jurisdiction)
+                jurisdiction_changes = await self._check_jurisdiction_updates(jurisdiction, scraped_changes)
                 if jurisdiction_changes:
                     changes.extend(jurisdiction_changes)
                     
@@ -79,10 +97,15 @@ class ComplianceAgent(BaseAgent):
                 impact_analysis = await self._analyze_regulatory_impact(changes)
                 await self._store_regulatory_updates(changes, impact_analysis)
                 await self._send_regulatory_alerts(impact_analysis)
-                
+            
+            # Fingerprints are only recorded once the changes are stored, so
+            # a failure above reports them again on the next run
+            self.government_scraper.ack_changes()
             return changes
             
         except Exception as e:
+            if self.government_scraper.change_tracker is not None:
+                self.government_scraper.change_tracker.discard()
             logger.error(f"Error monitoring regulatory changes: {str(e)}")
             raise
             
@@ -201,11 +224,20 @@ class ComplianceAgent(BaseAgent):
             # Store report
             await self._store_compliance_report(report)
             
-            # Use AI to generate executive summary
+            # Use AI to generate executive summary from the report sections
+            # that matter most, compacted to fit the summary budget
+            builder = PromptBuilder.for_purpose('compliance_summary')
+            for priority, section in enumerate(SUMMARY_SECTIONS):
+                builder.add(section, report.get(section), priority=priority)
+            report_sections = '\n'.join(
+                f"{section}: {text}" for section, text in builder.build().items() if text
+            )
+            
             ai_client = get_ai_client(AIProvider.CLAUDE)
             executive_summary = await ai_client.generate_text(
-                f"""Generate an executive summary for this compliance report:
-                {json.dumps(report, indent=2)}
+                f"""Generate an executive summary for this compliance report
+                (period {report['period']['start']} to {report['period']['end']}):
+                {report_sections}
                 
                 Focus on:
                 1. Key compliance risks
@@ -269,11 +301,21 @@ class ComplianceAgent(BaseAgent):
         result = self.supabase.table('regulatory_jurisdictions').select('*').eq('active', True).execute()
         return result.data
         
-    async def _check_jurisdiction_updates(self, jurisdiction: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Check for regulatory updates in a specific jurisdiction"""
-        # This would integrate with regulatory APIs or web scraping
-        # For now, returns mock data
-        return []
+    async def _check_jurisdiction_updates(
+        self,
+        jurisdiction: Dict[str, Any],
+        scraped_changes: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Select the new or changed regulatory updates for a specific jurisdiction"""
+        names = {
+            str(jurisdiction.get(field)).lower()
+            for field in ('name', 'code', 'jurisdiction')
+            if jurisdiction.get(field)
+        }
+        return [
+            change for change in scraped_changes
+            if change.get('jurisdiction', '').lower() in names
+        ]
         
     async def _check_stripe_compliance(self) -> List[ComplianceCheck]:
         """Check Stripe payment processing compliance"""
@@ -19,6 +19,8 @@ from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 
+from .utils.near_duplicates import load_product_index
+
 # Load environment variables
 load_dotenv()
 
@@ -42,6 +44,7 @@ class HempProductDiscoveryAgent:
         self.supabase = supabase
         self.discovered_products = []
         self.coverage_gaps = []
+        self.dedup_index = load_product_index(supabase)
         
     async def analyze_coverage(self) -> Dict[str, Any]:
         """Analyze current product coverage and identify gaps"""
@@ -227,6 +230,15 @@ class HempProductDiscoveryAgent:
                     "name", product['plant_part']
                 ).execute().data[0]
                 
+                # Skip near-duplicates of the same plant part that differ only in wording
+                duplicate = self.dedup_index.find_duplicate(
+                    product['name'], product.get('description', ''), group=plant_part['id']
+                )
+                if duplicate:
+                    logger.info(f"Skipping {product['name']}: near-duplicate of {duplicate['name']}")
+                    skipped += 1
+                    continue
+                
                 industry = self.supabase.table("industries").select("id").eq(
                     "name", product['industry']
                 ).execute().data[0]
@@ -244,9 +256,13 @@ class HempProductDiscoveryAgent:
                 }
                 
                 # Insert product
-                self.supabase.table("uses_products").insert(product_data).execute()
+                result = self.supabase.table("uses_products").insert(product_data).execute()
                 saved += 1
                 
+                if result.data:
+                    self.dedup_index.add(result.data[0]['id'], product['name'], product_data['description'],
+                                         group=plant_part['id'])
+                
             except Exception as e:
                 logger.error(f"Error saving product {product.get('name', 'Unknown')}: {e}")
                 errors += 1
@@ -1,19 +1,42 @@
 """Hemp Content Agent - Generates optimized content for various platforms."""
 
 import asyncio
+import inspect
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import uuid
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-import yaml
-from pathlib import Path
 
 from ..core.base_agent import BaseAgent, rate_limited, track_performance
+from ..utils.embeddings import ProductSimilaritySearch
+from ..utils.near_duplicates import ContentDedupIndex, hamming
+from ..utils.prompt_budget import PromptBuilder
+from ..utils.prompt_registry import get_prompt_registry
+from ..utils.rate_budget import RateBudget
+from .generation_cache import GenerationCache
+from .rescoring import SCORED_CONTENT_TYPES, ContentRescorer
 from .seo_optimizer import SEOOptimizer
 from .templates import BlogPostTemplate, ProductDescriptionTemplate, SocialMediaTemplate
 
 logger = logging.getLogger(__name__)
 
+# Per-platform limits checked on generated posts before they are accepted
+PLATFORM_RULES = {
+    'twitter': {'max_chars': 280, 'hashtags': '2-3', 'length': 'maximum 280 characters including hashtags'},
+    'linkedin': {'min_words': 80, 'max_words': 400, 'hashtags': '3-5', 'length': '150-300 words, professional B2B tone'},
+    'instagram': {'max_chars': 2200, 'hashtags': '10-15', 'length': '125-150 words, conversational with emoji'}
+}
+
+# Blog sections that depend on a single product field, matched by heading text;
+# changes to other fields regenerate the whole post
+BLOG_SECTION_FIELDS = {
+    'benefits_advantages': ('benefit', 'advantage'),
+    'sustainability_aspects': ('sustainab',),
+    'industry': ('application', 'use case', 'market'),
+    'plant_part': ('how it', 'made', 'process')
+}
+
 
 class HempContentAgent(BaseAgent):
     """Agent responsible for generating SEO-optimized content about hemp products."""
@@ -22,7 +45,12 @@ class HempContentAgent(BaseAgent):
         super().__init__(supabase_client, ai_provider)
         self.seo_optimizer = SEOOptimizer()
         self.templates = self._load_templates()
-        self.prompts = self._load_prompts()
+        self.product_similarity = ProductSimilaritySearch(self.ai_provider)
+        self.generation_cache = GenerationCache(
+            supabase_client, lambda: get_prompt_registry().version('content')
+        )
+        self.content_dedup = ContentDedupIndex()
+        self._content_dedup_seeded = False
         
     def _load_templates(self) -> Dict:
         """Load content templates."""
@@ -32,13 +60,17 @@ class HempContentAgent(BaseAgent):
             'social_media': SocialMediaTemplate()
         }
     
+    @property
+    def prompts(self) -> Dict:
+        """Content prompts, following hot reloads of the YAML file."""
+        return self._load_prompts()
+    
     def _load_prompts(self) -> Dict:
-        """Load prompt templates from YAML."""
-        prompts_path = Path(__file__).parent.parent.parent / 'config' / 'prompts' / 'content_prompts.yaml'
+        """Load prompt templates from the shared prompt registry."""
+        prompts = get_prompt_registry().section('content')
         
-        if prompts_path.exists():
-            with open(prompts_path, 'r') as f:
-                return yaml.safe_load(f)
+        if prompts:
+            return prompts
         else:
             logger.warning("Content prompts file not found, using defaults")
             return self._default_prompts()
@@ -69,7 +101,9 @@ class HempContentAgent(BaseAgent):
             'generate_social_media': self.generate_social_media,
             'generate_email_content': self.generate_email_content,
             'optimize_existing_content': self.optimize_existing_content,
-            'generate_content_batch': self.generate_content_batch
+            'generate_content_batch': self.generate_content_batch,
+            'rescore_content': self.rescore_content,
+            'cluster_duplicate_content': self.cluster_duplicate_content
         }
         
         if action in content_actions:
@@ -83,6 +117,8 @@ class HempContentAgent(BaseAgent):
         product_id = params.get('product_id')
         word_count = params.get('word_count', 1500)
         tone = params.get('tone', 'informative')
+        use_cache = params.get('use_cache', True)
+        on_duplicate = params.get('on_duplicate', 'regenerate')
         
         if not product_id:
             raise ValueError("product_id is required")
@@ -94,11 +130,71 @@ class HempContentAgent(BaseAgent):
         if not product:
             raise ValueError(f"Product {product_id} not found")
         
+        # Reuse the stored draft when product and parameters are unchanged
+        cache_params = {'word_count': word_count, 'tone': tone}
+        cached = await self._cached_drafts('blog_post', product, cache_params) if use_cache else []
+        if cached:
+            post, content_id = cached[-1], cached[-1]['id']
+        else:
+            # Generate, optimize and score the post, then save it
+            post = await self._compose_blog_post(
+                product, word_count, tone, partial=params.get('partial', False)
+            )
+            
+            # Keep near-identical posts out of the corpus
+            _, duplicates = await self._drop_near_duplicates([post])
+            if duplicates and on_duplicate == 'regenerate':
+                logger.info(f"Blog post for product {product_id} duplicates {duplicates[0]['duplicate_of']}, regenerating")
+                post = await self._compose_blog_post(product, word_count, tone)
+                _, duplicates = await self._drop_near_duplicates([post])
+            if duplicates and on_duplicate != 'allow':
+                return {
+                    'status': 'duplicate',
+                    'duplicate_of': duplicates[0]['duplicate_of'],
+                    'title': post['title']
+                }
+            
+            content_id = (await self._save_generated_content(post))['id']
+        
+        return {
+            'status': 'completed',
+            'content_id': content_id,
+            'cached': bool(cached),
+            'title': post['title'],
+            'word_count': post['word_count'],
+            'seo_score': post['seo_score'],
+            'readability_score': post['readability_score'],
+            'keywords_used': (post.get('seo_keywords') or [])[:5],
+            'related_products': await self._related_products(product)
+        }
+    
+    async def _cached_drafts(self, content_type: str, product: Dict, cache_params: Dict) -> List[Dict]:
+        """Stored drafts generated from the same product fields, parameters and templates."""
+        drafts = await self.generation_cache.lookup(
+            self.generation_cache.key(content_type, product, cache_params)
+        )
+        if drafts:
+            logger.info(f"Reusing cached {content_type} for product {product['id']}")
+        return drafts
+    
+    async def _compose_blog_post(self, product: Dict, word_count: int = 1500,
+                                 tone: str = 'informative', partial: bool = False) -> Dict[str, Any]:
+        """Generate, SEO-optimize and score a blog post; returns the unsaved content row.
+        
+        With ``partial``, when only section-specific product fields changed
+        since the last draft, just those sections are rewritten.
+        """
+        cache_params = {'word_count': word_count, 'tone': tone}
+        
         # Get SEO keywords
         keywords = await self.seo_optimizer.research_keywords(product['name'])
         
         # Generate content using AI
-        content = await self._generate_blog_content(product, keywords, word_count, tone)
+        content = None
+        if partial:
+            content = await self._regenerate_changed_sections(product, cache_params)
+        if content is None:
+            content = await self._generate_blog_content(product, keywords, word_count, tone)
         
         # Optimize for SEO
         optimized_content = await self.seo_optimizer.optimize_content(
@@ -109,34 +205,125 @@ class HempContentAgent(BaseAgent):
         
         # Calculate scores
         seo_score = self.seo_optimizer.calculate_seo_score(optimized_content, keywords)
-        readability_score = self.seo_optimizer.calculate_readability_score(optimized_content['content'])
         
-        # Save to database
-        saved_content = await self._save_generated_content({
+        post = {
             'content_type': 'blog_post',
             'title': optimized_content['title'],
             'content': optimized_content['content'],
             'excerpt': optimized_content.get('excerpt', ''),
             'meta_description': optimized_content['meta_description'],
             'seo_keywords': keywords['all_keywords'],
-            'product_id': product_id,
-            'word_count': len(optimized_content['content'].split()),
+            'product_id': product['id'],
+            'word_count': optimized_content['word_count'],
             'seo_score': seo_score,
-            'readability_score': readability_score,
+            'readability_score': optimized_content['readability_score'],
             'tone': tone,
             'status': 'draft'
-        })
+        }
+        if content.get('revision_of') is not None:
+            # A spliced draft is meant to resemble the one it revises
+            post['metadata'] = {'revision_of': content['revision_of']}
+        return self.generation_cache.tag([post], 'blog_post', product, cache_params)[0]
+    
+    async def _regenerate_changed_sections(self, product: Dict, cache_params: Dict) -> Optional[Dict[str, Any]]:
+        """Rewrite only the blog sections affected by changed product fields.
+        
+        Returns None when a full regeneration is needed: no previous draft,
+        different parameters, or a change to a field every section uses.
+        """
+        previous = await self.generation_cache.latest('blog_post', product['id'])
+        if not previous:
+            return None
+        changed = self.generation_cache.changed_since(previous, 'blog_post', product, cache_params)
+        if not changed or any(field not in BLOG_SECTION_FIELDS for field in changed):
+            return None
+        
+        sections = self._split_sections(previous['content'])
+        markers = [marker for field in changed for marker in BLOG_SECTION_FIELDS[field]]
+        targets = {
+            str(i): section for i, section in enumerate(sections)
+            if section.startswith('## ') and any(m in section.split('\n', 1)[0].lower() for m in markers)
+        }
+        if not targets:
+            return None
         
+        logger.info(f"Regenerating {len(targets)} blog sections for product {product['id']} ({', '.join(changed)})")
+        prompt = f"""
+        Rewrite these sections of a blog post about {product['name']} so they reflect the updated product details.
+        Keep each heading, the tone and roughly the same length.
+        
+        Updated product details:
+        - Plant part: {product.get('plant_part')}
+        - Industry: {product.get('industry')}
+        - Benefits: {', '.join(product.get('benefits_advantages') or [])}
+        - Sustainability: {', '.join(product.get('sustainability_aspects') or [])}
+        
+        Sections (JSON object of section number to markdown):
+        {json.dumps(targets)}
+        
+        Output a JSON object with the same section numbers mapped to the rewritten markdown.
+        """
+        
+        try:
+            response, provider, cost = await self.ai_provider.generate(prompt, temperature=0.7, max_tokens=2000)
+            await self._log_ai_usage('blog_section_regeneration', cost)
+            rewritten = json.loads(response)
+        except Exception as e:
+            logger.error(f"Error regenerating blog sections: {e}")
+            return None
+        if not isinstance(rewritten, dict) or not set(targets) <= set(rewritten):
+            return None
+        
+        for index in targets:
+            sections[int(index)] = str(rewritten[index]).strip('\n')
         return {
-            'status': 'completed',
-            'content_id': saved_content['id'],
-            'title': optimized_content['title'],
-            'word_count': len(optimized_content['content'].split()),
-            'seo_score': seo_score,
-            'readability_score': readability_score,
-            'keywords_used': keywords['all_keywords'][:5]
+            'title': previous['title'],
+            'meta_description': previous.get('meta_description', ''),
+            'excerpt': previous.get('excerpt', ''),
+            'content': '\n'.join(sections),
+            'revision_of': previous['id']
         }
     
+    @staticmethod
+    def _split_sections(content: str) -> List[str]:
+        """Split markdown into chunks that each start at an H2 heading (plus any intro)."""
+        sections, current = [], []
+        for line in content.split('\n'):
+            if line.startswith('## ') and current:
+                sections.append('\n'.join(current))
+                current = []
+            current.append(line)
+        if current:
+            sections.append('\n'.join(current))
+        return sections
+    
+    async def _related_products(self, product: Dict, limit: int = 5) -> List[Dict]:
+        """Find similar products for internal links using the shared vector index.
+        
+        The catalog is indexed by ``refresh_product_vectors`` (monetization
+        agent) and picked up here when the index files change; the product
+        itself is embedded first when the AI provider supports embeddings.
+        """
+        if hasattr(self.ai_provider, 'embed_batch') or hasattr(self.ai_provider, 'embed'):
+            try:
+                await self.product_similarity.refresh([product])
+            except Exception as e:
+                logger.warning(f"Could not index product {product.get('id')} for related products: {e}")
+        return self.product_similarity.similar_products(product['id'], limit)
+    
+    async def _fetch_products(self, product_ids: List[int], chunk_size: int = 200) -> Dict[int, Dict]:
+        """Fetch several products with ``in_()`` queries, keyed by id."""
+        products = {}
+        unique_ids = list(dict.fromkeys(product_ids))
+        for start in range(0, len(unique_ids), chunk_size):
+            result = await self.supabase.table('uses_products')\
+                .select('*')\
+                .in_('id', unique_ids[start:start + chunk_size])\
+                .execute()
+            for product in result.data or []:
+                products[product['id']] = product
+        return products
+    
     async def _fetch_product_data(self, product_id: int) -> Optional[Dict]:
         """Fetch product data from database."""
         try:
@@ -155,17 +342,24 @@ class HempContentAgent(BaseAgent):
                                    word_count: int, tone: str) -> Dict[str, Any]:
         """Generate blog content using AI."""
         prompt_template = self.prompts.get('blog_post_generation', {})
+        details = PromptBuilder.for_purpose('blog_generation')\
+            .add('plant_part', product.get('plant_part'), priority=0)\
+            .add('industry', product.get('industry'), priority=0)\
+            .add('description', product.get('description'), priority=1, html_content=True)\
+            .add('benefits', product.get('benefits_advantages'), priority=2)\
+            .add('sustainability', product.get('sustainability_aspects'), priority=3)\
+            .build()
         
         # Build the prompt
         user_prompt = f"""
         Write a comprehensive, SEO-optimized blog post about {product['name']}.
         
         Product details:
-        - Description: {product['description']}
-        - Plant part: {product['plant_part']}
-        - Industry: {product['industry']}
-        - Benefits: {', '.join(product.get('benefits_advantages', []))}
-        - Sustainability: {', '.join(product.get('sustainability_aspects', []))}
+        - Description: {details['description']}
+        - Plant part: {details['plant_part']}
+        - Industry: {details['industry']}
+        - Benefits: {details['benefits']}
+        - Sustainability: {details['sustainability']}
         
         Target keywords: {keywords['primary_keyword']}, {', '.join(keywords['secondary_keywords'][:3])}
         
@@ -192,12 +386,12 @@ class HempContentAgent(BaseAgent):
         
         Output format:
         ```json
-        {
+        {{
             "title": "SEO-optimized title",
             "meta_description": "Compelling meta description",
             "excerpt": "2-3 sentence excerpt",
             "content": "Full blog post content in markdown format"
-        }
+        }}
         ```
         """
         
@@ -232,6 +426,9 @@ class HempContentAgent(BaseAgent):
         product_id = params.get('product_id')
         platforms = params.get('platforms', ['twitter', 'linkedin', 'instagram'])
         variations = params.get('variations', 3)
+        combined = params.get('combined', True)
+        use_cache = params.get('use_cache', True)
+        on_duplicate = params.get('on_duplicate', 'regenerate')
         
         if not product_id:
             raise ValueError("product_id is required")
@@ -243,24 +440,111 @@ class HempContentAgent(BaseAgent):
         if not product:
             raise ValueError(f"Product {product_id} not found")
         
-        # Generate content for each platform
-        all_content = {}
-        
-        for platform in platforms:
-            platform_content = await self._generate_platform_content(
-                product, platform, variations
+        cache_params = {'platforms': platforms, 'variations': variations}
+        cached = await self._cached_drafts('social_media', product, cache_params) if use_cache else []
+        cached = self._newest_social_drafts(cached, variations)
+        if cached:
+            all_content = {platform: [] for platform in platforms}
+            for row in cached:
+                metadata = row.get('metadata') or {}
+                all_content.setdefault(metadata.get('platform'), []).append({
+                    'content': row['content'],
+                    'hashtags': metadata.get('hashtags', []),
+                    'character_count': len(row['content']),
+                    'platform': metadata.get('platform')
+                })
+            saved_items = [row['id'] for row in cached]
+        else:
+            # Generate content for each platform
+            all_content, records = await self._compose_social_posts(
+                product, platforms, variations, combined=combined
             )
-            all_content[platform] = platform_content
+            
+            if on_duplicate != 'allow':
+                records, duplicates = await self._drop_near_duplicates(records)
+                if duplicates and on_duplicate == 'regenerate':
+                    records += await self._replace_duplicate_social_posts(
+                        product, records, duplicates, cache_params
+                    )
+                all_content = {platform: [] for platform in platforms}
+                for record in records:
+                    metadata = record['metadata']
+                    all_content.setdefault(metadata['platform'], []).append({
+                        'content': record['content'],
+                        'hashtags': metadata.get('hashtags', []),
+                        'character_count': metadata.get('character_count'),
+                        'platform': metadata['platform']
+                    })
+            
+            # Save generated content in one insert
+            saved_items = [saved['id'] for saved in await self._save_generated_content_bulk(records)]
+        
+        return {
+            'status': 'completed',
+            'cached': bool(cached),
+            'content_generated': len(saved_items),
+            'platforms': list(all_content.keys()),
+            'content_ids': saved_items,
+            'sample_content': {
+                platform: posts[0] if posts else None 
+                for platform, posts in all_content.items()
+            }
+        }
+    
+    @staticmethod
+    def _newest_social_drafts(rows: List[Dict], variations: int) -> List[Dict]:
+        """The newest ``variations`` cached posts of each platform, oldest first.
+        
+        Drafts regenerated with the cache bypassed share the generation key
+        of the earlier ones, so a lookup can return several sets.
+        """
+        kept, per_platform = [], {}
+        for row in reversed(rows):
+            platform = (row.get('metadata') or {}).get('platform')
+            if per_platform.get(platform, 0) < variations:
+                per_platform[platform] = per_platform.get(platform, 0) + 1
+                kept.append(row)
+        return kept[::-1]
+    
+    async def _replace_duplicate_social_posts(self, product: Dict, records: List[Dict],
+                                              duplicates: List[Dict], cache_params: Dict) -> List[Dict]:
+        """One more generation pass for the platforms that lost near-duplicate posts."""
+        missing = {}
+        for duplicate in duplicates:
+            missing[duplicate['platform']] = missing.get(duplicate['platform'], 0) + 1
+        logger.info(f"Regenerating {len(duplicates)} near-duplicate social posts")
+        replacements = []
+        for platform, count in missing.items():
+            _, extra = await self._compose_social_posts(product, [platform], count, combined=False)
+            extra, _ = await self._drop_near_duplicates(extra, records + replacements)
+            self.generation_cache.tag(extra, 'social_media', product, cache_params)
+            replacements.extend(extra[:count])
+        return replacements
+    
+    async def _compose_social_posts(self, product: Dict, platforms: List[str], variations: int,
+                                    combined: bool = True) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+        """Generate posts per platform; returns them and their unsaved content rows.
         
-        # Save generated content
-        saved_items = []
+        ``combined`` asks for every platform in one structured call and only
+        regenerates platforms whose posts fail validation, in parallel.
+        """
+        if combined:
+            all_content = await self._generate_multi_platform_content(product, platforms, variations)
+        else:
+            all_content = {}
+            for platform in platforms:
+                all_content[platform] = await self._generate_platform_content(
+                    product, platform, variations
+                )
+        
+        records = []
         for platform, posts in all_content.items():
             for i, post in enumerate(posts):
-                saved = await self._save_generated_content({
+                records.append({
                     'content_type': 'social_media',
                     'title': f"{product['name']} - {platform} post {i+1}",
                     'content': post['content'],
-                    'product_id': product_id,
+                    'product_id': product['id'],
                     'metadata': {
                         'platform': platform,
                         'hashtags': post.get('hashtags', []),
@@ -268,18 +552,104 @@ class HempContentAgent(BaseAgent):
                     },
                     'status': 'draft'
                 })
-                saved_items.append(saved['id'])
+        self.generation_cache.tag(records, 'social_media', product,
+                                  {'platforms': platforms, 'variations': variations})
+        return all_content, records
+    
+    async def _generate_multi_platform_content(self, product: Dict, platforms: List[str],
+                                               variations: int) -> Dict[str, List[Dict]]:
+        """Generate posts for all platforms from one prompt, retrying invalid platforms."""
+        known = [platform for platform in platforms if platform in PLATFORM_RULES]
+        for platform in platforms:
+            if platform not in PLATFORM_RULES:
+                logger.warning(f"Unknown platform: {platform}")
+        if not known:
+            return {platform: [] for platform in platforms}
         
-        return {
-            'status': 'completed',
-            'content_generated': len(saved_items),
-            'platforms': list(all_content.keys()),
-            'content_ids': saved_items,
-            'sample_content': {
-                platform: posts[0] if posts else None 
-                for platform, posts in all_content.items()
-            }
-        }
+        requirements = '\n'.join(
+            f"        - {platform}: {PLATFORM_RULES[platform]['length']}, "
+            f"{PLATFORM_RULES[platform]['hashtags']} relevant hashtags"
+            for platform in known
+        )
+        prompt = f"""
+        Create {variations} social media posts per platform about {product['name']}.
+        
+        Product details:
+        - {product['description']}
+        - Industry: {product.get('industry', 'hemp')}
+        - Key benefits: {', '.join(product.get('benefits_advantages', [])[:3])}
+        
+        Platform requirements:
+{requirements}
+        
+        Vary the angle of each variation and include a call-to-action when appropriate.
+        
+        Output as a JSON object keyed by platform:
+        ```json
+        {{
+            "{known[0]}": [
+                {{
+                    "content": "Post text with hashtags",
+                    "hashtags": ["hemp", "sustainability"],
+                    "focus": "benefit or angle highlighted"
+                }}
+            ]
+        }}
+        ```
+        """
+        
+        generated: Dict[str, List[Dict]] = {}
+        try:
+            response, provider, cost = await self.ai_provider.generate(prompt, temperature=0.8)
+            await self._log_ai_usage('social_media_multi_platform', cost)
+            generated = json.loads(response)
+        except Exception as e:
+            logger.error(f"Error generating multi-platform posts: {e}")
+        if not isinstance(generated, dict):
+            generated = {}
+        
+        all_content = {}
+        retry = []
+        for platform in known:
+            posts = self._valid_platform_posts(platform, generated.get(platform) or [])
+            all_content[platform] = posts
+            if len(posts) < variations:
+                retry.append(platform)
+        
+        if retry:
+            logger.info(f"Regenerating posts for {', '.join(retry)}")
+            regenerated = await asyncio.gather(
+                *(self._generate_platform_content(product, platform, variations) for platform in retry)
+            )
+            for platform, posts in zip(retry, regenerated):
+                posts = self._valid_platform_posts(platform, posts)
+                if len(posts) > len(all_content[platform]):
+                    all_content[platform] = posts
+        
+        return {platform: all_content.get(platform, []) for platform in platforms}
+    
+    @staticmethod
+    def _valid_platform_posts(platform: str, posts: List[Dict]) -> List[Dict]:
+        """Normalize posts and drop those breaking the platform's limits."""
+        rules = PLATFORM_RULES[platform]
+        valid = []
+        for post in posts:
+            content = post.get('content') if isinstance(post, dict) else None
+            if not content:
+                continue
+            words = len(content.split())
+            if len(content) > rules.get('max_chars', len(content)):
+                continue
+            if not rules.get('min_words', 0) <= words <= rules.get('max_words', words):
+                continue
+            valid.append({
+                'content': content,
+                'hashtags': post.get('hashtags', []),
+                'character_count': len(content),
+                'word_count': words,
+                'platform': platform
+            })
+        return valid
     
     async def _generate_platform_content(self, product: Dict, platform: str, 
                                        variations: int) -> List[Dict]:
@@ -407,23 +777,40 @@ class HempContentAgent(BaseAgent):
         if not product:
             raise ValueError(f"Product {product_id} not found")
         
+        cached = await self._cached_drafts('product_description', product, {}) \
+            if params.get('use_cache', True) else []
+        if cached:
+            saved = cached[-1]
+            return {
+                'status': 'completed',
+                'content_id': saved['id'],
+                'cached': True,
+                'description_length': len(saved['content']),
+                'key_features_highlighted': (saved.get('metadata') or {}).get('features_count', 0)
+            }
+        
         # Use template to generate
         template = self.templates['product_description']
         description = await template.generate(product, self.ai_provider)
         
         # Save and return
-        saved = await self._save_generated_content({
+        record = {
             'content_type': 'product_description',
             'title': f"{product['name']} - Product Description",
             'content': description['content'],
             'product_id': product_id,
-            'metadata': description.get('metadata', {}),
+            'metadata': {**description.get('metadata', {}),
+                         'features_count': description.get('features_count', 0)},
             'status': 'draft'
-        })
+        }
+        saved = await self._save_generated_content(
+            self.generation_cache.tag([record], 'product_description', product, {})[0]
+        )
         
         return {
             'status': 'completed',
             'content_id': saved['id'],
+            'cached': False,
             'description_length': len(description['content']),
             'key_features_highlighted': description.get('features_count', 0)
         }
@@ -476,54 +863,252 @@ class HempContentAgent(BaseAgent):
             'new_seo_score': optimized.get('seo_score', 0)
         }
     
-    async def generate_content_batch(self, params: Dict) -> Dict[str, Any]:
-        """Generate multiple pieces of content in batch."""
+    async def generate_content_batch(self, params: Dict,
+                                     on_progress: Optional[Callable[[Dict], Any]] = None) -> Dict[str, Any]:
+        """Generate multiple pieces of content in batch.
+        
+        Items (product x content type) run concurrently within a budget on
+        the AI provider, results are inserted in bulk as they finish and
+        every row is tagged with the ``batch_id``. Re-running with the same
+        ``batch_id`` skips items that were already saved, so a partially
+        failed batch resumes where it stopped. Items whose product and
+        parameters are unchanged since their last draft reuse it from the
+        generation cache unless ``use_cache`` is False. ``on_duplicate``
+        works as for single items: 'regenerate' (default) retries posts that
+        near-duplicate existing content once, 'allow' keeps them and anything
+        else drops them (an item left with nothing fails).
+        """
         product_ids = params.get('product_ids', [])
         content_types = params.get('content_types', ['blog_post', 'social_media'])
+        batch_id = params.get('batch_id') or str(uuid.uuid4())
+        budget = RateBudget(
+            max_concurrency=params.get('max_concurrency', 4),
+            max_calls=params.get('calls_per_minute', 30)
+        )
+        flush_size = params.get('flush_size', 20)
+        use_cache = params.get('use_cache', True)
+        on_duplicate = params.get('on_duplicate', 'regenerate')
+        social_params = {'platforms': ['twitter', 'linkedin'], 'variations': 3}
         
-        logger.info(f"Generating batch content for {len(product_ids)} products")
+        logger.info(f"Generating batch {batch_id} for {len(product_ids)} products")
         
-        results = []
+        products = await self._fetch_products(product_ids)
+        already_saved = await self._saved_batch_items(batch_id)
+        items = [
+            (product_id, content_type)
+            for product_id in dict.fromkeys(product_ids)
+            for content_type in content_types
+            if content_type in ('blog_post', 'social_media')
+            and (product_id, content_type) not in already_saved
+        ]
         
-        for product_id in product_ids:
-            for content_type in content_types:
-                try:
+        async def run(item: Tuple[int, str]):
+            product_id, content_type = item
+            try:
+                product = products.get(product_id)
+                if not product:
+                    raise ValueError(f"Product {product_id} not found")
+                if use_cache:
+                    cache_params = {'word_count': 1500, 'tone': 'informative'} \
+                        if content_type == 'blog_post' else social_params
+                    cached = await self._cached_drafts(content_type, product, cache_params)
                     if content_type == 'blog_post':
-                        result = await self.generate_blog_post({'product_id': product_id})
-                    elif content_type == 'social_media':
-                        result = await self.generate_social_media({
-                            'product_id': product_id,
-                            'platforms': ['twitter', 'linkedin']
-                        })
+                        cached = cached[-1:]
                     else:
-                        continue
-                    
-                    results.append({
-                        'product_id': product_id,
-                        'content_type': content_type,
-                        'status': 'success',
-                        'result': result
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error generating {content_type} for product {product_id}: {e}")
-                    results.append({
-                        'product_id': product_id,
-                        'content_type': content_type,
-                        'status': 'failed',
-                        'error': str(e)
-                    })
+                        cached = self._newest_social_drafts(cached, social_params['variations'])
+                    if cached:
+                        return item, cached, None, True
+                async with budget.slot():
+                    if content_type == 'blog_post':
+                        records = [await self._compose_blog_post(product)]
+                    else:
+                        _, records = await self._compose_social_posts(
+                            product, social_params['platforms'], social_params['variations']
+                        )
+                if not records:
+                    raise ValueError("No content generated")
+                if on_duplicate != 'allow':
+                    records, duplicates = await self._drop_near_duplicates(records)
+                    if duplicates and on_duplicate == 'regenerate':
+                        async with budget.slot():
+                            if content_type == 'blog_post':
+                                records, duplicates = await self._drop_near_duplicates(
+                                    [await self._compose_blog_post(product)]
+                                )
+                            else:
+                                records += await self._replace_duplicate_social_posts(
+                                    product, records, duplicates, social_params
+                                )
+                    if not records:
+                        raise ValueError(f"Near-duplicate of existing content {duplicates[0]['duplicate_of']}")
+                for record in records:
+                    record['metadata'] = {**record.get('metadata', {}), 'batch_id': batch_id}
+                return item, records, None, False
+            except Exception as e:
+                return item, [], e, False
+        
+        results = []
+        pending: List[Tuple[Dict, List[Dict]]] = []
+        
+        async def flush():
+            rows = [record for _, records in pending for record in records]
+            try:
+                saved = await self._save_generated_content_bulk(rows)
+                ids = iter(row.get('id') for row in saved)
+                for result, records in pending:
+                    result['content_ids'] = [next(ids, None) for _ in records]
+            except Exception as e:
+                logger.error(f"Error saving batch {batch_id} results: {e}")
+                for result, _ in pending:
+                    result.update({'status': 'failed', 'error': f"Save failed: {e}"})
+            pending.clear()
+        
+        for finished, outcome in enumerate(asyncio.as_completed([run(item) for item in items]), 1):
+            (product_id, content_type), records, error, cached = await outcome
+            if cached:
+                result = {'product_id': product_id, 'content_type': content_type, 'status': 'success',
+                          'cached': True, 'content_ids': [record['id'] for record in records]}
+            elif error is None:
+                result = {'product_id': product_id, 'content_type': content_type, 'status': 'success'}
+                pending.append((result, records))
+            else:
+                logger.error(f"Error generating {content_type} for product {product_id}: {error}")
+                result = {'product_id': product_id, 'content_type': content_type,
+                          'status': 'failed', 'error': str(error)}
+            results.append(result)
+            
+            if sum(len(records) for _, records in pending) >= flush_size:
+                await flush()
+            
+            logger.info(f"Batch {batch_id}: {finished}/{len(items)} items done")
+            if on_progress is not None:
+                progress = on_progress({'batch_id': batch_id, 'completed': finished,
+                                        'total': len(items), 'last': result})
+                if inspect.isawaitable(progress):
+                    await progress
+        
+        if pending:
+            await flush()
         
         success_count = sum(1 for r in results if r['status'] == 'success')
+        cached_count = sum(1 for r in results if r.get('cached'))
         
         return {
             'status': 'completed',
+            'batch_id': batch_id,
             'total_requested': len(product_ids) * len(content_types),
+            'resumed_count': len(already_saved),
             'success_count': success_count,
+            'cached_count': cached_count,
             'failed_count': len(results) - success_count,
             'results': results
         }
     
+    async def rescore_content(self, params: Dict) -> Dict[str, Any]:
+        """Recompute SEO and readability scores of stored content.
+        
+        Streams the blog posts (or ``content_types``) of
+        ``agent_generated_content`` in id order, scores pages in a process
+        pool and writes back only changed scores. Progress is
+        checkpointed locally; run again to resume, or pass ``resume: False``
+        to start over.
+        """
+        rescorer = ContentRescorer(
+            self.supabase,
+            page_size=params.get('page_size', 500),
+            workers=params.get('workers'),
+            content_types=params.get('content_types', SCORED_CONTENT_TYPES)
+        )
+        return await rescorer.run(resume=params.get('resume', True), max_rows=params.get('max_rows'))
+    
+    async def cluster_duplicate_content(self, params: Dict) -> Dict[str, Any]:
+        """Group stored content into near-duplicate clusters by SimHash fingerprint."""
+        index = await self._content_index()
+        if params.get('refresh', False):
+            await self._seed_content_index()
+        
+        clusters = index.clusters(min_size=params.get('min_size', 2))
+        return {
+            'status': 'completed',
+            'indexed_count': len(index),
+            'cluster_count': len(clusters),
+            'duplicate_count': sum(len(cluster) - 1 for cluster in clusters),
+            'clusters': [[member['key'] for member in cluster] for cluster in clusters]
+        }
+    
+    async def _content_index(self) -> ContentDedupIndex:
+        """The content fingerprint index, seeded from stored content on first use."""
+        if not self._content_dedup_seeded:
+            if not len(self.content_dedup):
+                await self._seed_content_index()
+            self._content_dedup_seeded = True
+        return self.content_dedup
+    
+    async def _seed_content_index(self, page_size: int = 1000):
+        """Fingerprint stored content, paging by id."""
+        cursor = None
+        while True:
+            query = self.supabase.table('agent_generated_content')\
+                .select('id, content')\
+                .neq('status', 'archived')
+            if cursor is not None:
+                query = query.gt('id', cursor)
+            result = await query.order('id').limit(page_size).execute()
+            rows = result.data or []
+            self.content_dedup.add_many(rows)
+            if len(rows) < page_size:
+                break
+            cursor = rows[-1]['id']
+        logger.info(f"Content near-duplicate index holds {len(self.content_dedup)} rows")
+    
+    async def _drop_near_duplicates(self, records: List[Dict],
+                                    pending: Optional[List[Dict]] = None) -> Tuple[List[Dict], List[Dict]]:
+        """Split unsaved rows into new ones and near-duplicates.
+        
+        Rows are compared with stored content and with each other (and with
+        ``pending`` rows about to be saved alongside them). Each duplicate is
+        reported with its title, platform and ``duplicate_of`` content id
+        (None when it repeats another unsaved row). A row revising a stored
+        draft (``metadata.revision_of``) is not compared with that draft.
+        """
+        index = await self._content_index()
+        seen = [index.fingerprint(row.get('content') or '') for row in pending or []]
+        kept, duplicates = [], []
+        for record in records:
+            fingerprint = index.fingerprint(record.get('content') or '')
+            match = index.query(fingerprint=fingerprint, limit=1,
+                                exclude_key=(record.get('metadata') or {}).get('revision_of'))
+            if match or any(hamming(fingerprint, other) <= index.max_distance for other in seen):
+                duplicates.append({
+                    'title': record.get('title'),
+                    'platform': (record.get('metadata') or {}).get('platform'),
+                    'duplicate_of': match[0]['key'] if match else None
+                })
+                continue
+            seen.append(fingerprint)
+            kept.append(record)
+        if duplicates:
+            logger.info(f"Dropped {len(duplicates)} near-duplicate content rows")
+        return kept, duplicates
+    
+    async def _saved_batch_items(self, batch_id: str, page_size: int = 1000) -> set:
+        """(product_id, content_type) pairs already saved for a batch, paging by id."""
+        saved = set()
+        cursor = None
+        while True:
+            query = self.supabase.table('agent_generated_content')\
+                .select('id, product_id, content_type')\
+                .eq('metadata->>batch_id', batch_id)
+            if cursor is not None:
+                query = query.gt('id', cursor)
+            result = await query.order('id').limit(page_size).execute()
+            rows = result.data or []
+            saved.update((row['product_id'], row['content_type']) for row in rows)
+            if len(rows) < page_size:
+                break
+            cursor = rows[-1]['id']
+        return saved
+    
     async def _save_generated_content(self, content_data: Dict) -> Dict:
         """Save generated content to database."""
         # Add agent task ID if available
@@ -534,8 +1119,26 @@ class HempContentAgent(BaseAgent):
             .insert(content_data)\
             .execute()
         
+        self.content_dedup.add_many(result.data)
         return result.data[0]
     
+    async def _save_generated_content_bulk(self, rows: List[Dict]) -> List[Dict]:
+        """Save several content rows with one insert; returns them in the same order."""
+        if not rows:
+            return []
+        task_id = self.current_task_id if hasattr(self, 'current_task_id') else None
+        created_at = datetime.now().isoformat()
+        for row in rows:
+            row['agent_task_id'] = task_id
+            row['created_at'] = created_at
+        
+        result = await self.supabase.table('agent_generated_content')\
+            .insert(rows)\
+            .execute()
+        
+        self.content_dedup.add_many(result.data or [])
+        return result.data or []
+    
     async def _log_ai_usage(self, operation: str, cost: float):
         """Log AI usage and costs."""
         await self.supabase.table('agent_performance_metrics').upsert({
@@ -0,0 +1,120 @@
+"""Content-addressed cache of generated drafts stored in ``agent_generated_content``."""
+
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'agent_generated_content'
+
+# Bump when generation code changes in a way that should invalidate stored drafts
+GENERATION_VERSION = 1
+
+# Product fields that feed the generation prompts
+PRODUCT_FIELDS = ('name', 'description', 'plant_part', 'industry',
+                  'benefits_advantages', 'sustainability_aspects')
+
+
+def fingerprint(value: Any) -> str:
+    """Stable SHA-256 of a JSON-serializable value."""
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def field_hashes(product: Dict[str, Any], fields: Iterable[str] = PRODUCT_FIELDS) -> Dict[str, str]:
+    """Short hash per product field, stored with a draft to tell which fields changed later."""
+    return {field: fingerprint(product.get(field))[:16] for field in fields}
+
+
+def changed_fields(old_hashes: Dict[str, str], product: Dict[str, Any]) -> List[str]:
+    """Product fields whose value differs from ``old_hashes``."""
+    return [field for field, digest in field_hashes(product).items() if old_hashes.get(field) != digest]
+
+
+class GenerationCache:
+    """Looks up drafts by a hash of their inputs.
+
+    The key covers the content type, the product fields used in the
+    prompts, the generation parameters (tone, word count, platforms...)
+    and the prompt template version, so a draft is reused exactly when
+    regenerating it would send the same prompts. Keys live in
+    ``metadata->>'generation_key'`` of the stored rows. ``template_version``
+    may be a callable so keys follow prompt files as they are reloaded.
+    """
+
+    def __init__(self, supabase_client, template_version: Union[str, Callable[[], str]]):
+        self.supabase = supabase_client
+        self._template_version = template_version
+
+    @property
+    def template_version(self) -> str:
+        version = self._template_version
+        return version() if callable(version) else version
+
+    def params_key(self, content_type: str, params: Dict[str, Any]) -> str:
+        """Hash of everything but the product: type, parameters and template version."""
+        return fingerprint({
+            'content_type': content_type,
+            'params': params,
+            'template_version': self.template_version,
+            'generation_version': GENERATION_VERSION
+        })
+
+    def key(self, content_type: str, product: Dict[str, Any], params: Dict[str, Any]) -> str:
+        return fingerprint({
+            'params_key': self.params_key(content_type, params),
+            'product': {field: product.get(field) for field in PRODUCT_FIELDS}
+        })
+
+    def tag(self, records: List[Dict[str, Any]], content_type: str, product: Dict[str, Any],
+            params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Stamp unsaved rows with their generation key and product field hashes."""
+        for record in records:
+            record['metadata'] = {
+                **(record.get('metadata') or {}),
+                'generation_key': self.key(content_type, product, params),
+                'params_key': self.params_key(content_type, params),
+                'product_fields': field_hashes(product)
+            }
+        return records
+
+    def changed_since(self, row: Dict[str, Any], content_type: str, product: Dict[str, Any],
+                      params: Dict[str, Any]) -> Optional[List[str]]:
+        """Product fields changed since ``row`` was generated, or None if its parameters differ."""
+        metadata = row.get('metadata') or {}
+        if metadata.get('params_key') != self.params_key(content_type, params):
+            return None
+        return changed_fields(metadata.get('product_fields') or {}, product)
+
+    async def lookup(self, key: str) -> List[Dict[str, Any]]:
+        """Stored rows generated from exactly these inputs, oldest first."""
+        try:
+            result = await self.supabase.table(TABLE)\
+                .select('*')\
+                .eq('metadata->>generation_key', key)\
+                .neq('status', 'archived')\
+                .order('created_at')\
+                .execute()
+            return result.data or []
+        except Exception as e:
+            logger.warning(f"Generation cache lookup failed: {e}")
+            return []
+
+    async def latest(self, content_type: str, product_id: int) -> Optional[Dict[str, Any]]:
+        """Most recent cached draft of a type for a product, whatever its inputs."""
+        try:
+            result = await self.supabase.table(TABLE)\
+                .select('*')\
+                .eq('content_type', content_type)\
+                .eq('product_id', product_id)\
+                .not_.is_('metadata->>generation_key', 'null')\
+                .neq('status', 'archived')\
+                .order('created_at', desc=True)\
+                .limit(1)\
+                .execute()
+            return result.data[0] if result.data else None
+        except Exception as e:
+            logger.warning(f"Generation cache lookup failed: {e}")
+            return None
@@ -0,0 +1,165 @@
+"""Re-scoring of stored generated content after the scoring logic changes."""
+
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from ..utils.local_store import data_path
+from .seo_optimizer import SEOOptimizer
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'agent_generated_content'
+COLUMNS = 'id, title, meta_description, content, seo_keywords, word_count, seo_score, readability_score'
+SCORE_FIELDS = ('seo_score', 'readability_score', 'word_count')
+# Only blog posts are scored when generated; other content types keep NULL scores
+SCORED_CONTENT_TYPES = ('blog_post',)
+
+
+def score_chunk(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Score a list of articles; module level so process pools can pickle it."""
+    return SEOOptimizer().score_articles(articles)
+
+
+def _changed(stored: Dict[str, Any], scores: Dict[str, Any], tolerance: float = 0.005) -> bool:
+    """Whether new scores differ from the stored row beyond DECIMAL(4, 2) rounding.
+
+    Rows without a stored ``seo_score`` were never scored and are left alone.
+    """
+    if stored.get('seo_score') is None:
+        return False
+    for field in SCORE_FIELDS:
+        old, new = stored.get(field), scores.get(field)
+        if old is None or new is None:
+            if old != new:
+                return True
+        elif abs(float(old) - float(new)) > tolerance:
+            return True
+    return False
+
+
+class ContentRescorer:
+    """Streams ``agent_generated_content`` by id and rewrites stale scores.
+
+    Only rows of ``content_types`` (blog posts by default) are read, in
+    keyset-paginated pages (``id > cursor``), so memory stays bounded by
+    one page and pages never shift while rows are updated. Each page is split across a process pool for scoring while
+    the next page is fetched. Only rows whose scores changed are written,
+    in one ``update_generated_content_scores`` call per page. The cursor
+    is checkpointed after every page, so an interrupted run resumes.
+    """
+
+    def __init__(self, supabase_client, page_size: int = 500, workers: Optional[int] = None,
+                 checkpoint_path: Optional[Union[str, Path]] = None,
+                 content_types: Iterable[str] = SCORED_CONTENT_TYPES):
+        self.supabase = supabase_client
+        self.page_size = page_size
+        self.workers = workers
+        self.content_types = list(content_types)
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else data_path('content_rescore.json')
+
+    def load_checkpoint(self) -> Dict[str, Any]:
+        if not self.checkpoint_path.exists():
+            return {'cursor': None, 'scanned': 0, 'updated': 0}
+        try:
+            return json.loads(self.checkpoint_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable rescore checkpoint {self.checkpoint_path}: {e}")
+            return {'cursor': None, 'scanned': 0, 'updated': 0}
+
+    def save_checkpoint(self, state: Dict[str, Any]):
+        tmp_path = self.checkpoint_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(state))
+        tmp_path.replace(self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        self.checkpoint_path.unlink(missing_ok=True)
+
+    async def _fetch_page(self, cursor: Optional[str]) -> List[Dict[str, Any]]:
+        query = self.supabase.table(TABLE).select(COLUMNS).in_('content_type', self.content_types)
+        if cursor is not None:
+            query = query.gt('id', cursor)
+        result = await query.order('id').limit(self.page_size).execute()
+        return result.data or []
+
+    async def _score_page(self, executor: Executor, rows: List[Dict[str, Any]],
+                          workers: int) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        size = max(1, -(-len(rows) // workers))
+        chunks = [rows[start:start + size] for start in range(0, len(rows), size)]
+        scored = await asyncio.gather(*(loop.run_in_executor(executor, score_chunk, chunk) for chunk in chunks))
+        return [scores for chunk_scores in scored for scores in chunk_scores]
+
+    async def _write_scores(self, updates: List[Dict[str, Any]]) -> int:
+        if not updates:
+            return 0
+        result = await self.supabase.rpc('update_generated_content_scores', {'p_updates': updates}).execute()
+        return result.data if isinstance(result.data, int) else len(updates)
+
+    async def run(self, resume: bool = True, max_rows: Optional[int] = None,
+                  executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """Re-score every stored row; returns counts of scanned and updated rows.
+
+        ``resume=False`` ignores any saved cursor and starts from the
+        first row. ``max_rows`` stops early (with the checkpoint kept) so a
+        large corpus can be processed across several runs.
+        """
+        state = self.load_checkpoint() if resume else {'cursor': None, 'scanned': 0, 'updated': 0}
+        if state['cursor'] is not None:
+            logger.info(f"Resuming content rescoring after id {state['cursor']} ({state['scanned']} rows done)")
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        workers = self.workers or os.cpu_count() or 1
+        scanned_this_run = 0
+        finished = False
+
+        try:
+            page = await self._fetch_page(state['cursor'])
+            while page:
+                # Fetch the next page while this one is being scored
+                next_cursor = page[-1]['id']
+                next_page = asyncio.ensure_future(self._fetch_page(next_cursor))
+                try:
+                    scores = await self._score_page(executor, page, workers)
+                except BaseException:
+                    next_page.cancel()
+                    raise
+
+                stored = {row['id']: row for row in page}
+                updates = [
+                    {field: row_scores[field] for field in ('id',) + SCORE_FIELDS}
+                    for row_scores in scores if _changed(stored[row_scores['id']], row_scores)
+                ]
+                updated = await self._write_scores(updates)
+
+                state = {'cursor': next_cursor, 'scanned': state['scanned'] + len(page),
+                         'updated': state['updated'] + updated}
+                self.save_checkpoint(state)
+                scanned_this_run += len(page)
+                logger.info(f"Rescored {state['scanned']} rows, {state['updated']} updated")
+
+                if max_rows is not None and scanned_this_run >= max_rows:
+                    next_page.cancel()
+                    break
+                page = await next_page
+            else:
+                finished = True
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        if finished:
+            self.clear_checkpoint()
+
+        return {
+            'status': 'completed' if finished else 'partial',
+            'scanned_count': state['scanned'],
+            'updated_count': state['updated'],
+            'cursor': None if finished else state['cursor']
+        }
@@ -3,12 +3,19 @@
 import re
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from collections import Counter
 import asyncio
 
+from .text_analysis import TextDocument, as_document, count_syllables
+
 logger = logging.getLogger(__name__)
 
+HEADING_MARK_RE = re.compile(r'#+ ')
+BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+ITALIC_RE = re.compile(r'\*(.*?)\*')
+LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+
 
 class SEOOptimizer:
     """Optimizes content for search engines."""
@@ -88,8 +95,10 @@ class SEOOptimizer:
         if not secondary_keywords:
             secondary_keywords = []
         
+        document = TextDocument(content)
+        
         # Extract or generate title
-        title = self._extract_or_generate_title(content, primary_keyword)
+        title = self._extract_or_generate_title(document, primary_keyword)
         
         # Optimize title
         optimized_title = self._optimize_title(title, primary_keyword)
@@ -98,13 +107,14 @@ class SEOOptimizer:
         meta_description = self._generate_meta_description(content, primary_keyword)
         
         # Optimize content structure
-        optimized_content = self._optimize_content_structure(content, primary_keyword, secondary_keywords)
+        optimized_content = self._optimize_content_structure(document, primary_keyword, secondary_keywords)
+        optimized = TextDocument(optimized_content)
         
         # Add schema markup suggestions
-        schema_markup = self._suggest_schema_markup(content)
+        schema_markup = self._suggest_schema_markup(document)
         
         # Calculate improvements
-        improvements = self._identify_improvements(content, optimized_content)
+        improvements = self._identify_improvements(document, optimized)
         
         return {
             'title': optimized_title,
@@ -113,15 +123,15 @@ class SEOOptimizer:
             'excerpt': self._generate_excerpt(optimized_content),
             'improvements': improvements,
             'schema_markup': schema_markup,
-            'keyword_density': self._calculate_keyword_density(optimized_content, primary_keyword),
-            'readability_score': self.calculate_readability_score(optimized_content)
+            'word_count': optimized.word_count,
+            'keyword_density': optimized.keyword_density(primary_keyword),
+            'readability_score': optimized.readability
         }
     
-    def _extract_or_generate_title(self, content: str, keyword: str) -> str:
+    def _extract_or_generate_title(self, content: Union[str, TextDocument], keyword: str) -> str:
         """Extract title from content or generate one."""
         # Look for H1 or first line
-        lines = content.split('\n')
-        for line in lines[:5]:
+        for line in as_document(content).lines[:5]:
             if line.strip() and (line.startswith('#') or len(line) < 100):
                 return line.strip('#').strip()
         
@@ -166,24 +176,25 @@ class SEOOptimizer:
         
         return description
     
-    def _optimize_content_structure(self, content: str, primary_keyword: str, 
+    def _optimize_content_structure(self, content: Union[str, TextDocument], primary_keyword: str, 
                                   secondary_keywords: List[str]) -> str:
         """Optimize content structure for SEO."""
-        lines = content.split('\n')
+        document = as_document(content)
         optimized_lines = []
         
         # Track keyword usage
         primary_count = 0
-        target_primary_count = max(3, int(len(content.split()) * self.keyword_density_target))
+        target_primary_count = max(3, int(document.word_count * self.keyword_density_target))
+        primary_lower = primary_keyword.lower()
         
-        for i, line in enumerate(lines):
+        for i, line in enumerate(document.lines):
             # Optimize headings
             if line.startswith('#'):
                 line = self._optimize_heading(line, primary_keyword, secondary_keywords)
             
             # Add keywords naturally
             elif len(line) > 50 and primary_count < target_primary_count:
-                if primary_keyword.lower() not in line.lower() and i % 5 == 0:
+                if primary_lower not in line.lower() and i % 5 == 0:
                     line = self._insert_keyword_naturally(line, primary_keyword)
                     primary_count += 1
             
@@ -252,10 +263,10 @@ class SEOOptimizer:
     def _generate_excerpt(self, content: str) -> str:
         """Generate excerpt from content."""
         # Remove markdown formatting
-        text = re.sub(r'#+ ', '', content)
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-        text = re.sub(r'\*(.*?)\*', r'\1', text)
-        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
+        text = HEADING_MARK_RE.sub('', content)
+        text = BOLD_RE.sub(r'\1', text)
+        text = ITALIC_RE.sub(r'\1', text)
+        text = LINK_RE.sub(r'\1', text)
         
         # Get first 2-3 sentences
         sentences = text.split('. ')[:3]
@@ -266,7 +277,7 @@ class SEOOptimizer:
         
         return excerpt
     
-    def _suggest_schema_markup(self, content: str) -> Dict[str, Any]:
+    def _suggest_schema_markup(self, content: Union[str, TextDocument]) -> Dict[str, Any]:
         """Suggest appropriate schema markup."""
         # Detect content type and suggest schema
         schema_suggestions = {
@@ -283,7 +294,8 @@ class SEOOptimizer:
         }
         
         # Add product schema if product-focused
-        if 'product' in content.lower() or 'price' in content.lower():
+        content_lower = as_document(content).lower
+        if 'product' in content_lower or 'price' in content_lower:
             schema_suggestions['Product'] = {
                 '@context': 'https://schema.org',
                 '@type': 'Product',
@@ -294,93 +306,64 @@ class SEOOptimizer:
         
         return schema_suggestions
     
-    def _identify_improvements(self, original: str, optimized: str) -> List[str]:
+    def _identify_improvements(self, original: Union[str, TextDocument],
+                               optimized: Union[str, TextDocument]) -> List[str]:
         """Identify improvements made."""
         improvements = []
+        original = as_document(original)
+        optimized = as_document(optimized)
         
         # Check keyword additions
-        original_lower = original.lower()
-        optimized_lower = optimized.lower()
+        original_lower = original.lower
+        optimized_lower = optimized.lower
         
         for keyword in ['hemp', 'sustainable', 'industrial']:
             if optimized_lower.count(keyword) > original_lower.count(keyword):
                 improvements.append(f"Added '{keyword}' keyword for better SEO")
         
         # Check structure improvements
-        if optimized.count('#') > original.count('#'):
+        if optimized.text.count('#') > original.text.count('#'):
             improvements.append("Improved heading structure")
         
         # Check meta elements
-        if len(optimized) > len(original):
+        if len(optimized.text) > len(original.text):
             improvements.append("Expanded content for better coverage")
         
         return improvements
     
-    def _calculate_keyword_density(self, content: str, keyword: str) -> float:
+    def analyze(self, content: str) -> TextDocument:
+        """Tokenize content once for reuse across the scoring methods."""
+        return TextDocument(content)
+    
+    def _calculate_keyword_density(self, content: Union[str, TextDocument], keyword: str) -> float:
         """Calculate keyword density."""
-        words = content.lower().split()
-        keyword_count = content.lower().count(keyword.lower())
-        
-        if len(words) == 0:
-            return 0
-        
-        return keyword_count / len(words)
+        return as_document(content).keyword_density(keyword)
     
-    def calculate_readability_score(self, content: str) -> float:
+    def calculate_readability_score(self, content: Union[str, TextDocument]) -> float:
         """Calculate readability score (simplified Flesch Reading Ease)."""
-        # Remove markdown
-        text = re.sub(r'[#*\[\]()]', '', content)
-        
-        # Count sentences
-        sentences = len(re.findall(r'[.!?]+', text))
-        if sentences == 0:
-            sentences = 1
-        
-        # Count words
-        words = len(text.split())
-        if words == 0:
-            return 0
-        
-        # Count syllables (simplified)
-        syllables = sum(self._count_syllables(word) for word in text.split())
-        
-        # Flesch Reading Ease formula
-        score = 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
-        
-        # Normalize to 0-1 scale
-        normalized = max(0, min(100, score)) / 100
-        
-        return round(normalized, 2)
+        return as_document(content).readability
     
     def _count_syllables(self, word: str) -> int:
         """Count syllables in a word (simplified)."""
-        word = word.lower()
-        vowels = 'aeiou'
-        syllables = 0
-        previous_was_vowel = False
-        
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not previous_was_vowel:
-                syllables += 1
-            previous_was_vowel = is_vowel
-        
-        # Adjust for silent e
-        if word.endswith('e'):
-            syllables -= 1
-        
-        # Ensure at least 1 syllable
-        return max(1, syllables)
+        return count_syllables(word)
     
-    def calculate_seo_score(self, content: Dict, keywords: Dict) -> float:
-        """Calculate overall SEO score."""
+    def calculate_seo_score(self, content: Dict, keywords: Dict,
+                            document: Optional[TextDocument] = None) -> float:
+        """Calculate overall SEO score.
+        
+        Pass the ``document`` of ``content['content']`` when it has already
+        been analyzed to avoid tokenizing the body again.
+        """
         score = 0.0
         max_score = 0.0
+        primary_keyword = (keywords.get('primary_keyword') or '').lower()
+        if document is None:
+            document = TextDocument(content.get('content', ''))
         
         # Title optimization (20%)
         max_score += 20
         title = content.get('title', '')
-        if keywords['primary_keyword'].lower() in title.lower():
+        if primary_keyword and primary_keyword in title.lower():
             score += 10
         if self.ideal_title_length[0] <= len(title) <= self.ideal_title_length[1]:
             score += 10
@@ -388,14 +371,14 @@ class SEOOptimizer:
         # Meta description (15%)
         max_score += 15
         meta = content.get('meta_description', '')
-        if keywords['primary_keyword'].lower() in meta.lower():
+        if primary_keyword and primary_keyword in meta.lower():
             score += 8
         if self.ideal_meta_length[0] <= len(meta) <= self.ideal_meta_length[1]:
             score += 7
         
         # Content length (15%)
         max_score += 15
-        word_count = len(content.get('content', '').split())
+        word_count = document.word_count
         if word_count >= 1500:
             score += 15
         elif word_count >= 1000:
@@ -413,10 +396,9 @@ class SEOOptimizer:
         
         # Heading structure (15%)
         max_score += 15
-        content_text = content.get('content', '')
-        if content_text.count('# ') >= 1:  # Has H1
+        if document.h1_markers >= 1:  # Has H1
             score += 5
-        if content_text.count('## ') >= 3:  # Has multiple H2s
+        if document.h2_markers >= 3:  # Has multiple H2s
             score += 10
         
         # Readability (15%)
@@ -424,4 +406,36 @@ class SEOOptimizer:
         readability = content.get('readability_score', 0)
         score += readability * 15
         
-        return round(score / max_score, 2) if max_score > 0 else 0
\ No newline at end of file
+        return round(score / max_score, 2) if max_score > 0 else 0
+    
+    def score_articles(self, articles: Iterable[Dict]) -> List[Dict[str, Any]]:
+        """Score stored articles in bulk, tokenizing each body exactly once.
+        
+        Each article needs ``content`` and may carry ``id``, ``title``,
+        ``meta_description`` and ``seo_keywords`` (the first keyword is
+        treated as primary).
+        """
+        scores = []
+        for article in articles:
+            document = TextDocument(article.get('content') or '')
+            primary_keyword = (article.get('seo_keywords') or [''])[0] or ''
+            readability = document.readability
+            density = document.keyword_density(primary_keyword)
+            seo_score = self.calculate_seo_score(
+                {
+                    'title': article.get('title') or '',
+                    'meta_description': article.get('meta_description') or '',
+                    'keyword_density': density,
+                    'readability_score': readability
+                },
+                {'primary_keyword': primary_keyword},
+                document
+            )
+            scores.append({
+                'id': article.get('id'),
+                'word_count': document.word_count,
+                'keyword_density': round(density, 4),
+                'readability_score': readability,
+                'seo_score': seo_score
+            })
+        return scores
@@ -4,6 +4,8 @@ import json
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from ...utils.prompt_registry import get_prompt_registry
+
 
 class BlogPostTemplate:
     """Template for generating blog posts about hemp products."""
@@ -60,82 +62,19 @@ class BlogPostTemplate:
     
     def _build_prompt(self, product: Dict, word_count: int, tone: str) -> str:
         """Build the generation prompt."""
-        return f"""
-        Write a comprehensive, SEO-optimized blog post about {product['name']}.
-        
-        Product Information:
-        - Name: {product['name']}
-        - Description: {product['description']}
-        - Plant Part: {product['plant_part']}
-        - Industry: {product['industry']}
-        - Benefits: {', '.join(product.get('benefits_advantages', []))}
-        - Sustainability: {', '.join(product.get('sustainability_aspects', []))}
-        - Technical Specs: {json.dumps(product.get('technical_specifications', {}))}
-        - Stage: {product.get('commercialization_stage', 'Growing')}
-        
-        Requirements:
-        1. Target length: {word_count} words
-        2. Tone: {tone}
-        3. SEO-optimized with natural keyword usage
-        4. Engaging and informative
-        5. Scientifically accurate
-        6. No unsubstantiated health claims
-        
-        Structure:
-        
-        # [SEO Title - 50-60 characters]
-        
-        ## Introduction (150-200 words)
-        - Hook the reader
-        - Introduce {product['name']}
-        - Preview what they'll learn
-        
-        ## What is {product['name']}? (200-250 words)
-        - Clear definition
-        - How it's derived from hemp
-        - Key characteristics
-        
-        ## Benefits and Advantages (300-400 words)
-        - Expand on each benefit
-        - Compare to alternatives
-        - Real-world impact
-        
-        ## Sustainability Aspects (250-300 words)
-        - Environmental benefits
-        - Carbon footprint
-        - Renewable aspects
-        
-        ## Applications and Use Cases (300-350 words)
-        - Current applications
-        - Industry adoption
-        - Case studies or examples
-        
-        ## How {product['name']} is Made (200-250 words)
-        - Production process
-        - Quality considerations
-        - Innovation in manufacturing
-        
-        ## Future Outlook (200-250 words)
-        - Market trends
-        - Emerging applications
-        - Research developments
-        
-        ## Conclusion (150-200 words)
-        - Summarize key points
-        - Call to action
-        - Future potential
-        
-        Output as JSON:
-        {{
-            "title": "SEO-optimized title",
-            "meta_description": "150-160 character description",
-            "excerpt": "2-3 sentence summary",
-            "content": "Full blog post in markdown format",
-            "keywords": ["primary", "secondary", "keywords"],
-            "internal_links": ["suggested internal link opportunities"],
-            "external_links": ["authoritative sources to reference"]
-        }}
-        """
+        return get_prompt_registry().render(
+            'content.templates.blog_post.user',
+            product_name=product['name'],
+            description=product['description'],
+            plant_part=product['plant_part'],
+            industry=product['industry'],
+            benefits=', '.join(product.get('benefits_advantages', [])),
+            sustainability=', '.join(product.get('sustainability_aspects', [])),
+            technical_specifications=json.dumps(product.get('technical_specifications', {})),
+            stage=product.get('commercialization_stage', 'Growing'),
+            word_count=word_count,
+            tone=tone
+        )
     
     def validate_output(self, content: Dict) -> tuple[bool, list[str]]:
         """Validate the generated content meets requirements."""
@@ -2,6 +2,8 @@
 
 from typing import Dict, Any
 
+from ...utils.prompt_registry import get_prompt_registry
+
 
 class ProductDescriptionTemplate:
     """Template for generating product descriptions."""
@@ -9,30 +11,14 @@ class ProductDescriptionTemplate:
     async def generate(self, product: Dict[str, Any], ai_provider) -> Dict[str, Any]:
         """Generate a product description."""
         
-        prompt = f"""
-        Write a compelling product description for {product['name']}.
-        
-        Product details:
-        - Description: {product['description']}
-        - Benefits: {', '.join(product.get('benefits_advantages', []))}
-        - Plant part: {product['plant_part']}
-        - Industry: {product['industry']}
-        
-        Requirements:
-        - 200-250 words
-        - Highlight top 3-4 benefits
-        - Include technical specifications
-        - Clear value proposition
-        - SEO-optimized
-        
-        Format:
-        - Attention-grabbing headline
-        - Brief overview
-        - Key benefits (bulleted)
-        - Technical details
-        - Use cases
-        - Call-to-action
-        """
+        prompt = get_prompt_registry().render(
+            'content.templates.product_description.user',
+            product_name=product['name'],
+            description=product['description'],
+            benefits=', '.join(product.get('benefits_advantages', [])),
+            plant_part=product['plant_part'],
+            industry=product['industry']
+        )
         
         response, provider, cost = await ai_provider.generate(prompt, temperature=0.7)
         
@@ -2,6 +2,8 @@
 
 from typing import Dict, Any, List
 
+from ...utils.prompt_registry import get_prompt_registry
+
 
 class SocialMediaTemplate:
     """Template for generating social media content."""
@@ -30,21 +32,17 @@ class SocialMediaTemplate:
         
         config = platform_configs.get(platform, platform_configs['twitter'])
         
-        prompt = f"""
-        Create {variations} {platform} posts about {product['name']}.
-        
-        Product highlights:
-        - {product['description'][:100]}
-        - Benefits: {', '.join(product.get('benefits_advantages', [])[:2])}
-        
-        Requirements:
-        - Maximum {config['max_length']} characters
-        - Include {config['hashtag_count']} relevant hashtags
-        - Style: {config['style']}
-        - Vary the angle for each post
-        
-        Return as a list of posts with content and hashtags.
-        """
+        prompt = get_prompt_registry().render(
+            'content.templates.social_media.user',
+            variations=variations,
+            platform=platform,
+            product_name=product['name'],
+            description=product['description'][:100],
+            benefits=', '.join(product.get('benefits_advantages', [])[:2]),
+            max_length=config['max_length'],
+            hashtag_count=config['hashtag_count'],
+            style=config['style']
+        )
         
         response, provider, cost = await ai_provider.generate(prompt, temperature=0.8)
         
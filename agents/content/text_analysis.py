@@ -0,0 +1,78 @@
+"""Single-pass text analysis shared by the SEO scores."""
+
+import re
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+MARKDOWN_CHARS_RE = re.compile(r'[#*\[\]()]')
+SENTENCE_END_RE = re.compile(r'[.!?]+')
+HEADING_RE = re.compile(r'^(#+)(.*)$', re.MULTILINE)
+VOWEL_GROUP_RE = re.compile(r'[aeiou]+')
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word: str) -> int:
+    """Count syllables in a word (simplified: vowel groups minus a silent e)."""
+    word = word.lower()
+    syllables = len(VOWEL_GROUP_RE.findall(word))
+    if word.endswith('e'):
+        syllables -= 1
+    return max(1, syllables)
+
+
+class TextDocument:
+    """Content tokenized once; every SEO score reads from this object.
+
+    ``words`` are the whitespace tokens of the raw text (used for word
+    counts and keyword density). Readability uses the text with markdown
+    characters stripped, so its word and syllable counts are kept apart.
+    """
+
+    __slots__ = ('text', 'lower', 'words', 'lines', 'headings', 'sentence_count',
+                 'plain_word_count', 'syllable_count', 'h1_markers', 'h2_markers')
+
+    def __init__(self, text: str):
+        self.text = text or ''
+        self.lower = self.text.lower()
+        self.words: List[str] = self.text.split()
+        self.lines: List[str] = self.text.split('\n')
+        self.headings: List[Tuple[int, str]] = [
+            (len(marks), heading.strip()) for marks, heading in HEADING_RE.findall(self.text)
+        ]
+
+        plain_words = MARKDOWN_CHARS_RE.sub('', self.lower).split()
+        self.sentence_count = len(SENTENCE_END_RE.findall(self.text))
+        self.plain_word_count = len(plain_words)
+        self.syllable_count = sum(count_syllables(word) for word in plain_words)
+
+        # Substring counts, as the heading checks in the SEO score have always used
+        self.h1_markers = self.text.count('# ')
+        self.h2_markers = self.text.count('## ')
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    def keyword_count(self, keyword: str) -> int:
+        return self.lower.count(keyword.lower()) if keyword else 0
+
+    def keyword_density(self, keyword: str) -> float:
+        """Occurrences of ``keyword`` per word."""
+        if not self.words:
+            return 0
+        return self.keyword_count(keyword) / len(self.words)
+
+    @property
+    def readability(self) -> float:
+        """Simplified Flesch Reading Ease normalized to 0-1."""
+        if self.plain_word_count == 0:
+            return 0
+        sentences = self.sentence_count or 1
+        score = (206.835 - 1.015 * (self.plain_word_count / sentences)
+                 - 84.6 * (self.syllable_count / self.plain_word_count))
+        return round(max(0, min(100, score)) / 100, 2)
+
+
+def as_document(content: Union[str, TextDocument]) -> TextDocument:
+    """Return ``content`` as a document, tokenizing it only if needed."""
+    return content if isinstance(content, TextDocument) else TextDocument(content)
@@ -17,6 +17,7 @@ import httpx
 
 from ..core.base_agent import BaseAgent, rate_limited, track_performance
 from ..utils.ai_providers import AIProvider
+from ..utils.embeddings import ProductSimilaritySearch
 from .pricing_analyzer import PricingAnalyzer
 from .product_analyzer import ProductAnalyzer
 
@@ -77,6 +78,7 @@ class MonetizationAgent(BaseAgent):
             self.supabase = None
             
         self.ai_provider = AIProvider()
+        self.product_similarity = ProductSimilaritySearch(self.ai_provider)
         self.pricing_analyzer = PricingAnalyzer(config)
         self.product_analyzer = ProductAnalyzer(config)
     
@@ -854,6 +856,37 @@ class MonetizationAgent(BaseAgent):
             logger.error(f"Error getting all products: {e}")
             return []
     
+    async def find_similar_products(self, product_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Find the products most similar to a product using local embeddings"""
+        if product_id not in self.product_similarity.index:
+            await self.refresh_product_vectors()
+        return self.product_similarity.similar_products(product_id, limit)
+    
+    async def refresh_product_vectors(self, page_size: int = 1000) -> int:
+        """Embed new or changed products into the local vector index"""
+        if not self.supabase:
+            return 0
+        
+        indexed = 0
+        offset = 0
+        try:
+            # Pages are buffered and the index file is written once
+            with self.product_similarity.batch():
+                while True:
+                    result = self.supabase.table('uses_products')\
+                        .select('id, name, description')\
+                        .order('id')\
+                        .range(offset, offset + page_size - 1)\
+                        .execute()
+                    indexed += await self.product_similarity.refresh(result.data or [])
+                    if len(result.data or []) < page_size:
+                        break
+                    offset += page_size
+        except Exception as e:
+            logger.error(f"Error refreshing product vectors: {e}")
+        
+        return indexed
+    
     async def _analyze_price_sensitivity(
         self,
         product: Dict[str, Any],
@@ -15,10 +15,11 @@ import uuid
 
 from supabase import create_client, Client
 import httpx
-from bs4 import BeautifulSoup
 
 from ..core.base_agent import BaseAgent, rate_limited, track_performance
 from ..utils.ai_providers import AIProvider
+from ..utils.crawl_scheduler import get_crawl_scheduler
+from ..utils.html_parser import get_parser_service
 from .contact_finder import ContactFinder
 from .email_templates import EmailTemplateGenerator
 
@@ -61,6 +62,8 @@ class OutreachAgent(BaseAgent):
             self.supabase = None
             
         self.ai_provider = AIProvider()
+        self.html_parser = get_parser_service()
+        self.crawler = get_crawl_scheduler()
         self.contact_finder = ContactFinder(config)
         self.template_generator = EmailTemplateGenerator(config)
         
@@ -477,27 +480,28 @@ class OutreachAgent(BaseAgent):
     async def _analyze_website_quality(self, website: str) -> float:
         """Analyze website quality and legitimacy"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(website)
+            async with httpx.AsyncClient(timeout=10.0) as client, self.crawler.slot(website):
+                response = await client.get(website, headers=self.crawler.headers)
                 
                 if response.status_code != 200:
                     return 0.3
                 
                 # Check for quality indicators
-                soup = BeautifulSoup(response.text, 'html.parser')
+                summary = await self.html_parser.page_summary(response.text, website)
+                page_text = response.text.lower()
                 
                 score = 0.5  # Base score
                 
                 # Check for professional indicators
-                if soup.find('meta', {'name': 'description'}):
+                if summary['meta_description']:
                     score += 0.1
-                if soup.find('nav') or soup.find('header'):
+                if summary['has_nav']:
                     score += 0.1
-                if 'contact' in response.text.lower() or 'about' in response.text.lower():
+                if 'contact' in page_text or 'about' in page_text:
                     score += 0.1
-                if soup.find_all('a', href=True).__len__() > 10:
+                if summary['link_count'] > 10:
                     score += 0.1
-                if 'privacy' in response.text.lower() or 'terms' in response.text.lower():
+                if 'privacy' in page_text or 'terms' in page_text:
                     score += 0.1
                 
                 return min(score, 1.0)
@@ -7,11 +7,14 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, urljoin
 import aiohttp
-from bs4 import BeautifulSoup
 import feedparser
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..core.base_agent import BaseAgent, rate_limited, track_performance
+from ..utils.crawl_scheduler import get_crawl_scheduler
+from ..utils.html_parser import get_parser_service
+from ..utils.near_duplicates import ProductDedupIndex, aload_product_index
+from ..utils.prompt_budget import PromptBuilder
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,10 @@ class HempResearchAgent(BaseAgent):
     def __init__(self, supabase_client, ai_provider=None):
         super().__init__(supabase_client, ai_provider)
         self.session = None
+        self.html_parser = get_parser_service()
+        self.crawler = get_crawl_scheduler()
+        self.dedup_index = None
+        self._plant_part_ids: Dict[str, Optional[str]] = {}
         self.sources = self._initialize_sources()
         
     def _initialize_sources(self) -> List[Dict]:
@@ -175,29 +182,22 @@ class HempResearchAgent(BaseAgent):
             self.session = aiohttp.ClientSession()
         
         try:
-            async with self.session.get(source['url'], timeout=30) as response:
+            async with self.crawler.slot(source['url']), \
+                    self.session.get(source['url'], timeout=30, headers=self.crawler.headers) as response:
                 if response.status == 200:
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
                     
-                    # Find news/product items
-                    selectors = source.get('selectors', {})
-                    items = soup.select(selectors.get('news', '.item'))[:20]
+                    # Find news/product items off the event loop for large pages
+                    items = await self.html_parser.items(
+                        html, source['url'], source.get('selectors', {})
+                    )
                     
                     for item in items:
-                        title_elem = item.select_one(selectors.get('title', 'h2'))
-                        content_elem = item.select_one(selectors.get('content', '.content'))
-                        
-                        if title_elem:
-                            product_data = {
-                                'source': source['name'],
-                                'source_type': source['type'],
-                                'title': title_elem.get_text(strip=True),
-                                'description': content_elem.get_text(strip=True) if content_elem else '',
-                                'url': urljoin(source['url'], item.get('href', '')),
-                                'raw_content': str(item)
-                            }
-                            products.append(product_data)
+                        products.append({
+                            'source': source['name'],
+                            'source_type': source['type'],
+                            **item
+                        })
                             
         except Exception as e:
             logger.error(f"Website scraping error for {source['name']}: {e}")
@@ -206,13 +206,21 @@ class HempResearchAgent(BaseAgent):
     
     async def _structure_product_data(self, raw_data: Dict) -> Optional[Dict]:
         """Use AI to structure raw scraped data into product format."""
+        # Title and description are short and most telling; the page content
+        # fills what is left of the budget once its markup is stripped
+        fields = PromptBuilder.for_purpose('structure_product')\
+            .add('title', raw_data.get('title'), priority=0, html_content=True)\
+            .add('description', raw_data.get('description'), priority=1, html_content=True)\
+            .add('content', raw_data.get('raw_content'), priority=2, html_content=True)\
+            .build()
+        
         prompt = f"""
         Extract hemp product information from this data and structure it for our database.
         
         Raw data:
-        Title: {raw_data.get('title', '')}
-        Description: {raw_data.get('description', '')}
-        Content: {raw_data.get('raw_content', '')[:1000]}
+        Title: {fields['title']}
+        Description: {fields['description']}
+        Content: {fields['content']}
         
         Extract and return as JSON:
         - name: Product name (clear and specific)
@@ -279,12 +287,41 @@ class HempResearchAgent(BaseAgent):
         
         return True
     
+    async def _get_dedup_index(self) -> ProductDedupIndex:
+        """Open the near-duplicate index, seeding it from the catalog on first use."""
+        if self.dedup_index is None:
+            self.dedup_index = await aload_product_index(self.supabase)
+        
+        return self.dedup_index
+    
+    async def _plant_part_id(self, plant_part: str) -> Optional[str]:
+        """Resolve a plant part name to its ``plant_parts`` id (cached)."""
+        name = plant_part.lower()
+        if name not in self._plant_part_ids:
+            result = await self.supabase.table('plant_parts').select('id').ilike('name', name).limit(1).execute()
+            self._plant_part_ids[name] = result.data[0]['id'] if result.data else None
+        
+        return self._plant_part_ids[name]
+    
     async def _save_products_to_db(self, products: List[Dict]) -> int:
         """Save discovered products to database."""
         saved_count = 0
+        dedup_index = await self._get_dedup_index()
         
         for product in products:
             try:
+                # Check for near-duplicates of the same plant part
+                # (e.g. "Hemp Seed Milk" vs "Hemp-Seed Milk Beverage"); unknown
+                # plant parts are checked against the whole catalog
+                plant_part_id = await self._plant_part_id(product['plant_part'])
+                duplicate = dedup_index.find_duplicate(
+                    product['name'], product.get('description', ''), group=plant_part_id
+                )
+                if duplicate:
+                    logger.info(f"Product is a near-duplicate of {duplicate['name']} "
+                                f"({duplicate['similarity']:.2f}): {product['name']}")
+                    continue
+                
                 # Check if product already exists
                 existing = await self.supabase.table('uses_products').select('id').eq('name', product['name']).execute()
                 
@@ -309,6 +346,8 @@ class HempResearchAgent(BaseAgent):
                     
                     if result.data:
                         saved_count += 1
+                        dedup_index.add(result.data[0]['id'], product['name'], product['description'],
+                                        group=plant_part_id)
                         logger.info(f"Saved new product: {product['name']}")
                 else:
                     logger.info(f"Product already exists: {product['name']}")
@@ -0,0 +1,251 @@
+"""Fingerprint store that detects new and changed items between scrapes."""
+
+import difflib
+import hashlib
+import logging
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from ...utils.local_store import data_path
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9 ]+')
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Stored per item so the next change can be summarized against it
+MAX_STORED_CONTENT = 20000
+
+# Fallback titles the scraper gives items without a heading; never an identity
+PLACEHOLDER_TITLES = {'untitled update', 'untitled page'}
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace before hashing."""
+    return ' '.join(_NON_WORD_RE.sub(' ', (text or '').lower()).split())
+
+
+def fingerprint(text: str) -> str:
+    """Hash of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def diff_summary(old: str, new: str, max_examples: int = 3) -> Dict:
+    """Summarize sentence-level differences between two versions of a text."""
+    old_sentences = [s.strip() for s in _SENTENCE_RE.split(old or '') if s.strip()]
+    new_sentences = [s.strip() for s in _SENTENCE_RE.split(new or '') if s.strip()]
+
+    added, removed = [], []
+    matcher = difflib.SequenceMatcher(None, old_sentences, new_sentences, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'delete'):
+            removed.extend(old_sentences[i1:i2])
+        if tag in ('replace', 'insert'):
+            added.extend(new_sentences[j1:j2])
+
+    return {
+        'similarity': round(matcher.ratio(), 3),
+        'sentences_added': len(added),
+        'sentences_removed': len(removed),
+        'added': [s[:300] for s in added[:max_examples]],
+        'removed': [s[:300] for s in removed[:max_examples]],
+        'summary': f"{len(added)} sentence(s) added, {len(removed)} removed"
+    }
+
+
+class ChangeTracker:
+    """Per-source, per-item fingerprints with adaptive revisit intervals.
+
+    Each scraped item is keyed by its URL (or, when it links back to the
+    source page, by its title or a hash of its content) and stores hashes of
+    its normalized title and content. Sources that keep changing are
+    revisited more often; sources that stay the same back off towards
+    ``max_interval``.
+
+    ``process`` only stages what it saw; ``ack`` writes it once the caller
+    has handled the changes, so a failed analysis reports them again.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 default_interval: float = 24 * 3600, min_interval: float = 3600,
+                 max_interval: float = 14 * 24 * 3600, backoff: float = 1.5):
+        self.path = Path(path) if path else data_path('regulatory_fingerprints.sqlite')
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        # Source name -> (check time, whether it changed, item rows to write)
+        self._staged: Dict[str, Tuple[float, bool, Dict[str, tuple]]] = {}
+
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(
+            """CREATE TABLE IF NOT EXISTS items (
+                source TEXT NOT NULL,
+                item_key TEXT NOT NULL,
+                title_hash TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                content TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                last_changed REAL NOT NULL,
+                PRIMARY KEY (source, item_key)
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                source TEXT PRIMARY KEY,
+                interval REAL NOT NULL,
+                last_checked REAL,
+                last_changed REAL,
+                checks INTEGER NOT NULL DEFAULT 0,
+                changes INTEGER NOT NULL DEFAULT 0
+            );"""
+        )
+
+    @staticmethod
+    def item_key(update: Dict, source_url: str) -> str:
+        """Stable identity of an update within its source."""
+        url = (update.get('url') or '').split('#')[0].rstrip('/')
+        if url and url != source_url.rstrip('/'):
+            return url
+        title = normalize_text(update.get('title', ''))
+        if title and title not in PLACEHOLDER_TITLES:
+            return 'title:' + title[:200]
+        return 'content:' + fingerprint(update.get('full_content') or update.get('content') or '')
+
+    def _source_row(self, source: str) -> Optional[tuple]:
+        return self._db.execute(
+            'SELECT interval, last_checked, last_changed, checks, changes FROM sources WHERE source = ?',
+            (source,)
+        ).fetchone()
+
+    def is_due(self, source: str, now: Optional[float] = None) -> bool:
+        """Whether the source's revisit interval has elapsed."""
+        row = self._source_row(source)
+        if row is None or row[1] is None:
+            return True
+        return (now or time.time()) - row[1] >= row[0]
+
+    def next_check(self, source: str) -> Optional[float]:
+        """Epoch time at which the source is due again."""
+        row = self._source_row(source)
+        if row is None or row[1] is None:
+            return None
+        return row[1] + row[0]
+
+    def process(self, source: Dict, updates: List[Dict]) -> List[Dict]:
+        """Compare a scrape of ``source`` with the store and return only new or changed updates.
+
+        Returned updates carry ``change_type`` (``'new'`` or ``'changed'``)
+        and, for changed ones, a ``diff`` summary against the stored version.
+        Nothing is written until :meth:`ack`. An empty scrape is treated as a
+        failed check and leaves the revisit interval untouched.
+        """
+        now = time.time()
+        name = source['name']
+        changes = []
+        rows: Dict[str, tuple] = {}
+
+        for update in updates:
+            key = self.item_key(update, source['url'])
+            if key in rows:
+                continue
+            content = update.get('full_content') or update.get('content') or ''
+            title_hash = fingerprint(update.get('title', ''))
+            content_hash = fingerprint(content)
+
+            row = self._db.execute(
+                'SELECT title_hash, content_hash, content FROM items WHERE source = ? AND item_key = ?',
+                (name, key)
+            ).fetchone()
+
+            rows[key] = (title_hash, content_hash, content[:MAX_STORED_CONTENT], row is None
+                         or (row[0], row[1]) != (title_hash, content_hash))
+            if row is None:
+                changes.append({**update, 'change_type': 'new'})
+            elif rows[key][3]:
+                changes.append({
+                    **update,
+                    'change_type': 'changed',
+                    'diff': diff_summary(row[2] or '', content[:MAX_STORED_CONTENT])
+                })
+
+        if updates:
+            self._staged[name] = (now, bool(changes), rows)
+
+        logger.info(f"{name}: {len(changes)} new/changed of {len(updates)} updates")
+        return changes
+
+    def ack(self, sources: Optional[List[str]] = None):
+        """Write the staged fingerprints and checks of ``sources`` (default: all staged)."""
+        for name in list(sources if sources is not None else self._staged):
+            staged = self._staged.pop(name, None)
+            if staged is None:
+                continue
+            now, changed, rows = staged
+            for key, (title_hash, content_hash, content, item_changed) in rows.items():
+                if item_changed:
+                    self._db.execute(
+                        """INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                           ON CONFLICT (source, item_key) DO UPDATE SET
+                               title_hash = excluded.title_hash, content_hash = excluded.content_hash,
+                               content = excluded.content, last_seen = excluded.last_seen,
+                               last_changed = excluded.last_changed""",
+                        (name, key, title_hash, content_hash, content, now, now, now)
+                    )
+                else:
+                    self._db.execute(
+                        'UPDATE items SET last_seen = ? WHERE source = ? AND item_key = ?',
+                        (now, name, key)
+                    )
+            self._record_check(name, changed, now)
+        self._db.commit()
+
+    def discard(self):
+        """Drop staged results so the same changes are reported on the next check."""
+        self._staged.clear()
+
+    def _record_check(self, source: str, changed: bool, now: float):
+        """Adapt the revisit interval: halve it on change, back off otherwise."""
+        row = self._source_row(source)
+        if row is None:
+            interval, last_changed, checks, change_count = self.default_interval, None, 0, 0
+            first_check = True
+        else:
+            interval, _, last_changed, checks, change_count = row
+            first_check = checks == 0
+
+        # The first scrape of a source is all "new"; it says nothing about churn
+        if not first_check:
+            if changed:
+                interval = max(self.min_interval, interval / 2)
+            else:
+                interval = min(self.max_interval, interval * self.backoff)
+
+        self._db.execute(
+            """INSERT OR REPLACE INTO sources (source, interval, last_checked, last_changed, checks, changes)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (source, interval, now, now if changed else last_changed,
+             checks + 1, change_count + (1 if changed else 0))
+        )
+
+    def source_stats(self) -> List[Dict]:
+        """Revisit interval and change history of every tracked source."""
+        return [
+            {
+                'source': source,
+                'interval_hours': round(interval / 3600, 2),
+                'last_checked': last_checked,
+                'last_changed': last_changed,
+                'checks': checks,
+                'changes': changes
+            }
+            for source, interval, last_checked, last_changed, checks, changes in self._db.execute(
+                'SELECT source, interval, last_checked, last_changed, checks, changes FROM sources'
+            )
+        ]
+
+    def close(self):
+        """Close the backing store."""
+        self._db.close()
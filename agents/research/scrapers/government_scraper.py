@@ -8,14 +8,21 @@ import aiohttp
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
+from ...utils.crawl_scheduler import get_crawl_scheduler
+from ...utils.html_parser import get_parser_service, make_soup
+from .change_tracker import ChangeTracker
+
 logger = logging.getLogger(__name__)
 
 
 class GovernmentScraper:
     """Scrapes government websites for hemp-related regulatory information."""
     
-    def __init__(self):
+    def __init__(self, change_tracker: Optional[ChangeTracker] = None):
         self.session = None
+        self.html_parser = get_parser_service()
+        self.crawler = get_crawl_scheduler()
+        self.change_tracker = change_tracker
         self.sources = self._initialize_sources()
         
     def _initialize_sources(self) -> List[Dict]:
@@ -25,7 +32,7 @@ class GovernmentScraper:
                 'name': 'USDA AMS Hemp',
                 'url': 'https://www.ams.usda.gov/rules-regulations/hemp',
                 'type': 'federal',
-                'jurisdiction': 'USA',
+                'jurisdiction': 'United States',
                 'selectors': {
                     'updates': '.node--type-announcement, .node--type-news',
                     'title': 'h2, .node__title',
@@ -37,7 +44,7 @@ class GovernmentScraper:
                 'name': 'FDA Hemp & CBD',
                 'url': 'https://www.fda.gov/news-events/public-health-focus/fda-regulation-cannabis-and-cannabis-derived-products',
                 'type': 'federal',
-                'jurisdiction': 'USA',
+                'jurisdiction': 'United States',
                 'selectors': {
                     'updates': '.list-item',
                     'title': 'h3, .title',
@@ -49,7 +56,7 @@ class GovernmentScraper:
                 'name': 'DEA Hemp',
                 'url': 'https://www.dea.gov/drug-information/hemp',
                 'type': 'federal',
-                'jurisdiction': 'USA',
+                'jurisdiction': 'United States',
                 'selectors': {
                     'content': '.content-area',
                     'regulations': '.regulation-item'
@@ -84,18 +91,58 @@ class GovernmentScraper:
         
         return all_updates
     
+    async def scrape_changes(self, force: bool = False) -> List[Dict]:
+        """Scrape due sources and return only new or changed updates.
+        
+        Sources are skipped until their adaptive revisit interval has elapsed
+        unless ``force`` is set.
+        """
+        if self.change_tracker is None:
+            self.change_tracker = ChangeTracker()
+        
+        due_sources = [
+            source for source in self.sources
+            if force or self.change_tracker.is_due(source['name'])
+        ]
+        if not due_sources:
+            logger.info("No government sources due for a revisit")
+            return []
+        
+        changes = []
+        async with aiohttp.ClientSession() as self.session:
+            results = await asyncio.gather(
+                *(self.scrape_source(source) for source in due_sources),
+                return_exceptions=True
+            )
+        
+        for source, result in zip(due_sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Scraping error for {source['name']}: {result}")
+                continue
+            changes.extend(self.change_tracker.process(source, result))
+        
+        return changes
+    
+    def ack_changes(self):
+        """Record the fingerprints from the last ``scrape_changes`` once its changes are handled.
+        
+        Until then the same changes are reported again on the next run.
+        """
+        if self.change_tracker is not None:
+            self.change_tracker.ack()
+    
     async def scrape_source(self, source: Dict) -> List[Dict]:
         """Scrape a single government source."""
         updates = []
         
         try:
-            async with self.session.get(source['url'], timeout=30) as response:
+            async with self.crawler.slot(source['url']), \
+                    self.session.get(source['url'], timeout=30, headers=self.crawler.headers) as response:
                 if response.status == 200:
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
                     
                     # Extract updates based on selectors
-                    updates = self._extract_updates(soup, source)
+                    updates = await self.html_parser.parse(html, _extract_updates_from_html, source)
                     
                     logger.info(f"Scraped {len(updates)} updates from {source['name']}")
                 else:
@@ -108,7 +155,8 @@ class GovernmentScraper:
             
         return updates
     
-    def _extract_updates(self, soup: BeautifulSoup, source: Dict) -> List[Dict]:
+    @staticmethod
+    def _extract_updates(soup: BeautifulSoup, source: Dict) -> List[Dict]:
         """Extract regulatory updates from parsed HTML."""
         updates = []
         selectors = source.get('selectors', {})
@@ -119,7 +167,7 @@ class GovernmentScraper:
             update_elements = soup.select(update_selector)
             
             for element in update_elements[:10]:  # Limit to recent updates
-                update = self._parse_update_element(element, source, soup)
+                update = GovernmentScraper._parse_update_element(element, source, soup)
                 if update:
                     updates.append(update)
         else:
@@ -133,37 +181,38 @@ class GovernmentScraper:
                     'url': source['url'],
                     'type': 'general_content',
                     'jurisdiction': source['jurisdiction'],
-                    'title': self._extract_page_title(soup),
-                    'content': self._clean_text(content_element.get_text()),
+                    'title': GovernmentScraper._extract_page_title(soup),
+                    'content': GovernmentScraper._clean_text(content_element.get_text()),
                     'extracted_date': datetime.now().isoformat()
                 }
                 updates.append(update)
         
         return updates
     
-    def _parse_update_element(self, element, source: Dict, soup: BeautifulSoup) -> Optional[Dict]:
+    @staticmethod
+    def _parse_update_element(element, source: Dict, soup: BeautifulSoup) -> Optional[Dict]:
         """Parse a single update element."""
         selectors = source.get('selectors', {})
         
         # Extract title
         title_selector = selectors.get('title')
         title_elem = element.select_one(title_selector) if title_selector else None
-        title = self._clean_text(title_elem.get_text()) if title_elem else None
+        title = GovernmentScraper._clean_text(title_elem.get_text()) if title_elem else None
         
         if not title:
             # Try to find any heading
             heading = element.find(['h1', 'h2', 'h3', 'h4'])
-            title = self._clean_text(heading.get_text()) if heading else 'Untitled Update'
+            title = GovernmentScraper._clean_text(heading.get_text()) if heading else 'Untitled Update'
         
         # Extract content
         content_selector = selectors.get('content')
         content_elem = element.select_one(content_selector) if content_selector else element
-        content = self._clean_text(content_elem.get_text())
+        content = GovernmentScraper._clean_text(content_elem.get_text())
         
         # Extract date
         date_selector = selectors.get('date')
         date_elem = element.select_one(date_selector) if date_selector else None
-        date_str = self._parse_date(date_elem) if date_elem else None
+        date_str = GovernmentScraper._parse_date(date_elem) if date_elem else None
         
         # Extract URL if it's a link
         link = element.find('a') or element.find_parent('a')
@@ -185,7 +234,8 @@ class GovernmentScraper:
             }
         }
     
-    def _extract_page_title(self, soup: BeautifulSoup) -> str:
+    @staticmethod
+    def _extract_page_title(soup: BeautifulSoup) -> str:
         """Extract page title."""
         # Try various title selectors
         title_selectors = ['h1', 'title', '.page-title', '#page-title']
@@ -193,11 +243,12 @@ class GovernmentScraper:
         for selector in title_selectors:
             title_elem = soup.select_one(selector)
             if title_elem:
-                return self._clean_text(title_elem.get_text())
+                return GovernmentScraper._clean_text(title_elem.get_text())
         
         return 'Untitled Page'
     
-    def _parse_date(self, date_elem) -> Optional[str]:
+    @staticmethod
+    def _parse_date(date_elem) -> Optional[str]:
         """Parse date from various formats."""
         if not date_elem:
             return None
@@ -222,7 +273,8 @@ class GovernmentScraper:
         # If parsing fails, return the raw text
         return date_text
     
-    def _clean_text(self, text: str) -> str:
+    @staticmethod
+    def _clean_text(text: str) -> str:
         """Clean and normalize text."""
         # Remove excessive whitespace
         text = ' '.join(text.split())
@@ -238,29 +290,21 @@ class GovernmentScraper:
         """Scrape a specific regulation page."""
         async with aiohttp.ClientSession() as session:
             try:
-                async with session.get(url, timeout=30) as response:
+                async with self.crawler.slot(url), \
+                        session.get(url, timeout=30, headers=self.crawler.headers) as response:
                     if response.status == 200:
                         html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
                         
                         # Extract regulation details
-                        regulation = {
-                            'url': url,
-                            'title': self._extract_page_title(soup),
-                            'content': self._extract_regulation_content(soup),
-                            'effective_date': self._extract_effective_date(soup),
-                            'jurisdiction': self._determine_jurisdiction(url),
-                            'extracted_date': datetime.now().isoformat()
-                        }
-                        
-                        return regulation
+                        return await self.html_parser.parse(html, _extract_regulation_from_html, url)
                         
             except Exception as e:
                 logger.error(f"Error scraping regulation {url}: {e}")
                 
         return None
     
-    def _extract_regulation_content(self, soup: BeautifulSoup) -> str:
+    @staticmethod
+    def _extract_regulation_content(soup: BeautifulSoup) -> str:
         """Extract main content from regulation page."""
         # Common content selectors
         content_selectors = [
@@ -271,13 +315,14 @@ class GovernmentScraper:
         for selector in content_selectors:
             content = soup.select_one(selector)
             if content:
-                return self._clean_text(content.get_text())
+                return GovernmentScraper._clean_text(content.get_text())
         
         # Fallback to body
         body = soup.find('body')
-        return self._clean_text(body.get_text()) if body else ''
+        return GovernmentScraper._clean_text(body.get_text()) if body else ''
     
-    def _extract_effective_date(self, soup: BeautifulSoup) -> Optional[str]:
+    @staticmethod
+    def _extract_effective_date(soup: BeautifulSoup) -> Optional[str]:
         """Extract effective date from regulation page."""
         # Look for common effective date patterns
         date_patterns = [
@@ -302,20 +347,45 @@ class GovernmentScraper:
         
         return None
     
-    def _determine_jurisdiction(self, url: str) -> str:
-        """Determine jurisdiction from URL."""
+    @staticmethod
+    def _determine_jurisdiction(url: str) -> str:
+        """Determine jurisdiction from URL.
+        
+        Uses the ``regulatory_jurisdictions`` names, like the configured sources.
+        """
         domain = urlparse(url).netloc.lower()
+        state_domains = {'.ca.gov': 'California', '.ny.gov': 'New York', '.co.gov': 'Colorado'}
         
         if '.gov' in domain:
             if 'usda' in domain or 'fda' in domain or 'dea' in domain:
-                return 'USA Federal'
-            elif any(state in domain for state in ['.ca.gov', '.ny.gov', '.co.gov']):
-                return 'USA State'
+                return 'United States'
+            for state_domain, state in state_domains.items():
+                if state_domain in domain:
+                    return state
         elif '.gc.ca' in domain or 'canada.ca' in domain:
-            return 'Canada Federal'
+            return 'Canada'
         elif '.gov.uk' in domain:
-            return 'UK'
+            return 'United Kingdom'
         elif '.europa.eu' in domain:
-            return 'EU'
+            return 'European Union'
         
-        return 'Unknown'
\ No newline at end of file
+        return 'Unknown'
+
+
+def _extract_updates_from_html(html: str, source: Dict) -> List[Dict]:
+    """Parse a source page and extract its updates (runs in the parser pool)."""
+    return GovernmentScraper._extract_updates(make_soup(html), source)
+
+
+def _extract_regulation_from_html(html: str, url: str) -> Dict:
+    """Parse a regulation page into a regulation record (runs in the parser pool)."""
+    soup = make_soup(html)
+    
+    return {
+        'url': url,
+        'title': GovernmentScraper._extract_page_title(soup),
+        'content': GovernmentScraper._extract_regulation_content(soup),
+        'effective_date': GovernmentScraper._extract_effective_date(soup),
+        'jurisdiction': GovernmentScraper._determine_jurisdiction(url),
+        'extracted_date': datetime.now().isoformat()
+    }
@@ -0,0 +1,115 @@
+"""Per-URL fingerprints and cached page analyses for incremental re-audits."""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from ..utils.local_store import data_path
+
+logger = logging.getLogger(__name__)
+
+# Inline scripts, styles and comments often carry per-request nonces and
+# timestamps that would defeat the content hash
+_VOLATILE_RE = re.compile(r'<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+
+
+def content_fingerprint(html: str) -> str:
+    """Hash of the page markup with volatile blocks and whitespace removed."""
+    normalized = ' '.join(_VOLATILE_RE.sub(' ', html or '').split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class PageFingerprintStore:
+    """Remembers validators, content hash and the last analysis of each page."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else data_path('seo_page_fingerprints.sqlite')
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                analysis TEXT NOT NULL,
+                audited_at REAL NOT NULL
+            )"""
+        )
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Stored fingerprint and analysis of a page."""
+        row = self._db.execute(
+            'SELECT etag, last_modified, content_hash, analysis, audited_at FROM pages WHERE url = ?',
+            (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'content_hash': row[2],
+            'analysis': json.loads(row[3]),
+            'audited_at': row[4]
+        }
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored analyses for several pages, keyed by URL."""
+        urls = list(urls)
+        found = {}
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for url, analysis in self._db.execute(
+                f'SELECT url, analysis FROM pages WHERE url IN ({placeholders})', chunk
+            ):
+                found[url] = json.loads(analysis)
+        return found
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """``If-None-Match``/``If-Modified-Since`` headers for a revisit."""
+        row = self._db.execute(
+            'SELECT etag, last_modified FROM pages WHERE url = ?', (url,)
+        ).fetchone()
+        headers = {}
+        if row and row[0]:
+            headers['If-None-Match'] = row[0]
+        if row and row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def put(self, url: str, analysis: Dict[str, Any], etag: Optional[str] = None,
+            last_modified: Optional[str] = None, content_hash: Optional[str] = None):
+        """Store the analysis of a freshly fetched page."""
+        self._db.execute(
+            """INSERT OR REPLACE INTO pages (url, etag, last_modified, content_hash, analysis, audited_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (url, etag, last_modified, content_hash, json.dumps(analysis, default=str), time.time())
+        )
+        self._db.commit()
+
+    def close(self):
+        """Close the backing store."""
+        self._db.close()
+
+
+def reused_analysis(stored: Dict[str, Any], reason: str) -> Dict[str, Any]:
+    """Copy of a stored analysis marked as reused."""
+    analysis = dict(stored)
+    analysis['reused'] = reason
+    return analysis
+
+
+def summarize_reuse(pages: List[Dict[str, Any]]) -> Dict[str, int]:
+    """How many audited pages were fetched fresh versus reused."""
+    reasons = [page.get('reused') for page in pages]
+    return {
+        'analyzed': sum(1 for reason in reasons if reason is None),
+        'not_modified': sum(1 for reason in reasons if reason == 'not_modified'),
+        'unchanged_content': sum(1 for reason in reasons if reason == 'unchanged_content'),
+        'unchanged_lastmod': sum(1 for reason in reasons if reason == 'unchanged_lastmod')
+    }
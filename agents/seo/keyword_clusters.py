@@ -0,0 +1,108 @@
+"""Grouping of near-identical keyword variants so each cluster is estimated once."""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from .keyword_estimator import tokenize
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = frozenset({'a', 'an', 'the', 'for', 'of', 'to', 'in', 'on', 'and', 'with', 'your', 'my', 'from'})
+IRREGULAR = {'uses': 'use', 'using': 'use', 'used': 'use', 'prices': 'price', 'pricing': 'price',
+             'buying': 'buy', 'bought': 'buy'}
+
+
+def lemma(token: str) -> str:
+    """Cheap suffix-stripping lemma: plurals and -ing forms."""
+    if token in IRREGULAR:
+        return IRREGULAR[token]
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 5 and token.endswith('ing'):
+        return token[:-3]
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def cluster_key(keyword: str) -> str:
+    """Order-insensitive key of a keyword: its sorted set of lemmas without stopwords."""
+    lemmas = {lemma(token) for token in tokenize(keyword) if token not in STOPWORDS}
+    return ' '.join(sorted(lemmas)) or keyword.lower().strip()
+
+
+@dataclass
+class KeywordCluster:
+    """A representative keyword and the variants that share its metrics."""
+    representative: str
+    members: List[str] = field(default_factory=list)
+
+    @property
+    def variants(self) -> List[str]:
+        return [member for member in self.members if member != self.representative]
+
+
+def _pick_representative(members: List[str]) -> str:
+    # Generated variations come first in the input and read most naturally,
+    # so the first phrasing seen stands for the cluster
+    return members[0]
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int):
+        self.parent[self.find(a)] = self.find(b)
+
+
+async def cluster_keywords(keywords: Iterable[str], embedding_service=None,
+                           similarity_threshold: float = 0.92) -> List[KeywordCluster]:
+    """Group keyword variants.
+
+    Keywords with the same normalized token set ("buy hemp oil" / "hemp oil
+    buy" / "buying hemp oils") always share a cluster. With an
+    ``EmbeddingService``, clusters whose representatives are embedded
+    within ``similarity_threshold`` cosine similarity are merged as well.
+    """
+    groups: Dict[str, List[str]] = {}
+    for keyword in dict.fromkeys(keyword.strip() for keyword in keywords if keyword and keyword.strip()):
+        groups.setdefault(cluster_key(keyword), []).append(keyword)
+
+    clusters = [KeywordCluster(_pick_representative(members), members) for members in groups.values()]
+
+    if embedding_service is not None and len(clusters) > 1:
+        try:
+            clusters = await _merge_semantic(clusters, embedding_service, similarity_threshold)
+        except Exception as e:
+            logger.warning(f"Semantic keyword clustering skipped: {e}")
+
+    return clusters
+
+
+async def _merge_semantic(clusters: List[KeywordCluster], embedding_service,
+                          similarity_threshold: float) -> List[KeywordCluster]:
+    vectors = await embedding_service.embed_texts([cluster.representative for cluster in clusters])
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms
+
+    similarity = vectors @ vectors.T
+    rows, cols = np.nonzero(np.triu(similarity >= similarity_threshold, k=1))
+    union_find = _UnionFind(len(clusters))
+    for a, b in zip(rows.tolist(), cols.tolist()):
+        union_find.union(a, b)
+
+    merged: Dict[int, List[str]] = {}
+    for index, cluster in enumerate(clusters):
+        merged.setdefault(union_find.find(index), []).extend(cluster.members)
+    return [KeywordCluster(_pick_representative(members), members) for members in merged.values()]
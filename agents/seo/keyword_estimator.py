@@ -0,0 +1,212 @@
+"""Local keyword metrics estimator trained on stored keyword rows."""
+
+import logging
+import re
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..utils.local_store import data_path
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+COMMERCIAL_TERMS = frozenset({'buy', 'shop', 'sale', 'price', 'prices', 'cost', 'cheap', 'wholesale',
+                              'supplier', 'suppliers', 'order', 'best', 'review', 'reviews', 'vs'})
+QUESTION_TERMS = frozenset({'how', 'what', 'why', 'when', 'where', 'which', 'who', 'can', 'does', 'is', 'are'})
+LOCAL_TERMS = frozenset({'near', 'local', 'usa', 'us', 'uk', 'canada', 'europe', 'state', 'city'})
+TRENDS = ('rising', 'stable', 'declining')
+
+
+def tokenize(keyword: str) -> List[str]:
+    return TOKEN_RE.findall(keyword.lower())
+
+
+class KeywordMetricsEstimator:
+    """Ridge regression over hashed n-grams plus intent and length features.
+
+    Search volume and CPC are fitted in log space. Confidence is the mean
+    cosine similarity of a keyword to its nearest training keywords, so
+    keywords unlike anything seen before fall back to the LLM. Trend is
+    the majority trend of those neighbours.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, n_features: int = 1024,
+                 alpha: float = 1.0, neighbours: int = 5, min_samples: int = 50,
+                 max_reference: int = 5000, max_age_seconds: float = 86400):
+        self.path = Path(path) if path else data_path('keyword_estimator.npz')
+        self.n_features = n_features
+        self.alpha = alpha
+        self.neighbours = neighbours
+        self.min_samples = min_samples
+        self.max_reference = max_reference
+        self.max_age_seconds = max_age_seconds
+        self.weights: Optional[np.ndarray] = None
+        self.reference: Optional[np.ndarray] = None
+        self.reference_trends: Optional[np.ndarray] = None
+        self.n_samples = 0
+        self.trained_at = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.weights is not None and self.n_samples >= self.min_samples
+
+    def _hashed(self, keywords: Sequence[str]) -> np.ndarray:
+        """L2-normalized hashed word unigrams, bigrams and character trigrams."""
+        matrix = np.zeros((len(keywords), self.n_features), dtype=np.float32)
+        for row, keyword in enumerate(keywords):
+            tokens = tokenize(keyword)
+            grams = [f"w:{token}" for token in tokens]
+            grams += [f"b:{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            text = f" {' '.join(tokens)} "
+            grams += [f"c:{text[i:i + 3]}" for i in range(len(text) - 2)]
+            for gram in grams:
+                weight = 0.5 if gram.startswith('c:') else 1.0
+                matrix[row, zlib.crc32(gram.encode('utf-8')) % self.n_features] += weight
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    @staticmethod
+    def _dense(keywords: Sequence[str]) -> np.ndarray:
+        """Length and intent features plus a bias column."""
+        rows = []
+        for keyword in keywords:
+            tokens = tokenize(keyword)
+            token_set = set(tokens)
+            rows.append([
+                1.0,
+                len(tokens) / 5.0,
+                len(keyword) / 40.0,
+                float(bool(token_set & COMMERCIAL_TERMS)),
+                float(bool(token_set & QUESTION_TERMS)),
+                float(bool(token_set & LOCAL_TERMS)),
+                float('hemp' in token_set),
+                float('cbd' in token_set)
+            ])
+        return np.asarray(rows, dtype=np.float32).reshape(len(keywords), 8)
+
+    def featurize(self, keywords: Sequence[str]) -> np.ndarray:
+        return np.hstack([self._hashed(keywords), self._dense(keywords)])
+
+    def fit(self, rows: List[Dict[str, Any]]) -> 'KeywordMetricsEstimator':
+        """Fit on rows with ``keyword``, ``search_volume``, ``difficulty_score`` and ``cpc_usd``."""
+        rows = [row for row in rows if row.get('keyword') and row.get('search_volume') is not None]
+        self.n_samples = len(rows)
+        self.trained_at = time.time()
+        if self.n_samples < self.min_samples:
+            logger.info(f"Keyword estimator needs {self.min_samples} rows, have {self.n_samples}")
+            self.weights = None
+            return self
+
+        keywords = [row['keyword'] for row in rows]
+        features = self.featurize(keywords).astype(np.float64)
+        targets = np.column_stack([
+            np.log1p([max(float(row['search_volume']), 0.0) for row in rows]),
+            [float(row.get('difficulty_score') or 50) for row in rows],
+            np.log1p([max(float(row.get('cpc_usd') or 0), 0.0) for row in rows])
+        ])
+
+        gram = features.T @ features + self.alpha * np.eye(features.shape[1])
+        self.weights = np.linalg.solve(gram, features.T @ targets)
+
+        # Most recent rows serve as neighbours for confidence and trend
+        reference_rows = slice(-self.max_reference, None)
+        self.reference = features[reference_rows, :self.n_features].astype(np.float32)
+        self.reference_trends = np.asarray(
+            [row.get('trend') or 'stable' for row in rows[reference_rows]], dtype='U10'
+        )
+        return self
+
+    def predict(self, keywords: Sequence[str]) -> List[Dict[str, Any]]:
+        """Metrics and confidence (0-1) per keyword; confidence is 0 when untrained."""
+        if not keywords:
+            return []
+        if not self.ready:
+            return [{'confidence': 0.0} for _ in keywords]
+
+        features = self.featurize(keywords)
+        outputs = features.astype(np.float64) @ self.weights
+
+        similarity = features[:, :self.n_features] @ self.reference.T
+        k = min(self.neighbours, similarity.shape[1])
+        nearest = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        nearest_similarity = np.take_along_axis(similarity, nearest, axis=1)
+        confidence = np.clip(nearest_similarity.mean(axis=1), 0.0, 1.0)
+
+        predictions = []
+        for i in range(len(keywords)):
+            trend = Counter(self.reference_trends[nearest[i]].tolist()).most_common(1)[0][0]
+            predictions.append({
+                'search_volume': int(round(np.expm1(max(outputs[i, 0], 0.0)))),
+                'difficulty': round(float(np.clip(outputs[i, 1], 0, 99)), 2),
+                'cpc': round(float(np.expm1(max(outputs[i, 2], 0.0))), 2),
+                'trend': trend if trend in TRENDS else 'stable',
+                'confidence': round(float(confidence[i]), 3)
+            })
+        return predictions
+
+    def save(self):
+        """Persist the fitted model next to the other local agent state."""
+        if self.weights is None:
+            return
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path, weights=self.weights, reference=self.reference,
+            reference_trends=self.reference_trends,
+            meta=np.array([self.n_samples, self.trained_at, self.n_features])
+        )
+        tmp_path.replace(self.path)
+
+    def load(self) -> bool:
+        """Load a saved model; returns False when missing, stale or incompatible."""
+        if not self.path.exists():
+            return False
+        try:
+            with np.load(self.path, allow_pickle=False) as saved:
+                n_samples, trained_at, n_features = saved['meta']
+                if int(n_features) != self.n_features:
+                    return False
+                if time.time() - trained_at > self.max_age_seconds:
+                    return False
+                self.weights = saved['weights']
+                self.reference = saved['reference']
+                self.reference_trends = saved['reference_trends']
+                self.n_samples = int(n_samples)
+                self.trained_at = float(trained_at)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load keyword estimator from {self.path}: {e}")
+            return False
+
+    async def refresh(self, supabase_client, page_size: int = 1000, max_rows: int = 50000) -> bool:
+        """Load the saved model or retrain it from ``agent_seo_keywords``; returns readiness."""
+        if self.trained_at and time.time() - self.trained_at <= self.max_age_seconds:
+            return self.ready
+        if self.load():
+            return self.ready
+
+        # Newest rows first so ``max_rows`` keeps the most recent metrics
+        rows = []
+        while len(rows) < max_rows:
+            # Train on externally estimated metrics only, never on our own predictions
+            result = await supabase_client.table('agent_seo_keywords')\
+                .select('keyword, search_volume, difficulty_score, cpc_usd, trend')\
+                .not_.is_('search_volume', 'null')\
+                .or_('metrics_source.is.null,metrics_source.eq.llm')\
+                .order('last_checked_at', desc=True)\
+                .range(len(rows), len(rows) + page_size - 1)\
+                .execute()
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                break
+
+        rows.reverse()
+        self.fit(rows[-max_rows:])
+        self.save()
+        return self.ready
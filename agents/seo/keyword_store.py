@@ -0,0 +1,130 @@
+"""Keyword metrics repository: bulk lookups, chunked upserts and freshness TTL."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'agent_seo_keywords'
+METRIC_FIELDS = ('search_volume', 'difficulty_score', 'cpc_usd', 'trend')
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp from the database as an aware UTC datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def ranking_trend(old_position: Optional[int], new_position: Optional[int]) -> str:
+    """'rising' when the position number went down, 'declining' when it went up."""
+    if old_position is None or new_position is None or new_position == old_position:
+        return 'stable'
+    return 'rising' if new_position < old_position else 'declining'
+
+
+class KeywordRepository:
+    """Reads and writes ``agent_seo_keywords`` in bulk.
+
+    Lookups for a keyword list go out as ``in_()`` queries and writes as
+    ``upsert(on_conflict='keyword')`` batches, so a research or ranking run
+    costs a couple of round trips instead of two per keyword.
+    """
+
+    def __init__(self, supabase_client, ttl: timedelta = timedelta(days=7), chunk_size: int = 500):
+        self.supabase = supabase_client
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+
+    def _chunks(self, items: List[Any]) -> Iterable[List[Any]]:
+        for start in range(0, len(items), self.chunk_size):
+            yield items[start:start + self.chunk_size]
+
+    async def get_many(self, keywords: Iterable[str], columns: str = '*') -> Dict[str, Dict[str, Any]]:
+        """Stored rows for ``keywords``, keyed by keyword."""
+        unique = list(dict.fromkeys(keywords))
+        found = {}
+        for chunk in self._chunks(unique):
+            result = await self.supabase.table(TABLE)\
+                .select(columns)\
+                .in_('keyword', chunk)\
+                .execute()
+            for row in result.data or []:
+                found[row['keyword']] = row
+        return found
+
+    def is_fresh(self, row: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> bool:
+        """Whether a stored row has metrics checked within the TTL."""
+        if not row or row.get('search_volume') is None:
+            return False
+        checked_at = parse_timestamp(row.get('last_checked_at'))
+        if checked_at is None:
+            return False
+        return (now or datetime.now(timezone.utc)) - checked_at < self.ttl
+
+    async def split_fresh(self, keywords: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """Partition keywords into fresh stored metrics and keywords needing estimates."""
+        keywords = list(dict.fromkeys(keywords))
+        stored = await self.get_many(keywords)
+        now = datetime.now(timezone.utc)
+        fresh = {kw: stored[kw] for kw in keywords if self.is_fresh(stored.get(kw), now)}
+        return fresh, [kw for kw in keywords if kw not in fresh]
+
+    async def _upsert(self, rows: List[Dict[str, Any]]) -> int:
+        written = 0
+        for chunk in self._chunks(rows):
+            try:
+                await self.supabase.table(TABLE)\
+                    .upsert(chunk, on_conflict='keyword')\
+                    .execute()
+                written += len(chunk)
+            except Exception as e:
+                logger.error(f"Error upserting {len(chunk)} keywords: {e}")
+        return written
+
+    async def save_metrics(self, keywords: List[Dict[str, Any]]) -> int:
+        """Upsert keyword metrics; returns how many keywords were new."""
+        now = datetime.utcnow().isoformat()
+        rows = {}
+        for kw in keywords:
+            rows[kw['keyword']] = {
+                'keyword': kw['keyword'],
+                'search_volume': kw.get('search_volume', 0),
+                'difficulty_score': kw.get('difficulty_score', 50),
+                'cpc_usd': kw.get('cpc_usd', 0),
+                'trend': kw.get('trend', 'stable'),
+                'metrics_source': kw.get('metrics_source', 'llm'),
+                'last_checked_at': now
+            }
+        if not rows:
+            return 0
+
+        existing = await self.get_many(rows, columns='keyword')
+        await self._upsert(list(rows.values()))
+        return sum(1 for keyword in rows if keyword not in existing)
+
+    async def save_rankings(self, rankings: List[Dict[str, Any]]) -> Dict[str, Optional[int]]:
+        """Upsert ranking results; returns the previous position of each keyword."""
+        if not rankings:
+            return {}
+
+        existing = await self.get_many((r['keyword'] for r in rankings), columns='keyword, current_position')
+        previous = {kw: row.get('current_position') for kw, row in existing.items()}
+        rows = {}
+        for ranking in rankings:
+            keyword = ranking['keyword']
+            rows[keyword] = {
+                'keyword': keyword,
+                'current_position': ranking.get('position'),
+                'url_ranking': ranking.get('url_ranking'),
+                'competitors': ranking.get('competitors', []),
+                'last_checked_at': ranking.get('checked_at'),
+                'trend': ranking_trend(previous.get(keyword), ranking.get('position'))
+            }
+        await self._upsert(list(rows.values()))
+        return previous
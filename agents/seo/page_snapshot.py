@@ -0,0 +1,111 @@
+"""Per-audit cache of fetched pages shared by the SEO checks."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .audit_store import PageFingerprintStore
+from .site_crawler import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PageSnapshot:
+    """A fetched page: body, headers and timings of the single GET."""
+    url: str
+    final_url: str
+    status: int
+    headers: Dict[str, str]
+    body: str
+    size_bytes: int
+    ttfb_seconds: float
+    load_seconds: float
+    fetched_at: float = field(default_factory=time.time)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+    def header(self, name: str) -> Optional[str]:
+        """Case-insensitive response header lookup."""
+        name = name.lower()
+        return next((value for key, value in self.headers.items() if key.lower() == name), None)
+
+
+class PageSnapshotCache:
+    """Fetches each URL at most once per audit and hands out the snapshot.
+
+    Concurrent requests for the same URL share one in-flight fetch. Sitemap
+    entries are kept here too so the audit and the sitemap check reuse a
+    single download. With a fingerprint store, conditional fetches send the
+    stored validators and may come back as ``304 Not Modified`` snapshots.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, crawler, timeout: float = 30,
+                 fingerprints: Optional[PageFingerprintStore] = None):
+        self.session = session
+        self.crawler = crawler
+        self.timeout = timeout
+        self.fingerprints = fingerprints
+        # Sitemap URL counts seen while reading each site's sitemaps, and
+        # whether the sitemaps were read to the end (else a lower bound)
+        self.sitemaps: Dict[str, Tuple[int, bool]] = {}
+        self._fetches: Dict[str, asyncio.Task] = {}
+
+    async def _fetch(self, url: str, headers: Dict[str, str]) -> PageSnapshot:
+        async with self.crawler.slot(url):
+            start = time.perf_counter()
+            async with self.session.get(url, timeout=self.timeout,
+                                        headers={**self.crawler.headers, **headers}) as response:
+                ttfb = time.perf_counter() - start
+                raw = await response.read()
+                load_time = time.perf_counter() - start
+                return PageSnapshot(
+                    url=url,
+                    final_url=str(response.url),
+                    status=response.status,
+                    headers=dict(response.headers),
+                    body=raw.decode(response.charset or 'utf-8', errors='replace'),
+                    size_bytes=len(raw),
+                    ttfb_seconds=ttfb,
+                    load_seconds=load_time
+                )
+
+    async def get(self, url: str, conditional: bool = False) -> PageSnapshot:
+        """Return the snapshot of ``url``, fetching it on first use.
+
+        ``conditional`` revalidates against the fingerprint store; callers
+        that need the body always get a full (non-304) snapshot.
+        """
+        key = canonicalize_url(url) or url
+        task = self._fetches.get(key)
+        if task is None:
+            headers = {}
+            if conditional and self.fingerprints is not None:
+                headers = self.fingerprints.conditional_headers(key)
+            task = asyncio.ensure_future(self._fetch(url, headers))
+            self._fetches[key] = task
+
+        snapshot = await asyncio.shield(task)
+        if snapshot.not_modified and not conditional:
+            if self._fetches.get(key) is task:
+                self._fetches[key] = asyncio.ensure_future(self._fetch(url, {}))
+            snapshot = await asyncio.shield(self._fetches[key])
+        return snapshot
+
+    def clear(self):
+        """Drop all snapshots (bodies can be large)."""
+        for task in self._fetches.values():
+            if not task.done():
+                task.cancel()
+        self._fetches.clear()
+        self.sitemaps.clear()
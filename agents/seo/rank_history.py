@@ -0,0 +1,126 @@
+"""Keyword ranking time series: append-only history and vectorized trend statistics."""
+
+import logging
+import warnings
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from .keyword_store import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'agent_seo_ranking_history'
+NOT_RANKING = 101  # Position used for "not in the top 100" when computing deltas
+
+
+class RankHistory:
+    """Stores one row per keyword check in ``agent_seo_ranking_history``."""
+
+    def __init__(self, supabase_client, chunk_size: int = 500, page_size: int = 1000):
+        self.supabase = supabase_client
+        self.chunk_size = chunk_size
+        self.page_size = page_size
+
+    async def append(self, rankings: List[Dict[str, Any]]) -> int:
+        """Append ranking observations in bulk inserts."""
+        rows = [
+            {
+                'keyword': ranking['keyword'],
+                'position': ranking.get('position'),
+                'url_ranking': ranking.get('url_ranking'),
+                'checked_at': ranking.get('checked_at') or datetime.utcnow().isoformat()
+            }
+            for ranking in rankings
+        ]
+        written = 0
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start:start + self.chunk_size]
+            try:
+                await self.supabase.table(TABLE).insert(chunk).execute()
+                written += len(chunk)
+            except Exception as e:
+                logger.error(f"Error appending {len(chunk)} ranking observations: {e}")
+        return written
+
+    async def load(self, keywords: Iterable[str], days: int = 90) -> List[Dict[str, Any]]:
+        """Observations of ``keywords`` from the last ``days`` days."""
+        keywords = list(dict.fromkeys(keywords))
+        since = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        rows = []
+        for start in range(0, len(keywords), self.chunk_size):
+            chunk = keywords[start:start + self.chunk_size]
+            offset = 0
+            while True:
+                result = await self.supabase.table(TABLE)\
+                    .select('keyword, position, checked_at')\
+                    .in_('keyword', chunk)\
+                    .gte('checked_at', since)\
+                    .order('checked_at')\
+                    .range(offset, offset + self.page_size - 1)\
+                    .execute()
+                page = result.data or []
+                rows.extend(page)
+                if len(page) < self.page_size:
+                    break
+                offset += self.page_size
+        return rows
+
+
+def ranking_statistics(rows: List[Dict[str, Any]], window: int = 7) -> Dict[str, Dict[str, Any]]:
+    """Per-keyword delta, moving average and volatility over the last ``window`` checks.
+
+    Observations are laid out as a keywords x (window + 1) matrix, right
+    aligned and NaN padded, so every statistic is one array operation.
+    ``delta`` is positive when the keyword moved up (toward position 1).
+    """
+    if not rows:
+        return {}
+
+    keywords, codes = np.unique([row['keyword'] for row in rows], return_inverse=True)
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    times = np.array([
+        ((parse_timestamp(row.get('checked_at')) or epoch) - epoch).total_seconds() for row in rows
+    ])
+    positions = np.array([
+        row['position'] if row.get('position') is not None else NOT_RANKING for row in rows
+    ], dtype=np.float64)
+
+    order = np.lexsort((times, codes))
+    codes, positions = codes[order], positions[order]
+
+    counts = np.bincount(codes, minlength=len(keywords))
+    group_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    from_end = counts[codes] - 1 - (np.arange(len(codes)) - group_start[codes])
+    keep = from_end <= window
+
+    width = window + 1
+    matrix = np.full((len(keywords), width), np.nan)
+    matrix[codes[keep], width - 1 - from_end[keep]] = positions[keep]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)  # all-NaN rows
+        latest = matrix[:, -1]
+        previous = matrix[:, -2]
+        delta = previous - latest
+        moving_average = np.nanmean(matrix[:, 1:], axis=1)
+        volatility = np.nanstd(np.diff(matrix, axis=1), axis=1)
+
+    def value(number: float, digits: int = 2):
+        return None if np.isnan(number) else round(float(number), digits)
+
+    def position(number: float):
+        return None if np.isnan(number) or number >= NOT_RANKING else int(number)
+
+    return {
+        str(keyword): {
+            'position': position(latest[i]),
+            'previous_position': position(previous[i]),
+            'delta': value(delta[i], 0),
+            'moving_average': value(moving_average[i]),
+            'volatility': value(volatility[i]),
+            'observations': int(counts[i])
+        }
+        for i, keyword in enumerate(keywords)
+    }
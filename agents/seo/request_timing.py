@@ -0,0 +1,220 @@
+"""Per-phase request timing (DNS, connect, TTFB, download) via aiohttp tracing."""
+
+import json
+import logging
+import sqlite3
+import statistics
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import aiohttp
+
+from ..utils.local_store import data_path
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+PHASES = ('dns_seconds', 'connect_seconds', 'ttfb_seconds', 'download_seconds', 'total_seconds')
+
+
+@dataclass
+class RequestTiming:
+    """Timing and transfer breakdown of one request.
+
+    ``connect_seconds`` covers the TCP connect and, for HTTPS, the TLS
+    handshake (aiohttp reports them as one connection-create phase).
+    ``ttfb_seconds`` runs from the connection being ready (or the request
+    start on a reused connection) to the response headers, so it measures
+    server response time without DNS and connect.
+    """
+    url: str
+    status: int
+    dns_seconds: float
+    connect_seconds: float
+    ttfb_seconds: float
+    download_seconds: float
+    total_seconds: float
+    transfer_bytes: int
+    content_bytes: int
+    content_encoding: Optional[str]
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        if not self.transfer_bytes or self.content_bytes == self.transfer_bytes:
+            return None
+        return round(self.content_bytes / self.transfer_bytes, 2)
+
+
+def _decoded_size(body: bytes, encoding: Optional[str]) -> int:
+    """Size of the body after undoing its Content-Encoding."""
+    try:
+        if encoding in ('gzip', 'x-gzip'):
+            return len(zlib.decompress(body, 16 + zlib.MAX_WBITS))
+        if encoding == 'deflate':
+            return len(zlib.decompress(body))
+        if encoding == 'br' and brotli is not None:
+            return len(brotli.decompress(body))
+    except Exception as e:
+        logger.debug(f"Could not decode {encoding} body: {e}")
+    return len(body)
+
+
+def _timing_trace_config() -> aiohttp.TraceConfig:
+    """Trace config that stamps each phase into the request's trace context."""
+    trace_config = aiohttp.TraceConfig()
+
+    def stamp(name: str):
+        async def callback(session, context, params):
+            context.trace_request_ctx[name] = time.perf_counter()
+        return callback
+
+    trace_config.on_request_start.append(stamp('request_start'))
+    trace_config.on_dns_resolvehost_start.append(stamp('dns_start'))
+    trace_config.on_dns_resolvehost_end.append(stamp('dns_end'))
+    trace_config.on_connection_create_start.append(stamp('connect_start'))
+    trace_config.on_connection_create_end.append(stamp('connect_end'))
+    trace_config.on_request_end.append(stamp('headers_received'))
+    return trace_config
+
+
+async def measure_request(url: str, timeout: float = 30,
+                          headers: Optional[Dict[str, str]] = None) -> RequestTiming:
+    """Time one request over a fresh connection (no pooled socket, no DNS cache)."""
+    marks: Dict[str, float] = {}
+    connector = aiohttp.TCPConnector(force_close=True, use_dns_cache=False)
+    request_headers = {'Accept-Encoding': 'gzip, deflate, br' if brotli else 'gzip, deflate'}
+    request_headers.update(headers or {})
+
+    async with aiohttp.ClientSession(connector=connector, auto_decompress=False,
+                                     trace_configs=[_timing_trace_config()]) as session:
+        async with session.get(url, timeout=timeout, headers=request_headers,
+                               trace_request_ctx=marks) as response:
+            body = await response.read()
+            finished = time.perf_counter()
+            encoding = response.headers.get('Content-Encoding')
+            status = response.status
+
+    start = marks['request_start']
+    dns = marks.get('dns_end', 0) - marks.get('dns_start', 0)
+    connect = marks.get('connect_end', 0) - marks.get('connect_start', 0) - dns
+    headers_received = marks.get('headers_received', finished)
+    connected = marks.get('connect_end', start)
+
+    return RequestTiming(
+        url=url,
+        status=status,
+        dns_seconds=max(dns, 0.0),
+        connect_seconds=max(connect, 0.0),
+        ttfb_seconds=max(headers_received - connected, 0.0),
+        download_seconds=finished - headers_received,
+        total_seconds=finished - start,
+        transfer_bytes=len(body),
+        content_bytes=_decoded_size(body, encoding),
+        content_encoding=encoding
+    )
+
+
+def summarize_timings(timings: List[RequestTiming]) -> Dict[str, Any]:
+    """Median and spread of each phase over repeated measurements."""
+    summary: Dict[str, Any] = {'samples': len(timings)}
+    for phase in PHASES:
+        values = [getattr(timing, phase) for timing in timings]
+        summary[phase] = {
+            'median': round(statistics.median(values), 4),
+            'min': round(min(values), 4),
+            'max': round(max(values), 4),
+            'stdev': round(statistics.stdev(values), 4) if len(values) > 1 else 0.0
+        }
+    last = timings[-1]
+    summary['status'] = last.status
+    summary['transfer_bytes'] = last.transfer_bytes
+    summary['content_bytes'] = last.content_bytes
+    summary['content_encoding'] = last.content_encoding
+    summary['compression_ratio'] = last.compression_ratio
+    return summary
+
+
+async def measure_page_speed(url: str, repeats: int = 3, crawler=None,
+                             timeout: float = 30) -> Dict[str, Any]:
+    """Measure ``url`` ``repeats`` times with cold connections and summarize."""
+    timings = []
+    for _ in range(max(1, repeats)):
+        if crawler is not None:
+            async with crawler.slot(url):
+                timings.append(await measure_request(url, timeout, headers=crawler.headers))
+        else:
+            timings.append(await measure_request(url, timeout))
+    summary = summarize_timings(timings)
+    summary['runs'] = [asdict(timing) for timing in timings]
+    return summary
+
+
+class PageSpeedHistory:
+    """Stores page speed summaries per URL to spot regressions."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else data_path('page_speed.sqlite')
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS measurements (
+                url TEXT NOT NULL,
+                measured_at REAL NOT NULL,
+                total_median REAL NOT NULL,
+                ttfb_median REAL NOT NULL,
+                summary TEXT NOT NULL
+            )"""
+        )
+        self._db.execute(
+            'CREATE INDEX IF NOT EXISTS idx_measurements_url ON measurements (url, measured_at)'
+        )
+
+    def record(self, url: str, summary: Dict[str, Any]):
+        """Store a summary produced by :func:`measure_page_speed`."""
+        stored = {key: value for key, value in summary.items() if key != 'runs'}
+        self._db.execute(
+            'INSERT INTO measurements VALUES (?, ?, ?, ?, ?)',
+            (url, time.time(), summary['total_seconds']['median'],
+             summary['ttfb_seconds']['median'], json.dumps(stored))
+        )
+        self._db.commit()
+
+    def history(self, url: str, limit: int = 30) -> List[Dict[str, Any]]:
+        """Most recent summaries for a URL, newest first."""
+        return [
+            {'measured_at': measured_at, **json.loads(summary)}
+            for measured_at, summary in self._db.execute(
+                'SELECT measured_at, summary FROM measurements WHERE url = ? '
+                'ORDER BY measured_at DESC LIMIT ?', (url, limit)
+            )
+        ]
+
+    def compare(self, url: str, summary: Dict[str, Any], window: int = 7) -> Optional[Dict[str, Any]]:
+        """Compare a new summary with the median of the previous ``window`` runs."""
+        rows = self._db.execute(
+            'SELECT total_median, ttfb_median FROM measurements WHERE url = ? '
+            'ORDER BY measured_at DESC LIMIT ?', (url, window)
+        ).fetchall()
+        if not rows:
+            return None
+
+        baseline_total = statistics.median(row[0] for row in rows)
+        baseline_ttfb = statistics.median(row[1] for row in rows)
+        total = summary['total_seconds']['median']
+        change = (total - baseline_total) / baseline_total if baseline_total else 0.0
+        return {
+            'baseline_total_seconds': round(baseline_total, 4),
+            'baseline_ttfb_seconds': round(baseline_ttfb, 4),
+            'total_change_pct': round(change * 100, 1),
+            'regressed': change > 0.2 and total - baseline_total > 0.1
+        }
+
+    def close(self):
+        """Close the backing store."""
+        self._db.close()
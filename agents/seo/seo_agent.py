@@ -3,7 +3,8 @@
 import asyncio
 import json
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, urljoin
 import re
@@ -14,9 +15,26 @@ from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..core.base_agent import BaseAgent, rate_limited, track_performance
+from ..utils.crawl_scheduler import CrawlDisallowed, get_crawl_scheduler
+from ..utils.embeddings import EmbeddingService
+from ..utils.html_parser import get_parser_service
+from ..utils.rate_budget import RateBudget
+from .audit_store import PageFingerprintStore, content_fingerprint, reused_analysis, summarize_reuse
+from .keyword_clusters import KeywordCluster, cluster_keywords
+from .keyword_estimator import KeywordMetricsEstimator
+from .keyword_store import KeywordRepository
+from .link_graph import LinkGraph
+from .page_snapshot import PageSnapshotCache
+from .rank_history import RankHistory, ranking_statistics
+from .request_timing import PHASES, PageSpeedHistory, measure_page_speed
+from .site_crawler import AuditCrawler, canonicalize_url
+from .sitemap import SitemapEntry, SitemapLastmodStore, SitemapReader
 
 logger = logging.getLogger(__name__)
 
+# Sitemap entries compared with stored lastmod values per query in reaudits
+LASTMOD_BATCH_SIZE = 500
+
 
 class HempSEOAgent(BaseAgent):
     """Agent responsible for SEO analysis, optimization, and monitoring."""
@@ -24,6 +42,16 @@ class HempSEOAgent(BaseAgent):
     def __init__(self, supabase_client, agent_name: str = "seo_agent"):
         super().__init__(supabase_client, agent_name)
         self.session = None
+        self.html_parser = get_parser_service()
+        self.crawler = get_crawl_scheduler()
+        self.keywords = KeywordRepository(supabase_client)
+        self.keyword_estimator = KeywordMetricsEstimator()
+        self.estimator_confidence = 0.6
+        # Also merge semantically equivalent keywords when the provider can embed
+        self.keyword_embeddings = None
+        if hasattr(self.ai_provider, 'embed_batch') or hasattr(self.ai_provider, 'embed'):
+            self.keyword_embeddings = EmbeddingService(self.ai_provider)
+        self.rank_history = RankHistory(supabase_client)
         self.seo_tools = self._initialize_seo_tools()
         
     def _initialize_seo_tools(self) -> Dict:
@@ -89,18 +117,38 @@ class HempSEOAgent(BaseAgent):
         """Analyze overall site SEO performance."""
         target_url = params.get('url')
         include_pages = params.get('include_pages', 10)
+        discover_links = params.get('discover_links', False)
+        reaudit = params.get('reaudit', False)
+        incremental = params.get('incremental', False)
+        concurrency = params.get('concurrency', 8)
+        speed_repeats = params.get('speed_repeats', 0)
         
         if not target_url:
             raise ValueError("URL is required for site analysis")
         
         logger.info(f"Analyzing site performance for: {target_url}")
         
+        # Every page is downloaded once per analysis and shared by all checks;
+        # incremental audits revalidate pages against their stored fingerprints.
+        # Reaudits reuse stored analyses of unchanged pages, so they always
+        # read (and keep up to date) the same store
+        fingerprints = PageFingerprintStore() if incremental or reaudit else None
+        snapshots = self._snapshot_cache(fingerprints)
+        
         try:
             # Perform site audit
-            site_audit = await self._perform_site_audit(target_url, include_pages)
+            site_audit = await self._perform_site_audit(
+                target_url, include_pages, discover_links=discover_links,
+                concurrency=concurrency, snapshots=snapshots, changed_only=reaudit
+            )
+            
+            # Build the internal link graph from the audited pages
+            site_audit['link_graph'] = LinkGraph.from_pages(site_audit['pages']).analyze(
+                target_url, sampled=site_audit['sampled']
+            )
             
             # Analyze technical SEO
-            technical_seo = await self._analyze_technical_seo(target_url)
+            technical_seo = await self._analyze_technical_seo(target_url, snapshots, speed_repeats)
             
             # Check content quality
             content_analysis = await self._analyze_content_quality(site_audit['pages'])
@@ -147,98 +195,192 @@ class HempSEOAgent(BaseAgent):
         except Exception as e:
             error_details = await self.handle_error(e, {'action': 'analyze_site', 'url': target_url})
             raise
+        finally:
+            snapshots.clear()
+            if fingerprints is not None:
+                fingerprints.close()
     
-    async def _perform_site_audit(self, base_url: str, max_pages: int) -> Dict[str, Any]:
-        """Perform comprehensive site audit."""
+    def _snapshot_cache(self, fingerprints: Optional[PageFingerprintStore] = None) -> PageSnapshotCache:
+        """Create a page snapshot cache bound to the agent's session."""
         if not self.session:
             self.session = aiohttp.ClientSession()
+        return PageSnapshotCache(self.session, self.crawler, fingerprints=fingerprints)
+    
+    async def _perform_site_audit(self, base_url: str, max_pages: int,
+                                  discover_links: bool = False, concurrency: int = 8,
+                                  page_timeout: float = 45,
+                                  snapshots: Optional[PageSnapshotCache] = None,
+                                  changed_only: bool = False) -> Dict[str, Any]:
+        """Perform comprehensive site audit with a concurrent crawler.
+        
+        With ``changed_only`` only sitemap URLs whose lastmod changed since
+        the previous audit of the site are revisited; the others reuse their
+        stored analyses and count towards ``max_pages`` too. Unchanged pages
+        without a stored analysis are audited again so that the aggregates
+        always cover every page.
+        """
+        snapshots = snapshots or self._snapshot_cache()
         
         pages_analyzed = []
         issues = []
-        sitemap_urls = await self._fetch_sitemap_urls(base_url)
-        
-        # Analyze pages
-        urls_to_analyze = sitemap_urls[:max_pages] if sitemap_urls else [base_url]
-        
-        for url in urls_to_analyze:
-            try:
-                page_analysis = await self._analyze_page_seo(url)
+        severity_counts = Counter()
+        
+        # Stream the sitemap and stop once max_pages URLs are covered, counting
+        # reused analyses; in reaudit mode lastmod values are compared a batch
+        # at a time
+        lastmod_store = SitemapLastmodStore()
+        sitemap_entries: List[SitemapEntry] = []
+        unchanged_urls: List[str] = []
+        batch: List[SitemapEntry] = []
+        batch_size = LASTMOD_BATCH_SIZE if changed_only else 1
+        
+        def take_batch():
+            changed_entries = lastmod_store.changed(base_url, batch) if changed_only else batch
+            changed_locs = {entry.loc for entry in changed_entries}
+            for entry in batch:
+                if len(sitemap_entries) + len(unchanged_urls) >= max_pages:
+                    break
+                if entry.loc in changed_locs:
+                    sitemap_entries.append(entry)
+                else:
+                    unchanged_urls.append(canonicalize_url(entry.loc) or entry.loc)
+            batch.clear()
+        
+        sitemap_truncated = False
+        async with aclosing(self._iter_sitemap_entries(base_url, snapshots)) as stream:
+            async for entry in stream:
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    take_batch()
+                    if len(sitemap_entries) + len(unchanged_urls) >= max_pages:
+                        sitemap_truncated = True
+                        break
+        if batch:
+            take_batch()
+        
+        # Unchanged pages keep their stored analyses so site totals stay complete
+        reused = {}
+        if unchanged_urls and snapshots.fingerprints is not None:
+            reused = snapshots.fingerprints.get_many(unchanged_urls)
+            for stored in reused.values():
+                page_analysis = reused_analysis(stored, 'unchanged_lastmod')
                 pages_analyzed.append(page_analysis)
-                
-                # Collect issues
-                if page_analysis['issues']:
-                    issues.extend(page_analysis['issues'])
-                    
-            except Exception as e:
-                logger.error(f"Error analyzing page {url}: {e}")
-                continue
+                for issue in page_analysis.get('issues', []):
+                    issues.append(issue)
+                    severity_counts[issue.get('severity')] += 1
+        skipped_unchanged = len(reused)
+        sitemap_urls = [entry.loc for entry in sitemap_entries]
+        sitemap_urls += [url for url in unchanged_urls if url not in reused]
+        
+        # Seed from the sitemap; with link discovery the homepage is crawled too
+        seeds = list(sitemap_urls) if sitemap_urls or changed_only else [base_url]
+        if discover_links and base_url not in seeds:
+            seeds.insert(0, base_url)
+        
+        crawler = AuditCrawler(
+            lambda url: self._analyze_page_seo(url, snapshots),
+            concurrency=concurrency,
+            page_timeout=page_timeout,
+            discover_links=discover_links
+        )
+        
+        # Let the audited host use the audit's concurrency for this audit
+        # only (Crawl-delay still applies); aggregate issues as pages stream in
+        crawl_budget = max_pages - len(pages_analyzed)
+        crawled = 0
+        with self.crawler.host_override(urlparse(base_url).netloc, concurrency=concurrency, delay=0.1):
+            async for page_analysis in crawler.crawl(seeds, crawl_budget):
+                crawled += 1
+                pages_analyzed.append(page_analysis)
+                for issue in page_analysis.get('issues', []):
+                    issues.append(issue)
+                    severity_counts[issue.get('severity')] += 1
+        
+        # Remember lastmod values of the pages that were audited successfully
+        audited = {
+            page['url'] for page in pages_analyzed
+            if 'error' not in page and page.get('reused') != 'unchanged_lastmod'
+        }
+        lastmod_store.record(base_url, [
+            entry for entry in sitemap_entries
+            if (canonicalize_url(entry.loc) or entry.loc) in audited
+        ])
+        lastmod_store.close()
         
-        # Categorize issues
-        critical_issues = [i for i in issues if i.get('severity') == 'critical']
-        high_issues = [i for i in issues if i.get('severity') == 'high']
-        medium_issues = [i for i in issues if i.get('severity') == 'medium']
+        # Only a fully covered sitemap, or a link crawl that ran out of links
+        # before the page limit, audits the whole site
+        covered_sitemap = not sitemap_truncated and bool(sitemap_entries or unchanged_urls)
+        exhausted_links = discover_links and crawled < crawl_budget
         
         return {
             'pages': pages_analyzed,
             'total_pages': len(pages_analyzed),
+            'sampled': not (covered_sitemap or exhausted_links),
+            'skipped_unchanged': skipped_unchanged,
+            'reuse': summarize_reuse(pages_analyzed),
             'issues': issues,
-            'critical_issues': len(critical_issues),
-            'high_issues': len(high_issues),
-            'medium_issues': len(medium_issues),
+            'critical_issues': severity_counts['critical'],
+            'high_issues': severity_counts['high'],
+            'medium_issues': severity_counts['medium'],
             'average_score': sum(p['seo_score'] for p in pages_analyzed) / len(pages_analyzed) if pages_analyzed else 0
         }
     
-    async def _analyze_page_seo(self, url: str) -> Dict[str, Any]:
+    async def _analyze_page_seo(self, url: str,
+                                snapshots: Optional[PageSnapshotCache] = None) -> Dict[str, Any]:
         """Analyze SEO elements of a single page."""
+        snapshots = snapshots or self._snapshot_cache()
+        fingerprints = snapshots.fingerprints
+        url = canonicalize_url(url) or url
+        
         try:
-            async with self.session.get(url, timeout=30) as response:
-                if response.status != 200:
-                    return {'url': url, 'error': f'HTTP {response.status}', 'seo_score': 0}
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extract SEO elements
-                seo_elements = {
-                    'title': soup.find('title').text if soup.find('title') else '',
-                    'meta_description': '',
-                    'h1_tags': [h1.text for h1 in soup.find_all('h1')],
-                    'h2_tags': [h2.text for h2 in soup.find_all('h2')],
-                    'images': soup.find_all('img'),
-                    'internal_links': [],
-                    'external_links': [],
-                    'word_count': len(soup.get_text().split())
-                }
-                
-                # Get meta description
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                if meta_desc:
-                    seo_elements['meta_description'] = meta_desc.get('content', '')
-                
-                # Analyze links
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    if href.startswith('http'):
-                        if urlparse(href).netloc == urlparse(url).netloc:
-                            seo_elements['internal_links'].append(href)
-                        else:
-                            seo_elements['external_links'].append(href)
-                    elif href.startswith('/'):
-                        seo_elements['internal_links'].append(urljoin(url, href))
-                
-                # Check for issues
-                issues = self._identify_seo_issues(seo_elements, url)
-                
-                # Calculate page SEO score
-                seo_score = self._calculate_page_seo_score(seo_elements)
-                
-                return {
-                    'url': url,
-                    'seo_elements': seo_elements,
-                    'issues': issues,
-                    'seo_score': seo_score
-                }
-                
+            snapshot = await snapshots.get(url, conditional=fingerprints is not None)
+            stored = fingerprints.get(url) if fingerprints is not None else None
+            
+            if snapshot.not_modified and stored:
+                return reused_analysis(stored['analysis'], 'not_modified')
+            if not snapshot.ok:
+                return {'url': url, 'error': f'HTTP {snapshot.status}', 'seo_score': 0}
+            
+            content_hash = content_fingerprint(snapshot.body)
+            if stored and stored['content_hash'] == content_hash:
+                # Same content: keep the analysis, refresh the validators
+                fingerprints.put(url, stored['analysis'], snapshot.header('ETag'),
+                                 snapshot.header('Last-Modified'), content_hash)
+                return reused_analysis(stored['analysis'], 'unchanged_content')
+            
+            # Extract SEO elements (parsed off the event loop for large pages)
+            summary = await self.html_parser.page_summary(snapshot.body, url)
+            seo_elements = {
+                'title': summary['title'],
+                'meta_description': summary['meta_description'],
+                'h1_tags': summary['h1_tags'],
+                'h2_tags': summary['h2_tags'],
+                'images': summary['images'],
+                'internal_links': summary['internal_links'],
+                'external_links': summary['external_links'],
+                'word_count': summary['word_count']
+            }
+            
+            # Check for issues
+            issues = self._identify_seo_issues(seo_elements, url)
+            
+            # Calculate page SEO score
+            seo_score = self._calculate_page_seo_score(seo_elements)
+            
+            analysis = {
+                'url': url,
+                'seo_elements': seo_elements,
+                'issues': issues,
+                'seo_score': seo_score
+            }
+            if fingerprints is not None:
+                fingerprints.put(url, analysis, snapshot.header('ETag'),
+                                 snapshot.header('Last-Modified'), content_hash)
+            return analysis
+            
+        except CrawlDisallowed as e:
+            logger.info(f"Skipping {url}: {e}")
+            return {'url': url, 'error': 'blocked by robots.txt', 'seo_score': 0, 'issues': []}
         except Exception as e:
             logger.error(f"Error analyzing page {url}: {e}")
             return {'url': url, 'error': str(e), 'seo_score': 0}
@@ -369,9 +511,6 @@ class HempSEOAgent(BaseAgent):
                 seed_keywords, product_focus
             )
             
-            # Analyze keyword difficulty and search volume
-            keyword_analysis = await self._analyze_keywords(keyword_variations)
-            
             # Find long-tail keywords
             longtail_keywords = await self._find_longtail_keywords(
                 seed_keywords, product_focus
@@ -382,9 +521,22 @@ class HempSEOAgent(BaseAgent):
             if include_competitors:
                 competitor_keywords = await self._analyze_competitor_keywords()
             
+            # Group near-identical variants so each cluster is estimated once
+            candidates = [{'keyword': keyword} for keyword in keyword_variations]
+            candidates += longtail_keywords + competitor_keywords
+            clusters = await cluster_keywords(
+                (candidate['keyword'] for candidate in candidates), self.keyword_embeddings
+            )
+            logger.info(f"Clustered {len(candidates)} candidate keywords into {len(clusters)} groups")
+            
+            # Analyze keyword difficulty and search volume of each cluster's representative
+            keyword_analysis = await self._analyze_keywords(
+                [cluster.representative for cluster in clusters]
+            )
+            
             # Combine and rank keywords
             all_keywords = self._rank_keywords(
-                keyword_analysis + longtail_keywords + competitor_keywords
+                self._merge_keyword_clusters(candidates, clusters, keyword_analysis)
             )
             
             # Save top keywords to database
@@ -396,6 +548,8 @@ class HempSEOAgent(BaseAgent):
             return {
                 'status': 'completed',
                 'total_keywords': len(all_keywords),
+                'candidate_keywords': len(candidates),
+                'keyword_clusters': len(clusters),
                 'saved_keywords': saved_keywords,
                 'top_keywords': all_keywords[:10],
                 'keyword_strategy': keyword_strategy,
@@ -450,23 +604,88 @@ class HempSEOAgent(BaseAgent):
             return variations
     
     async def _analyze_keywords(self, keywords: List[str]) -> List[Dict]:
-        """Analyze keywords for difficulty and search metrics."""
-        analyzed = []
+        """Analyze keywords for difficulty and search metrics.
         
-        for keyword in keywords:
-            # In production, this would call external SEO APIs
-            # For now, we'll use AI to estimate metrics
-            analysis = await self._estimate_keyword_metrics(keyword)
+        Keywords whose stored metrics are still within the repository TTL
+        are reused as-is; only the rest are estimated.
+        """
+        fresh, stale = await self.keywords.split_fresh(keywords)
+        if fresh:
+            logger.info(f"Reusing stored metrics for {len(fresh)} of {len(keywords)} keywords")
+        
+        estimated = await self._estimate_keywords(stale)
+        
+        analyzed = []
+        for keyword in dict.fromkeys(keywords):
+            if keyword in fresh:
+                row = fresh[keyword]
+                analyzed.append({
+                    'keyword': keyword,
+                    'search_volume': row.get('search_volume') or 0,
+                    'difficulty_score': float(row.get('difficulty_score') or 50),
+                    'cpc_usd': float(row.get('cpc_usd') or 0),
+                    'trend': row.get('trend') or 'stable',
+                    'metrics_cached': True
+                })
+                continue
+            analysis = estimated[keyword]
             analyzed.append({
                 'keyword': keyword,
                 'search_volume': analysis.get('search_volume', 0),
                 'difficulty_score': analysis.get('difficulty', 50),
                 'cpc_usd': analysis.get('cpc', 1.0),
-                'trend': analysis.get('trend', 'stable')
+                'trend': analysis.get('trend', 'stable'),
+                'metrics_source': analysis.get('metrics_source', 'llm')
             })
         
         return analyzed
     
+    @staticmethod
+    def _merge_keyword_clusters(candidates: List[Dict], clusters: List[KeywordCluster],
+                                analysis: List[Dict]) -> List[Dict]:
+        """One entry per keyword, each variant carrying its representative's metrics.
+        
+        Every entry keeps its own candidate details and names the keyword its
+        metrics were estimated for in ``cluster_representative``.
+        """
+        details = {}
+        for candidate in candidates:
+            details.setdefault(candidate['keyword'].strip(), candidate)
+        metrics = {entry['keyword']: entry for entry in analysis}
+        
+        merged = []
+        for cluster in clusters:
+            cluster_metrics = metrics.get(cluster.representative, {})
+            for keyword in [cluster.representative] + cluster.variants:
+                merged.append({
+                    **details.get(keyword, {}),
+                    **cluster_metrics,
+                    'keyword': keyword,
+                    'cluster_representative': cluster.representative
+                })
+        return merged
+    
+    async def _estimate_keywords(self, keywords: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Estimate metrics with the local model, using AI only for low-confidence keywords."""
+        estimates = {}
+        try:
+            if keywords and await self.keyword_estimator.refresh(self.supabase):
+                for keyword, prediction in zip(keywords, self.keyword_estimator.predict(keywords)):
+                    if prediction['confidence'] >= self.estimator_confidence:
+                        estimates[keyword] = {**prediction, 'metrics_source': 'model'}
+        except Exception as e:
+            logger.warning(f"Local keyword estimator unavailable: {e}")
+        
+        if estimates:
+            logger.info(f"Estimated {len(estimates)} of {len(keywords)} keywords locally")
+        
+        for keyword in keywords:
+            if keyword not in estimates:
+                # In production, this would call external SEO APIs
+                # For now, we'll use AI to estimate metrics
+                estimates[keyword] = await self._estimate_keyword_metrics(keyword)
+        return estimates
+    
     async def _estimate_keyword_metrics(self, keyword: str) -> Dict[str, Any]:
         """Estimate keyword metrics using AI."""
         prompt = f"""
@@ -491,7 +710,9 @@ class HempSEOAgent(BaseAgent):
                 temperature=0.3
             )
             
-            return json.loads(response)
+            metrics = json.loads(response)
+            metrics['metrics_source'] = 'llm'
+            return metrics
             
         except Exception:
             # Fallback estimates based on keyword characteristics
@@ -503,50 +724,15 @@ class HempSEOAgent(BaseAgent):
                 'search_volume': 1000 // word_count,  # Lower volume for longer keywords
                 'difficulty': 30 + (word_count * 10),  # Higher difficulty for shorter keywords
                 'cpc': 2.0 if is_commercial else 0.5,
-                'trend': 'rising' if 'hemp' in keyword else 'stable'
+                'trend': 'rising' if 'hemp' in keyword else 'stable',
+                'metrics_source': 'heuristic'
             }
     
     async def _save_keywords_to_db(self, keywords: List[Dict]) -> int:
-        """Save keywords to database."""
-        saved_count = 0
-        
-        for kw in keywords:
-            try:
-                # Check if keyword exists
-                existing = await self.supabase.table('agent_seo_keywords')\
-                    .select('id')\
-                    .eq('keyword', kw['keyword'])\
-                    .execute()
-                
-                if not existing.data:
-                    # Insert new keyword
-                    await self.supabase.table('agent_seo_keywords').insert({
-                        'keyword': kw['keyword'],
-                        'search_volume': kw.get('search_volume', 0),
-                        'difficulty_score': kw.get('difficulty_score', 50),
-                        'cpc_usd': kw.get('cpc_usd', 0),
-                        'trend': kw.get('trend', 'stable')
-                    }).execute()
-                    
-                    saved_count += 1
-                else:
-                    # Update existing keyword
-                    await self.supabase.table('agent_seo_keywords')\
-                        .update({
-                            'search_volume': kw.get('search_volume', 0),
-                            'difficulty_score': kw.get('difficulty_score', 50),
-                            'cpc_usd': kw.get('cpc_usd', 0),
-                            'trend': kw.get('trend', 'stable'),
-                            'last_checked_at': datetime.utcnow().isoformat()
-                        })\
-                        .eq('id', existing.data[0]['id'])\
-                        .execute()
-                        
-            except Exception as e:
-                logger.error(f"Error saving keyword {kw['keyword']}: {e}")
-                continue
-        
-        return saved_count
+        """Save newly estimated keywords in one bulk upsert; returns the count of new ones."""
+        # Reused metrics keep their original last_checked_at so they expire on time
+        estimated = [kw for kw in keywords if not kw.get('metrics_cached')]
+        return await self.keywords.save_metrics(estimated)
     
     @rate_limited(max_calls=5, window_seconds=60)
     async def analyze_competitors(self, params: Dict) -> Dict[str, Any]:
@@ -632,7 +818,8 @@ class HempSEOAgent(BaseAgent):
             self.session = aiohttp.ClientSession()
         
         try:
-            async with self.session.get(url, timeout=30) as response:
+            async with self.crawler.slot(url), \
+                    self.session.get(url, timeout=30, headers=self.crawler.headers) as response:
                 if response.status == 200:
                     html = await response.text()
                     soup = BeautifulSoup(html, 'html.parser')
@@ -661,18 +848,20 @@ class HempSEOAgent(BaseAgent):
     
     @rate_limited(max_calls=10, window_seconds=60)
     async def monitor_rankings(self, params: Dict) -> Dict[str, Any]:
-        """Monitor keyword rankings for tracked keywords."""
+        """Monitor keyword rankings for tracked keywords.
+        
+        Keywords are checked concurrently within a rate budget, every check
+        is appended to the ranking history and deltas, moving averages and
+        volatility are computed from that history.
+        """
         keywords = params.get('keywords', [])
         target_url = params.get('target_url')
+        concurrency = params.get('concurrency', 5)
+        calls_per_minute = params.get('calls_per_minute', 30)
+        window = params.get('window', 7)
         
         if not keywords:
-            # Fetch tracked keywords from database
-            tracked = await self.supabase.table('agent_seo_keywords')\
-                .select('*')\
-                .not_('current_position', 'is', None)\
-                .execute()
-            
-            keywords = [kw['keyword'] for kw in tracked.data] if tracked.data else []
+            keywords = await self._fetch_tracked_keywords()
         
         if not keywords:
             return {
@@ -683,18 +872,26 @@ class HempSEOAgent(BaseAgent):
         logger.info(f"Monitoring rankings for {len(keywords)} keywords")
         
         try:
-            ranking_updates = []
+            # Simulate ranking checks (in production, would use SERP API)
+            budget = RateBudget(max_concurrency=concurrency, max_calls=calls_per_minute)
+            ranking_updates = await budget.map(
+                lambda keyword: self._check_keyword_ranking(keyword, target_url), keywords
+            )
             
-            for keyword in keywords[:20]:  # Limit to 20 keywords per run
-                # Simulate ranking check (in production, would use SERP API)
-                ranking_data = await self._check_keyword_ranking(keyword, target_url)
-                ranking_updates.append(ranking_data)
-                
-                # Update database
-                await self._update_keyword_ranking(keyword, ranking_data)
+            # Update current positions and append to the time series in bulk
+            await self.keywords.save_rankings(ranking_updates)
+            await self.rank_history.append(ranking_updates)
             
-            # Analyze ranking changes
-            ranking_analysis = await self._analyze_ranking_changes(ranking_updates)
+            # Analyze ranking changes against the stored history
+            history = await self.rank_history.load(keywords)
+            ranking_stats = ranking_statistics(history, window=window)
+            ranking_analysis = await self._analyze_ranking_changes(ranking_updates, ranking_stats)
+            
+            for update in ranking_updates:
+                update.update({
+                    key: value for key, value in ranking_stats.get(update['keyword'], {}).items()
+                    if key in ('delta', 'moving_average', 'volatility')
+                })
             
             return {
                 'status': 'completed',
@@ -702,13 +899,33 @@ class HempSEOAgent(BaseAgent):
                 'improved_rankings': ranking_analysis['improved'],
                 'declined_rankings': ranking_analysis['declined'],
                 'average_position': ranking_analysis['average_position'],
-                'ranking_updates': ranking_updates[:10]
+                'most_volatile': ranking_analysis['most_volatile'],
+                'ranking_updates': sorted(
+                    ranking_updates, key=lambda update: abs(update.get('delta') or 0), reverse=True
+                )[:10]
             }
             
         except Exception as e:
             error_details = await self.handle_error(e, {'action': 'monitor_rankings'})
             raise
     
+    async def _fetch_tracked_keywords(self, page_size: int = 1000) -> List[str]:
+        """All keywords with a known ranking position."""
+        keywords = []
+        offset = 0
+        while True:
+            tracked = await self.supabase.table('agent_seo_keywords')\
+                .select('keyword')\
+                .not_.is_('current_position', 'null')\
+                .order('keyword')\
+                .range(offset, offset + page_size - 1)\
+                .execute()
+            page = tracked.data or []
+            keywords.extend(kw['keyword'] for kw in page)
+            if len(page) < page_size:
+                return keywords
+            offset += page_size
+    
     async def _check_keyword_ranking(self, keyword: str, target_url: Optional[str]) -> Dict:
         """Check ranking for a specific keyword."""
         # In production, this would use a SERP API
@@ -1026,137 +1243,191 @@ class HempSEOAgent(BaseAgent):
             logger.error(f"Error fetching SEO analyses: {e}")
             return []
     
-    async def _fetch_sitemap_urls(self, base_url: str) -> List[str]:
-        """Fetch URLs from sitemap."""
-        sitemap_url = urljoin(base_url, '/sitemap.xml')
-        urls = []
+    async def _iter_sitemap_entries(self, base_url: str,
+                                    snapshots: Optional[PageSnapshotCache] = None) -> AsyncIterator[SitemapEntry]:
+        """Stream sitemap entries (following index and gzip files) with their lastmod.
         
+        The number of URLs read is cached in ``snapshots``, flagged as a lower
+        bound when the caller stops reading early.
+        """
+        if not self.session:
+            self.session = aiohttp.ClientSession()
+        
+        reader = SitemapReader(self.session, self.crawler)
+        count = 0
+        complete = False
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-                
-            async with self.session.get(sitemap_url, timeout=30) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    # Simple XML parsing for URLs
-                    import re
-                    url_pattern = r'<loc>(.*?)</loc>'
-                    urls = re.findall(url_pattern, content)
-                    
+            async with aclosing(reader.iter_entries(base_url)) as entries:
+                async for entry in entries:
+                    count += 1
+                    yield entry
+            complete = True
         except Exception as e:
             logger.error(f"Error fetching sitemap: {e}")
+            complete = True
+        finally:
+            logger.info(f"Read {count} sitemap URLs from {reader.stats['sitemaps_fetched']} sitemaps")
+            if snapshots is not None:
+                snapshots.sitemaps[base_url] = (count, complete)
+    
+    async def _count_sitemap_urls(self, base_url: str,
+                                  snapshots: Optional[PageSnapshotCache] = None) -> Tuple[int, bool]:
+        """Number of URLs in the site's sitemaps, and whether that count is exact.
         
-        return urls
+        Reuses the count recorded while an audit read the sitemaps; a count
+        from a truncated audit is returned as a lower bound instead of
+        streaming the sitemaps a second time.
+        """
+        if snapshots is not None and base_url in snapshots.sitemaps:
+            return snapshots.sitemaps[base_url]
+        count = 0
+        async with aclosing(self._iter_sitemap_entries(base_url, snapshots)) as entries:
+            async for _ in entries:
+                count += 1
+        return count, True
     
-    async def _analyze_technical_seo(self, url: str) -> Dict[str, Any]:
-        """Analyze technical SEO aspects."""
+    async def _analyze_technical_seo(self, url: str,
+                                     snapshots: Optional[PageSnapshotCache] = None,
+                                     speed_repeats: int = 0) -> Dict[str, Any]:
+        """Analyze technical SEO aspects concurrently over one shared page fetch."""
+        snapshots = snapshots or self._snapshot_cache()
+        
+        robots_txt, sitemap, page_speed, mobile_friendly, structured_data = await asyncio.gather(
+            self._check_robots_txt(url),
+            self._check_sitemap(url, snapshots),
+            self._check_page_speed(url, snapshots, speed_repeats),
+            self._check_mobile_friendly(url, snapshots),
+            self._check_structured_data(url, snapshots)
+        )
+        
         return {
-            'robots_txt': await self._check_robots_txt(url),
-            'sitemap': await self._check_sitemap(url),
-            'page_speed': await self._check_page_speed(url),
-            'mobile_friendly': await self._check_mobile_friendly(url),
+            'robots_txt': robots_txt,
+            'sitemap': sitemap,
+            'page_speed': page_speed,
+            'mobile_friendly': mobile_friendly,
             'https': url.startswith('https'),
-            'structured_data': await self._check_structured_data(url)
+            'structured_data': structured_data
         }
     
     async def _check_robots_txt(self, base_url: str) -> Dict:
         """Check robots.txt file."""
-        robots_url = urljoin(base_url, '/robots.txt')
-        
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-                
-            async with self.session.get(robots_url, timeout=10) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    return {
-                        'exists': True,
-                        'allows_crawling': 'Disallow: /' not in content,
-                        'has_sitemap': 'Sitemap:' in content
-                    }
-                else:
-                    return {'exists': False}
+            # Served from the crawl scheduler's robots.txt cache
+            content = await self.crawler.robots_txt(base_url)
+            if content is not None:
+                return {
+                    'exists': True,
+                    'allows_crawling': await self.crawler.allowed(urljoin(base_url, '/')),
+                    'has_sitemap': 'Sitemap:' in content
+                }
+            else:
+                return {'exists': False}
                     
         except Exception:
             return {'exists': False, 'error': True}
     
-    async def _check_sitemap(self, base_url: str) -> Dict:
+    async def _check_sitemap(self, base_url: str,
+                             snapshots: Optional[PageSnapshotCache] = None) -> Dict:
         """Check sitemap availability."""
-        urls = await self._fetch_sitemap_urls(base_url)
+        url_count, complete = await self._count_sitemap_urls(base_url, snapshots)
         return {
-            'exists': len(urls) > 0,
-            'url_count': len(urls),
+            'exists': url_count > 0,
+            'url_count': url_count,
+            'url_count_is_lower_bound': not complete,
             'format': 'xml'
         }
     
-    async def _check_page_speed(self, url: str) -> Dict:
-        """Estimate page speed (in production would use PageSpeed API)."""
-        # Simplified check
-        try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+    async def _check_page_speed(self, url: str,
+                                snapshots: Optional[PageSnapshotCache] = None,
+                                repeats: int = 0) -> Dict:
+        """Measure page speed.
+        
+        By default (``repeats=0``, or if the cold measurement fails) the
+        timings of the shared page fetch are reused. Opting in with
+        ``repeats`` runs over fresh connections so DNS, connect/TLS, TTFB and
+        download are all paid; their medians are stored per URL and compared
+        with previous audits.
+        """
+        if repeats > 0:
+            try:
+                timing = await measure_page_speed(url, repeats, crawler=self.crawler)
+                history = PageSpeedHistory()
+                try:
+                    regression = history.compare(url, timing)
+                    history.record(url, timing)
+                finally:
+                    history.close()
                 
-            import time
-            start = time.time()
-            async with self.session.get(url, timeout=30) as response:
-                await response.text()
-            load_time = time.time() - start
+                load_time = timing['total_seconds']['median']
+                return {
+                    'load_time_seconds': round(load_time, 2),
+                    'ttfb_seconds': round(timing['ttfb_seconds']['median'], 3),
+                    'phases': {phase: timing[phase] for phase in PHASES},
+                    'samples': timing['samples'],
+                    'transfer_bytes': timing['transfer_bytes'],
+                    'content_bytes': timing['content_bytes'],
+                    'content_encoding': timing['content_encoding'],
+                    'compression_ratio': timing['compression_ratio'],
+                    'regression': regression,
+                    'score': max(0, min(100, 100 - (load_time * 20))),
+                    'rating': 'fast' if load_time < 2 else 'average' if load_time < 4 else 'slow'
+                }
+            except Exception as e:
+                logger.warning(f"Cold timing of {url} failed, using shared fetch timings: {e}")
+        
+        try:
+            snapshot = await (snapshots or self._snapshot_cache()).get(url)
+            load_time = snapshot.load_seconds
             
             return {
                 'load_time_seconds': round(load_time, 2),
+                'ttfb_seconds': round(snapshot.ttfb_seconds, 3),
                 'score': max(0, min(100, 100 - (load_time * 20))),
                 'rating': 'fast' if load_time < 2 else 'average' if load_time < 4 else 'slow'
             }
         except Exception:
             return {'error': True, 'score': 0}
     
-    async def _check_mobile_friendly(self, url: str) -> Dict:
+    async def _check_mobile_friendly(self, url: str,
+                                     snapshots: Optional[PageSnapshotCache] = None) -> Dict:
         """Check mobile friendliness indicators."""
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-                
-            async with self.session.get(url, timeout=30) as response:
-                html = await response.text()
-                
-                # Check for viewport meta tag
-                has_viewport = '<meta name="viewport"' in html
-                
-                # Check for responsive indicators
-                has_media_queries = '@media' in html
-                
-                return {
-                    'has_viewport': has_viewport,
-                    'appears_responsive': has_media_queries,
-                    'mobile_score': 80 if has_viewport else 40
-                }
+            html = (await (snapshots or self._snapshot_cache()).get(url)).body
+            
+            # Check for viewport meta tag
+            has_viewport = '<meta name="viewport"' in html
+            
+            # Check for responsive indicators
+            has_media_queries = '@media' in html
+            
+            return {
+                'has_viewport': has_viewport,
+                'appears_responsive': has_media_queries,
+                'mobile_score': 80 if has_viewport else 40
+            }
                 
         except Exception:
             return {'error': True, 'mobile_score': 0}
     
-    async def _check_structured_data(self, url: str) -> Dict:
+    async def _check_structured_data(self, url: str,
+                                     snapshots: Optional[PageSnapshotCache] = None) -> Dict:
         """Check for structured data."""
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-                
-            async with self.session.get(url, timeout=30) as response:
-                html = await response.text()
-                
-                # Check for JSON-LD
-                has_json_ld = '<script type="application/ld+json"' in html
-                
-                # Check for microdata
-                has_microdata = 'itemscope' in html
-                
-                return {
-                    'has_structured_data': has_json_ld or has_microdata,
-                    'types': {
-                        'json_ld': has_json_ld,
-                        'microdata': has_microdata
-                    }
+            html = (await (snapshots or self._snapshot_cache()).get(url)).body
+            
+            # Check for JSON-LD
+            has_json_ld = '<script type="application/ld+json"' in html
+            
+            # Check for microdata
+            has_microdata = 'itemscope' in html
+            
+            return {
+                'has_structured_data': has_json_ld or has_microdata,
+                'types': {
+                    'json_ld': has_json_ld,
+                    'microdata': has_microdata
                 }
+            }
                 
         except Exception:
             return {'error': True, 'has_structured_data': False}
@@ -1248,6 +1519,11 @@ class HempSEOAgent(BaseAgent):
             insights['weaknesses'].append(f"{site_audit['critical_issues']} critical SEO issues found")
         if technical_seo.get('page_speed', {}).get('rating') == 'slow':
             insights['weaknesses'].append('Slow page loading speed')
+        speed_regression = technical_seo.get('page_speed', {}).get('regression') or {}
+        if speed_regression.get('regressed'):
+            insights['weaknesses'].append(
+                f"Page load time regressed {speed_regression['total_change_pct']}% against recent audits"
+            )
         if content_analysis.get('average_quality_score', 0) < 50:
             insights['weaknesses'].append('Content quality needs improvement')
         
@@ -1257,6 +1533,31 @@ class HempSEOAgent(BaseAgent):
             for issue_type in list(issue_types)[:5]:
                 insights['opportunities'].append(f"Fix {issue_type.replace('_', ' ')} issues")
         
+        # Internal link structure
+        link_graph = site_audit.get('link_graph', {})
+        if link_graph.get('orphan_count'):
+            if link_graph.get('orphans_sampled'):
+                insights['weaknesses'].append(
+                    f"{link_graph['orphan_count']} sampled pages have no links from other sampled pages "
+                    f"(a partial audit; some may be linked from pages that were not audited)"
+                )
+            else:
+                insights['weaknesses'].append(
+                    f"{link_graph['orphan_count']} audited pages have no internal links pointing to them"
+                )
+            insights['opportunities'].append('Link orphan pages from related, high-PageRank pages')
+        if link_graph.get('deep_page_count'):
+            insights['opportunities'].append(
+                f"Bring {link_graph['deep_page_count']} pages within 3 clicks of the homepage"
+            )
+        if link_graph.get('top_pages'):
+            hubs = ', '.join(page['url'] for page in link_graph['top_pages'][:3])
+            insights['strengths'].append(f"Strongest internal hubs: {hubs}")
+        
+        orphan_count = link_graph.get('orphan_count', 0)
+        if link_graph.get('orphans_sampled'):
+            orphan_count = f"{orphan_count} (from a sampled audit)"
+        
         # Create recommendations
         prompt = f"""
         Based on this SEO analysis, provide 5 specific recommendations:
@@ -1266,6 +1567,9 @@ class HempSEOAgent(BaseAgent):
         Page Speed: {technical_seo.get('page_speed', {}).get('rating', 'unknown')}
         Mobile Score: {technical_seo.get('mobile_friendly', {}).get('mobile_score', 0)}
         Content Quality: {content_analysis.get('average_quality_score', 0)}/100
+        Orphan Pages: {orphan_count}
+        Pages Deeper Than 3 Clicks: {link_graph.get('deep_page_count', 0)}
+        Click Depth Distribution: {link_graph.get('depth_distribution', {})}
         
         Focus on hemp industry best practices.
         Return as JSON array of recommendation strings.
@@ -1294,7 +1598,7 @@ class HempSEOAgent(BaseAgent):
     
     async def _find_longtail_keywords(self, seed_keywords: List[str],
                                     product_focus: Optional[str]) -> List[Dict]:
-        """Find long-tail keyword opportunities."""
+        """Find long-tail keyword candidates (metrics are estimated after clustering)."""
         longtail_keywords = []
         
         # Common hemp industry modifiers
@@ -1322,16 +1626,7 @@ class HempSEOAgent(BaseAgent):
                         'seed_keyword': seed
                     })
         
-        # Analyze long-tail keywords
-        analyzed_longtails = []
-        for kw in longtail_keywords[:30]:  # Limit for performance
-            analysis = await self._estimate_keyword_metrics(kw['keyword'])
-            analyzed_longtails.append({
-                **kw,
-                **analysis
-            })
-        
-        return analyzed_longtails
+        return longtail_keywords[:30]  # Limit for performance
     
     async def _analyze_competitor_keywords(self) -> List[Dict]:
         """Analyze keywords competitors are ranking for."""
@@ -1444,7 +1739,8 @@ class HempSEOAgent(BaseAgent):
             self.session = aiohttp.ClientSession()
         
         try:
-            async with self.session.get(url, timeout=30) as response:
+            async with self.crawler.slot(url), \
+                    self.session.get(url, timeout=30, headers=self.crawler.headers) as response:
                 if response.status == 200:
                     html = await response.text()
                     soup = BeautifulSoup(html, 'html.parser')
@@ -1525,80 +1821,32 @@ class HempSEOAgent(BaseAgent):
         
         return opportunities
     
-    async def _update_keyword_ranking(self, keyword: str, ranking_data: Dict):
-        """Update keyword ranking in database."""
-        try:
-            # Find existing keyword
-            existing = await self.supabase.table('agent_seo_keywords')\
-                .select('id, current_position')\
-                .eq('keyword', keyword)\
-                .execute()
-            
-            if existing.data:
-                keyword_id = existing.data[0]['id']
-                old_position = existing.data[0].get('current_position')
-                
-                # Update with new ranking
-                await self.supabase.table('agent_seo_keywords')\
-                    .update({
-                        'current_position': ranking_data.get('position'),
-                        'url_ranking': ranking_data.get('url_ranking'),
-                        'competitors': ranking_data.get('competitors', []),
-                        'last_checked_at': ranking_data.get('checked_at'),
-                        'trend': self._calculate_ranking_trend(old_position, ranking_data.get('position'))
-                    })\
-                    .eq('id', keyword_id)\
-                    .execute()
-            else:
-                # Insert new keyword
-                await self.supabase.table('agent_seo_keywords').insert({
-                    'keyword': keyword,
-                    'current_position': ranking_data.get('position'),
-                    'url_ranking': ranking_data.get('url_ranking'),
-                    'competitors': ranking_data.get('competitors', []),
-                    'last_checked_at': ranking_data.get('checked_at')
-                }).execute()
-                
-        except Exception as e:
-            logger.error(f"Error updating keyword ranking: {e}")
-    
-    def _calculate_ranking_trend(self, old_position: Optional[int], 
-                               new_position: Optional[int]) -> str:
-        """Calculate ranking trend."""
-        if old_position is None or new_position is None:
-            return 'stable'
-        
-        if new_position < old_position:
-            return 'rising'
-        elif new_position > old_position:
-            return 'declining'
-        else:
-            return 'stable'
-    
-    async def _analyze_ranking_changes(self, ranking_updates: List[Dict]) -> Dict:
-        """Analyze ranking changes."""
-        improved = 0
-        declined = 0
-        total_positions = []
-        
-        for update in ranking_updates:
-            if update.get('position'):
-                total_positions.append(update['position'])
-                
-                # Check trend
-                keyword = update['keyword']
-                # In real implementation, would compare with previous position
-                # For now, simulate based on position
-                if update['position'] < 20:
-                    improved += 1
-                elif update['position'] > 50:
-                    declined += 1
+    async def _analyze_ranking_changes(self, ranking_updates: List[Dict],
+                                       ranking_stats: Dict[str, Dict]) -> Dict:
+        """Summarize ranking changes from the per-keyword history statistics."""
+        deltas = [
+            ranking_stats[update['keyword']]['delta']
+            for update in ranking_updates
+            if ranking_stats.get(update['keyword'], {}).get('delta') is not None
+        ]
+        improved = sum(1 for delta in deltas if delta > 0)
+        declined = sum(1 for delta in deltas if delta < 0)
+        total_positions = [update['position'] for update in ranking_updates if update.get('position')]
+        
+        volatile = sorted(
+            (
+                {'keyword': keyword, 'volatility': stats['volatility']}
+                for keyword, stats in ranking_stats.items() if stats.get('volatility')
+            ),
+            key=lambda item: item['volatility'], reverse=True
+        )
         
         return {
             'improved': improved,
             'declined': declined,
             'stable': len(ranking_updates) - improved - declined,
-            'average_position': sum(total_positions) / len(total_positions) if total_positions else 0
+            'average_position': sum(total_positions) / len(total_positions) if total_positions else 0,
+            'most_volatile': volatile[:5]
         }
     
     # Additional helper methods
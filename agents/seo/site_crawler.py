@@ -0,0 +1,133 @@
+"""Concurrent audit crawler with a bounded frontier and streamed results."""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from ..utils.crawl_scheduler import slot_acquired
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', '_ga'}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+SKIPPED_EXTENSIONS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.pdf', '.zip',
+    '.mp4', '.mp3', '.css', '.js', '.ico', '.xml', '.gz'
+)
+
+
+def canonicalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """Normalize a URL so equivalent spellings dedupe to one frontier entry.
+
+    Resolves relative links, lowercases scheme and host, drops fragments,
+    default ports and tracking parameters, and sorts the query string.
+    Returns ``None`` for non-HTTP links.
+    """
+    if not url:
+        return None
+    if base:
+        url = urljoin(base, url.strip())
+
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parsed.hostname:
+        return None
+
+    netloc = parsed.hostname.lower()
+    if parsed.port and parsed.port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{parsed.port}"
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ))
+
+    return urlunparse((scheme, netloc, parsed.path or '/', '', query, ''))
+
+
+class AuditCrawler:
+    """Runs a page analyzer over a site with a fixed pool of workers.
+
+    Seeds (usually sitemap URLs) and, when ``discover_links`` is set, the
+    internal links found on analyzed pages feed a deduplicated frontier
+    capped at ``max_pages``. Results are yielded as soon as each page
+    finishes, so callers can aggregate issues while the crawl continues.
+    """
+
+    def __init__(self, analyze: Callable[[str], Awaitable[Dict[str, Any]]],
+                 concurrency: int = 8, page_timeout: float = 45,
+                 discover_links: bool = False):
+        self.analyze = analyze
+        self.concurrency = max(1, concurrency)
+        self.page_timeout = page_timeout
+        self.discover_links = discover_links
+
+    async def _analyze_with_timeout(self, url: str) -> Dict[str, Any]:
+        # The timeout starts once the page's request gets a crawl slot, so
+        # pages queued behind a slow or Crawl-delayed host do not time out
+        acquired = asyncio.Event()
+        token = slot_acquired.set(acquired)
+        try:
+            task = asyncio.ensure_future(self.analyze(url))
+        finally:
+            slot_acquired.reset(token)
+        waiter = asyncio.ensure_future(acquired.wait())
+        try:
+            await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            return await asyncio.wait_for(task, self.page_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out analyzing {url} after {self.page_timeout}s")
+            return {'url': url, 'error': 'timeout', 'seo_score': 0, 'issues': []}
+        except Exception as e:
+            logger.error(f"Error analyzing page {url}: {e}")
+            return {'url': url, 'error': str(e), 'seo_score': 0, 'issues': []}
+        finally:
+            waiter.cancel()
+            task.cancel()
+
+    @staticmethod
+    def _discovered_links(result: Dict[str, Any]) -> List[str]:
+        return result.get('seo_elements', {}).get('internal_links', [])
+
+    async def crawl(self, seeds: Iterable[str], max_pages: int) -> AsyncIterator[Dict[str, Any]]:
+        """Yield page analyses for up to ``max_pages`` unique URLs."""
+        seeds = list(seeds)
+        allowed_hosts = {urlparse(seed).netloc.lower() for seed in seeds}
+        frontier: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue()
+        seen: Set[str] = set()
+
+        def enqueue(url: str, base: Optional[str] = None) -> bool:
+            if len(seen) >= max_pages:
+                return False
+            canonical = canonicalize_url(url, base)
+            if (not canonical or canonical in seen
+                    or urlparse(canonical).netloc not in allowed_hosts
+                    or urlparse(canonical).path.lower().endswith(SKIPPED_EXTENSIONS)):
+                return False
+            seen.add(canonical)
+            frontier.put_nowait(canonical)
+            return True
+
+        async def worker():
+            while True:
+                url = await frontier.get()
+                await results.put(await self._analyze_with_timeout(url))
+
+        outstanding = sum(1 for seed in seeds if enqueue(seed))
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, max_pages))]
+
+        try:
+            while outstanding:
+                result = await results.get()
+                outstanding -= 1
+                if self.discover_links:
+                    for link in self._discovered_links(result):
+                        if enqueue(link, result.get('url')):
+                            outstanding += 1
+                yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,247 @@
+"""Streaming sitemap reader with sitemap-index, gzip and lastmod support."""
+
+import asyncio
+import logging
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Union
+from urllib.parse import urljoin
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+import aiohttp
+
+from ..utils.local_store import data_path
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b'\x1f\x8b'
+CHUNK_SIZE = 64 * 1024
+# Stays under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+@dataclass
+class SitemapEntry:
+    """A URL listed in a sitemap."""
+    loc: str
+    lastmod: Optional[str] = None
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+class SitemapStreamParser:
+    """Incremental parser for ``urlset`` and ``sitemapindex`` documents.
+
+    Bytes are fed as they arrive (gzip is detected from the magic bytes and
+    inflated on the fly) and completed ``<url>``/``<sitemap>`` elements are
+    released immediately, so memory stays flat for sitemaps of any size.
+    """
+
+    def __init__(self):
+        self._parser = XMLPullParser(events=('start', 'end'))
+        self._inflater = None
+        self._sniffed = False
+        self._root = None
+        self.kind: Optional[str] = None  # 'urlset' or 'sitemapindex'
+
+    def feed(self, chunk: bytes) -> List[SitemapEntry]:
+        """Feed raw bytes and return the entries completed so far."""
+        if not self._sniffed:
+            self._sniffed = True
+            if chunk.startswith(GZIP_MAGIC):
+                self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._inflater is not None:
+            chunk = self._inflater.decompress(chunk)
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[SitemapEntry]:
+        """Flush the parser and return any remaining entries."""
+        if self._inflater is not None:
+            self._parser.feed(self._inflater.flush())
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[SitemapEntry]:
+        entries = []
+        for event, element in self._parser.read_events():
+            name = _local_name(element.tag)
+            if event == 'start':
+                if self._root is None:
+                    self._root = element
+                    self.kind = name
+                continue
+
+            if name not in ('url', 'sitemap'):
+                continue
+
+            loc = lastmod = None
+            for child in element:
+                child_name = _local_name(child.tag)
+                if child_name == 'loc' and child.text:
+                    loc = child.text.strip()
+                elif child_name == 'lastmod' and child.text:
+                    lastmod = child.text.strip()
+            if loc:
+                entries.append(SitemapEntry(loc, lastmod))
+            # Completed entries are no longer needed in the tree
+            self._root.clear()
+        return entries
+
+
+class SitemapReader:
+    """Streams every URL of a site's sitemaps, following index files concurrently."""
+
+    def __init__(self, session: aiohttp.ClientSession, crawler, concurrency: int = 4,
+                 max_urls: int = 50000, max_sitemaps: int = 500, timeout: float = 60):
+        self.session = session
+        self.crawler = crawler
+        self.concurrency = concurrency
+        self.max_urls = max_urls
+        self.max_sitemaps = max_sitemaps
+        self.timeout = timeout
+        self.stats = {'sitemaps_fetched': 0, 'index_files': 0, 'errors': 0}
+
+    async def discover(self, base_url: str) -> List[str]:
+        """Sitemap locations from robots.txt, falling back to ``/sitemap.xml``."""
+        robots = await self.crawler.robots_txt(base_url) or ''
+        sitemaps = [
+            line.split(':', 1)[1].strip()
+            for line in robots.splitlines()
+            if line.lower().startswith('sitemap:') and ':' in line
+        ]
+        return sitemaps or [urljoin(base_url, '/sitemap.xml')]
+
+    async def _read(self, sitemap_url: str, children: asyncio.Queue, entries: asyncio.Queue):
+        """Stream one sitemap, routing child sitemaps and URL entries."""
+        parser = SitemapStreamParser()
+
+        def route(batch: List[SitemapEntry]):
+            for entry in batch:
+                if parser.kind == 'sitemapindex':
+                    children.put_nowait(entry.loc)
+                else:
+                    entries.put_nowait(entry)
+
+        async with self.crawler.slot(sitemap_url), \
+                self.session.get(sitemap_url, timeout=self.timeout, headers=self.crawler.headers) as response:
+            if response.status != 200:
+                logger.warning(f"Sitemap {sitemap_url} returned HTTP {response.status}")
+                return
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                route(parser.feed(chunk))
+            route(parser.close())
+
+        self.stats['sitemaps_fetched'] += 1
+        if parser.kind == 'sitemapindex':
+            self.stats['index_files'] += 1
+
+    async def iter_entries(self, base_url: str,
+                           sitemap_urls: Optional[Iterable[str]] = None) -> AsyncIterator[SitemapEntry]:
+        """Yield sitemap entries as they are parsed, up to ``max_urls``."""
+        children: asyncio.Queue = asyncio.Queue()
+        entries: asyncio.Queue = asyncio.Queue()
+        seen = set()
+        for url in sitemap_urls or await self.discover(base_url):
+            children.put_nowait(url)
+
+        done = object()
+
+        async def worker():
+            while True:
+                sitemap_url = await children.get()
+                try:
+                    if sitemap_url not in seen and len(seen) < self.max_sitemaps:
+                        seen.add(sitemap_url)
+                        await self._read(sitemap_url, children, entries)
+                except (ParseError, zlib.error) as e:
+                    self.stats['errors'] += 1
+                    logger.warning(f"Malformed sitemap {sitemap_url}: {e}")
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    logger.error(f"Error fetching sitemap {sitemap_url}: {e}")
+                finally:
+                    children.task_done()
+
+        async def finish():
+            await children.join()
+            entries.put_nowait(done)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        finisher = asyncio.create_task(finish())
+        yielded = 0
+        seen_locs = set()
+
+        try:
+            while yielded < self.max_urls:
+                entry = await entries.get()
+                if entry is done:
+                    break
+                if entry.loc in seen_locs:
+                    continue
+                seen_locs.add(entry.loc)
+                yielded += 1
+                yield entry
+        finally:
+            for task in workers + [finisher]:
+                task.cancel()
+            await asyncio.gather(*workers, finisher, return_exceptions=True)
+
+    async def read_all(self, base_url: str) -> List[SitemapEntry]:
+        """Collect all entries of a site's sitemaps."""
+        return [entry async for entry in self.iter_entries(base_url)]
+
+
+class SitemapLastmodStore:
+    """Remembers the ``lastmod`` of every sitemap URL seen by previous audits."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else data_path('sitemap_lastmod.sqlite')
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS lastmod (
+                site TEXT NOT NULL,
+                loc TEXT NOT NULL,
+                lastmod TEXT,
+                audited_at REAL NOT NULL,
+                PRIMARY KEY (site, loc)
+            )"""
+        )
+
+    def changed(self, site: str, entries: List[SitemapEntry]) -> List[SitemapEntry]:
+        """Entries that are new or whose lastmod differs from the last audit.
+
+        URLs without a ``lastmod`` are always considered changed. Only the
+        given entries are looked up, so callers can check a sitemap in batches.
+        """
+        locs = [entry.loc for entry in entries]
+        previous: Dict[str, Optional[str]] = {}
+        for start in range(0, len(locs), LOOKUP_CHUNK):
+            chunk = locs[start:start + LOOKUP_CHUNK]
+            previous.update(self._db.execute(
+                f"SELECT loc, lastmod FROM lastmod WHERE site = ? AND loc IN ({','.join('?' * len(chunk))})",
+                (site, *chunk)
+            ))
+        return [
+            entry for entry in entries
+            if entry.lastmod is None or entry.loc not in previous
+            or previous[entry.loc] != entry.lastmod
+        ]
+
+    def record(self, site: str, entries: Iterable[SitemapEntry]):
+        """Store the lastmod values of audited entries."""
+        now = time.time()
+        self._db.executemany(
+            'INSERT OR REPLACE INTO lastmod (site, loc, lastmod, audited_at) VALUES (?, ?, ?, ?)',
+            [(site, entry.loc, entry.lastmod, now) for entry in entries]
+        )
+        self._db.commit()
+
+    def close(self):
+        """Close the backing store."""
+        self._db.close()
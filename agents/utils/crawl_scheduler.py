@@ -0,0 +1,322 @@
+"""Per-host polite crawl scheduling with a shared robots.txt cache."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'HempResourceHubBot/1.0 (+https://hempresourcehub.com)'
+
+# Set by callers that want to know when their task's request got a slot,
+# e.g. to start a timeout only once queueing behind other requests is over
+slot_acquired: ContextVar[Optional[asyncio.Event]] = ContextVar('slot_acquired', default=None)
+
+
+class CrawlDisallowed(Exception):
+    """Raised when robots.txt forbids fetching a URL."""
+
+
+@dataclass
+class RobotsEntry:
+    """A parsed robots.txt and when it has to be fetched again."""
+    parser: Optional[RobotFileParser]
+    content: Optional[str]
+    expires_at: float
+
+    def allows(self, user_agent: str, url: str) -> bool:
+        return self.parser is None or self.parser.can_fetch(user_agent, url)
+
+    def crawl_delay(self, user_agent: str) -> Optional[float]:
+        if self.parser is None:
+            return None
+        delay = self.parser.crawl_delay(user_agent)
+        if delay is None:
+            rate = self.parser.request_rate(user_agent)
+            if rate and rate.requests:
+                delay = rate.seconds / rate.requests
+        return float(delay) if delay is not None else None
+
+
+class HostSlots:
+    """A counting semaphore whose limit can change while slots are held."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters: deque = deque()
+
+    async def acquire(self):
+        while self.active >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.active += 1
+
+    def release(self):
+        self.active -= 1
+        self._wake()
+
+    def resize(self, limit: int):
+        """Change the limit; held slots stay valid and are counted against it."""
+        self.limit = max(1, limit)
+        self._wake()
+
+    def _wake(self):
+        free = self.limit - self.active
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+@dataclass
+class HostBudget:
+    """Concurrency and pacing state for one host on the running event loop."""
+    slots: HostSlots
+    delay: float
+    crawl_delay: Optional[float] = None
+    next_slot: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    requests: int = 0
+
+
+class RobotsCache:
+    """Fetches and caches parsed robots.txt files per host with a TTL.
+
+    Missing robots.txt (4xx) allows everything; server errors and timeouts
+    also allow crawling but are retried after ``error_ttl`` seconds.
+    """
+
+    def __init__(self, user_agent: str = DEFAULT_USER_AGENT, ttl: float = 6 * 3600,
+                 error_ttl: float = 600, timeout: float = 10):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self._entries: Dict[str, RobotsEntry] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    async def _download(self, origin: str) -> RobotsEntry:
+        now = time.monotonic()
+        try:
+            async with aiohttp.ClientSession(headers={'User-Agent': self.user_agent}) as session:
+                async with session.get(f"{origin}/robots.txt", timeout=self.timeout) as response:
+                    if response.status >= 500:
+                        return RobotsEntry(None, None, now + self.error_ttl)
+                    if response.status != 200:
+                        return RobotsEntry(None, None, now + self.ttl)
+                    content = await response.text()
+        except Exception as e:
+            logger.debug(f"robots.txt unavailable for {origin}: {e}")
+            return RobotsEntry(None, None, now + self.error_ttl)
+
+        parser = RobotFileParser()
+        parser.parse(content.splitlines())
+        return RobotsEntry(parser, content, now + self.ttl)
+
+    async def get(self, url: str) -> RobotsEntry:
+        """Return the robots entry for a URL's host, fetching it at most once per TTL."""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme or 'https'}://{parsed.netloc}"
+
+        entry = self._entries.get(origin)
+        if entry and entry.expires_at > time.monotonic():
+            return entry
+
+        # One download per host runs as its own task; callers wait on it
+        # shielded, so a cancelled caller does not cancel the others
+        pending = self._pending.get(origin)
+        if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(self._fetch_entry(origin))
+            self._pending[origin] = pending
+        return await asyncio.shield(pending)
+
+    async def _fetch_entry(self, origin: str) -> RobotsEntry:
+        try:
+            entry = await self._download(origin)
+            self._entries[origin] = entry
+            return entry
+        finally:
+            if self._pending.get(origin) is asyncio.current_task():
+                del self._pending[origin]
+
+    def invalidate(self, url: Optional[str] = None):
+        """Forget one host's robots.txt, or all of them."""
+        if url is None:
+            self._entries.clear()
+            return
+        parsed = urlparse(url)
+        self._entries.pop(f"{parsed.scheme or 'https'}://{parsed.netloc}", None)
+
+
+class CrawlScheduler:
+    """Shared frontier that paces requests per host across all agents.
+
+    Every fetch goes through :meth:`slot`, which checks robots.txt, waits for
+    the host's concurrency budget and spaces requests by the larger of the
+    default delay and the site's ``Crawl-delay``. Because the scheduler is a
+    process-wide singleton, agents hitting the same host share its budget,
+    so global concurrency can be raised without hammering any one site.
+    """
+
+    def __init__(self, per_host_concurrency: int = 2, default_delay: float = 1.0,
+                 global_concurrency: int = 32, max_crawl_delay: float = 30.0,
+                 host_overrides: Optional[Dict[str, Dict[str, float]]] = None,
+                 robots: Optional[RobotsCache] = None):
+        self.per_host_concurrency = per_host_concurrency
+        self.default_delay = default_delay
+        self.global_concurrency = global_concurrency
+        self.max_crawl_delay = max_crawl_delay
+        self.host_overrides = host_overrides or {}
+        self.robots = robots or RobotsCache()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._hosts: Dict[str, HostBudget] = {}
+        self._global: Optional[asyncio.Semaphore] = None
+
+    @property
+    def user_agent(self) -> str:
+        return self.robots.user_agent
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Headers for requests made in a :meth:`slot`; sites see the agent robots.txt was checked for."""
+        return {'User-Agent': self.user_agent}
+
+    def _reset_for_loop(self):
+        """Asyncio primitives are bound to a loop; recreate them per loop."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._hosts = {}
+            self._global = asyncio.Semaphore(self.global_concurrency)
+
+    def _limits(self, host: str, crawl_delay: Optional[float]) -> Tuple[float, int]:
+        """Delay and concurrency of a host from its override and ``Crawl-delay``."""
+        override = self.host_overrides.get(host, {})
+        delay = override.get('delay', self.default_delay)
+        concurrency = int(override.get('concurrency', self.per_host_concurrency))
+        if crawl_delay is not None:
+            delay = max(delay, min(crawl_delay, self.max_crawl_delay))
+            concurrency = 1
+        return delay, concurrency
+
+    def _budget(self, host: str, robots: RobotsEntry) -> HostBudget:
+        budget = self._hosts.get(host)
+        if budget is None:
+            crawl_delay = robots.crawl_delay(self.user_agent)
+            delay, concurrency = self._limits(host, crawl_delay)
+            budget = HostBudget(HostSlots(concurrency), delay, crawl_delay)
+            self._hosts[host] = budget
+        return budget
+
+    def _refresh_budget(self, host: str):
+        """Apply changed overrides to a live budget, keeping its held slots and pacing."""
+        budget = self._hosts.get(host)
+        if budget is not None:
+            budget.delay, concurrency = self._limits(host, budget.crawl_delay)
+            budget.slots.resize(concurrency)
+
+    def configure_host(self, host: str, concurrency: Optional[int] = None,
+                       delay: Optional[float] = None):
+        """Override the budget of one host (e.g. our own site during audits).
+
+        A robots.txt ``Crawl-delay`` still takes precedence over ``delay``.
+        """
+        override = self.host_overrides.setdefault(host.lower(), {})
+        if concurrency is not None:
+            override['concurrency'] = concurrency
+        if delay is not None:
+            override['delay'] = delay
+        self._refresh_budget(host.lower())
+
+    @contextmanager
+    def host_override(self, host: str, concurrency: Optional[int] = None,
+                      delay: Optional[float] = None):
+        """Apply :meth:`configure_host` for the ``with`` block, then restore the previous budget."""
+        host = host.lower()
+        previous = dict(self.host_overrides[host]) if host in self.host_overrides else None
+        self.configure_host(host, concurrency=concurrency, delay=delay)
+        try:
+            yield
+        finally:
+            if previous is None:
+                self.host_overrides.pop(host, None)
+            else:
+                self.host_overrides[host] = previous
+            self._refresh_budget(host)
+
+    async def allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch the URL."""
+        entry = await self.robots.get(url)
+        return entry.allows(self.user_agent, url)
+
+    async def robots_txt(self, url: str) -> Optional[str]:
+        """Raw robots.txt of the URL's host from the cache, if it exists."""
+        return (await self.robots.get(url)).content
+
+    @asynccontextmanager
+    async def slot(self, url: str, check_robots: bool = True):
+        """Hold a request slot for ``url``; fetch inside the ``async with`` block.
+
+        Requests made in the slot should send :attr:`headers`. Raises
+        :class:`CrawlDisallowed` when robots.txt forbids the URL.
+        """
+        self._reset_for_loop()
+        host = urlparse(url).netloc.lower()
+        entry = await self.robots.get(url)
+        if check_robots and not entry.allows(self.user_agent, url):
+            raise CrawlDisallowed(f"robots.txt disallows {url}")
+
+        budget = self._budget(host, entry)
+        await budget.slots.acquire()
+        try:
+            async with budget.lock:
+                now = time.monotonic()
+                wait = budget.next_slot - now
+                budget.next_slot = max(now, budget.next_slot) + budget.delay
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # A global slot is only held for the request itself, so hosts
+            # waiting out their crawl delay do not block other hosts
+            async with self._global:
+                budget.requests += 1
+                acquired = slot_acquired.get()
+                if acquired is not None:
+                    acquired.set()
+                yield
+        finally:
+            budget.slots.release()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Requests issued and pacing per host on the current loop."""
+        return {
+            host: {'requests': budget.requests, 'delay': budget.delay}
+            for host, budget in self._hosts.items()
+        }
+
+
+_shared_scheduler: Optional[CrawlScheduler] = None
+
+
+def get_crawl_scheduler() -> CrawlScheduler:
+    """Return the process-wide scheduler shared by all agents."""
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = CrawlScheduler()
+    return _shared_scheduler
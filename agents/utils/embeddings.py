@@ -0,0 +1,548 @@
+"""Batched, cached embeddings and a local vector index over product embeddings."""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .local_store import data_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = 'text-embedding-3-small'
+PRODUCT_TEXT_FIELDS = ('name', 'description')
+
+
+def content_hash(text: str, model: str = DEFAULT_EMBEDDING_MODEL) -> str:
+    """Cache key of a text for a given embedding model."""
+    return hashlib.sha256(f"{model}\0{text}".encode('utf-8')).hexdigest()
+
+
+def product_text(product: Dict[str, Any]) -> str:
+    """Text that represents a ``uses_products`` row for embedding."""
+    parts = []
+    for field in PRODUCT_TEXT_FIELDS:
+        value = product.get(field)
+        if value:
+            parts.append(str(value).strip())
+    return '\n'.join(parts)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so dot products are cosine similarities."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class EmbeddingCache:
+    """SQLite store of embedding vectors keyed by content hash."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else data_path('embedding_cache.sqlite')
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS vectors (
+                hash TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL
+            )"""
+        )
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return cached vectors for the hashes that are present."""
+        found = {}
+        for start in range(0, len(hashes), 500):
+            chunk = list(hashes[start:start + 500])
+            placeholders = ','.join('?' * len(chunk))
+            for key, vector in self._db.execute(
+                f'SELECT hash, vector FROM vectors WHERE hash IN ({placeholders})', chunk
+            ):
+                found[key] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray], model: str):
+        """Store vectors with a single commit."""
+        self._db.executemany(
+            'INSERT OR REPLACE INTO vectors (hash, model, dim, vector) VALUES (?, ?, ?, ?)',
+            [
+                (key, model, len(vector), np.asarray(vector, dtype=np.float32).tobytes())
+                for key, vector in items.items()
+            ]
+        )
+        self._db.commit()
+
+    def close(self):
+        """Close the backing store."""
+        self._db.close()
+
+
+class EmbeddingService:
+    """Embeds texts in batches, only calling the provider for cache misses.
+
+    ``provider`` may expose ``embed_batch(texts)`` and/or ``embed(text)``;
+    either may return the vectors alone or a ``(vectors, cost)`` tuple, as
+    ``MultiProviderAI`` does.
+    """
+
+    def __init__(self, provider, cache: Optional[EmbeddingCache] = None,
+                 model: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = 64,
+                 max_concurrency: int = 4):
+        self.provider = provider
+        self.cache = cache or EmbeddingCache()
+        self.model = model
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.total_cost = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def _split_cost(result) -> Tuple[Any, float]:
+        if isinstance(result, tuple) and len(result) == 2:
+            return result[0], float(result[1] or 0.0)
+        return result, 0.0
+
+    async def _embed_chunk(self, texts: List[str]) -> List[List[float]]:
+        async with self._semaphore:
+            if hasattr(self.provider, 'embed_batch'):
+                vectors, cost = self._split_cost(await self.provider.embed_batch(texts))
+            else:
+                vectors, cost = [], 0.0
+                for text in texts:
+                    vector, text_cost = self._split_cost(await self.provider.embed(text))
+                    vectors.append(vector)
+                    cost += text_cost
+        self.total_cost += cost
+        return vectors
+
+    async def embed_texts(self, texts: Sequence[str]) -> np.ndarray:
+        """Return an ``(n, dim)`` float32 matrix of embeddings for ``texts``."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        hashes = [content_hash(text, self.model) for text in texts]
+        vectors = self.cache.get_many(list(set(hashes)))
+
+        missing = {}
+        for key, text in zip(hashes, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        self.cache_hits += len(texts) - sum(1 for key in hashes if key in missing)
+        self.cache_misses += len(missing)
+
+        if missing:
+            keys = list(missing)
+            chunks = [keys[i:i + self.batch_size] for i in range(0, len(keys), self.batch_size)]
+            results = await asyncio.gather(
+                *(self._embed_chunk([missing[key] for key in chunk]) for chunk in chunks)
+            )
+            fresh = {}
+            for chunk, chunk_vectors in zip(chunks, results):
+                for key, vector in zip(chunk, chunk_vectors):
+                    fresh[key] = np.asarray(vector, dtype=np.float32)
+            self.cache.put_many(fresh, self.model)
+            vectors.update(fresh)
+            logger.info(f"Embedded {len(fresh)} texts ({len(texts) - len(fresh)} from cache)")
+
+        return np.vstack([vectors[key] for key in hashes])
+
+    async def embed_text(self, text: str) -> np.ndarray:
+        """Return the embedding of a single text."""
+        return (await self.embed_texts([text]))[0]
+
+
+class ProductVectorIndex:
+    """Memory-mapped matrix of normalized product vectors with top-k search.
+
+    Vectors live in ``<name>_vectors.npy`` (opened with ``mmap_mode='r'``)
+    next to a JSON file holding the product id and content hash of each row.
+    Search is an exact dot product over the whole matrix; :meth:`build_ivf`
+    adds an inverted-file layer (k-means lists) for catalogs where scanning
+    every row becomes too slow. Queries reload the files when another
+    process (or another index object) has rewritten them.
+
+    Upserts overwrite changed rows in place and append new ones to the end
+    of the matrix; new rows join the nearest existing IVF list until the
+    lists are rebuilt.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, name: str = 'products'):
+        directory = Path(directory) if directory else data_path('vectors')
+        directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = directory / f'{name}_vectors.npy'
+        self.meta_path = directory / f'{name}_meta.json'
+        self.ivf_path = directory / f'{name}_ivf.npz'
+
+        self.ids: List[str] = []
+        self.hashes: List[str] = []
+        self.matrix: Optional[np.ndarray] = None
+        self._rows: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._assignments: Optional[np.ndarray] = None
+        self.ivf_rows = 0
+        self._loaded_stamp: Optional[int] = None
+        self._pending: Optional[Dict[str, Tuple[str, np.ndarray]]] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, product_id) -> bool:
+        self.reload_if_changed()
+        return str(product_id) in self._rows
+
+    @property
+    def in_batch(self) -> bool:
+        """Whether upserts are currently buffered by :meth:`batch`."""
+        return self._pending is not None
+
+    def _stamp(self) -> Optional[int]:
+        try:
+            return self.meta_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def reload_if_changed(self) -> bool:
+        """Remap the files if they were rewritten since this index loaded them."""
+        if self.in_batch or self._stamp() == self._loaded_stamp:
+            return False
+        return self._load()
+
+    def _load(self) -> bool:
+        stamp = self._stamp()
+        if stamp is None or not self.vectors_path.exists():
+            return False
+
+        try:
+            meta = json.loads(self.meta_path.read_text())
+            matrix = np.load(self.vectors_path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load product vectors: {e}")
+            return False
+        if matrix.shape[0] != len(meta['ids']):
+            # Caught between the two file replacements of a write; retry next query
+            return False
+
+        self.ids = meta['ids']
+        self.hashes = meta['hashes']
+        self.matrix = matrix
+        self._rows = {product_id: row for row, product_id in enumerate(self.ids)}
+        self._clear_ivf()
+        self._loaded_stamp = stamp
+
+        if self.ivf_path.exists():
+            ivf = np.load(self.ivf_path)
+            if int(ivf['rows']) == len(self.ids):
+                built_rows = int(ivf['built_rows']) if 'built_rows' in ivf.files else len(self.ids)
+                self._set_ivf(ivf['centroids'], ivf['assignments'], built_rows)
+
+        logger.info(f"Loaded {len(self.ids)} product vectors")
+        return True
+
+    def _write(self, ids: List[str], hashes: List[str], matrix: Optional[np.ndarray]):
+        """Atomically replace the on-disk matrix and remap it."""
+        self.matrix = None
+        if ids:
+            tmp_path = self.vectors_path.with_suffix('.tmp.npy')
+            out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=matrix.shape)
+            out[:] = matrix
+            out.flush()
+            del out
+            os.replace(tmp_path, self.vectors_path)
+        elif self.vectors_path.exists():
+            self.vectors_path.unlink()
+        self._write_meta(ids, hashes)
+        self._clear_ivf()
+        if self.ivf_path.exists():
+            self.ivf_path.unlink()
+
+    def _write_meta(self, ids: List[str], hashes: List[str]):
+        """Atomically replace the id/hash file and remap the matrix."""
+        tmp_meta = self.meta_path.with_suffix('.tmp.json')
+        tmp_meta.write_text(json.dumps({'ids': ids, 'hashes': hashes}))
+        os.replace(tmp_meta, self.meta_path)
+        self._loaded_stamp = self._stamp()
+
+        self.ids, self.hashes = ids, hashes
+        self._rows = {product_id: row for row, product_id in enumerate(ids)}
+        self.matrix = np.load(self.vectors_path, mmap_mode='r') if ids else None
+
+    def _overwrite_rows(self, rows: List[int], vectors: np.ndarray):
+        """Replace existing rows of the on-disk matrix in place."""
+        out = np.load(self.vectors_path, mmap_mode='r+')
+        out[rows] = vectors
+        out.flush()
+        del out
+
+    def _append_rows(self, vectors: np.ndarray) -> bool:
+        """Append rows to the on-disk matrix, rewriting only its header.
+
+        Returns False when the grown shape does not fit in the existing
+        header, in which case the caller rewrites the whole file.
+        """
+        with open(self.vectors_path, 'r+b') as f:
+            version = np.lib.format.read_magic(f)
+            if version != (1, 0):
+                return False
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            data_offset = f.tell()
+            if fortran_order or dtype != np.float32 or shape[1:] != vectors.shape[1:]:
+                return False
+
+            header = io.BytesIO()
+            np.lib.format.write_array_header_1_0(header, {
+                'descr': np.lib.format.dtype_to_descr(dtype),
+                'fortran_order': False,
+                'shape': (shape[0] + len(vectors),) + shape[1:]
+            })
+            if header.tell() != data_offset:
+                return False
+
+            f.seek(data_offset + shape[0] * vectors[0].nbytes)
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            f.flush()
+            f.seek(0)
+            f.write(header.getvalue())
+        return True
+
+    def stale(self, products: Iterable[Dict[str, Any]], model: str = DEFAULT_EMBEDDING_MODEL) -> List[Dict[str, Any]]:
+        """Return the products that are missing or whose text has changed."""
+        self.reload_if_changed()
+        pending = self._pending or {}
+        changed = []
+        for product in products:
+            key = str(product.get('id'))
+            row = self._rows.get(key)
+            if key in pending:
+                stored = pending[key][0]
+            else:
+                stored = self.hashes[row] if row is not None else None
+            if stored != content_hash(product_text(product), model):
+                changed.append(product)
+        return changed
+
+    @contextmanager
+    def batch(self):
+        """Buffer upserts inside the block and rewrite the matrix once at the end."""
+        if self.in_batch:
+            yield self
+            return
+        self._pending = {}
+        try:
+            yield self
+        finally:
+            pending, self._pending = self._pending, None
+            if pending:
+                ids = list(pending)
+                self.upsert(ids, [pending[key][0] for key in ids],
+                            np.vstack([pending[key][1] for key in ids]))
+
+    def upsert(self, ids: Sequence, hashes: Sequence[str], vectors: np.ndarray):
+        """Insert or replace the vectors of the given products."""
+        if not len(ids):
+            return
+        if self.in_batch:
+            for product_id, key, vector in zip(ids, hashes, np.asarray(vectors, dtype=np.float32)):
+                self._pending[str(product_id)] = (key, vector)
+            return
+        self.reload_if_changed()
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        # The last occurrence wins when an id is given twice
+        positions = {str(product_id): position for position, product_id in enumerate(ids)}
+        if self.matrix is None:
+            self._write(list(positions), [hashes[p] for p in positions.values()],
+                        vectors[list(positions.values())])
+            return
+
+        hashes_out = list(self.hashes)
+        replaced = [(self._rows[key], p) for key, p in positions.items() if key in self._rows]
+        added = [(key, p) for key, p in positions.items() if key not in self._rows]
+        if replaced:
+            rows = [row for row, _ in replaced]
+            self._overwrite_rows(rows, vectors[[p for _, p in replaced]])
+            for row, p in replaced:
+                hashes_out[row] = hashes[p]
+        if added:
+            new_vectors = vectors[[p for _, p in added]]
+            if not self._append_rows(new_vectors):
+                self._write(self.ids + [key for key, _ in added],
+                            hashes_out + [hashes[p] for _, p in added],
+                            np.vstack([np.asarray(self.matrix), new_vectors]))
+                return
+        self._write_meta(self.ids + [key for key, _ in added],
+                         hashes_out + [hashes[p] for _, p in added])
+        self._assign_ivf([row for row, _ in replaced] +
+                         list(range(len(self.ids) - len(added), len(self.ids))))
+
+    def remove(self, ids: Iterable):
+        """Drop the vectors of the given products."""
+        removed = {str(product_id) for product_id in ids}
+        keep = [row for row, product_id in enumerate(self.ids) if product_id not in removed]
+        if len(keep) == len(self.ids):
+            return
+        self._write([self.ids[row] for row in keep], [self.hashes[row] for row in keep],
+                    np.asarray(self.matrix[keep]) if keep else None)
+
+    def _clear_ivf(self):
+        self._centroids, self._lists, self._assignments = None, [], None
+        self.ivf_rows = 0
+
+    def _set_ivf(self, centroids: np.ndarray, assignments: np.ndarray, built_rows: int):
+        self._centroids = centroids.astype(np.float32)
+        self._assignments = np.asarray(assignments)
+        self._lists = [np.flatnonzero(self._assignments == c) for c in range(len(centroids))]
+        self.ivf_rows = built_rows
+
+    def _save_ivf(self):
+        np.savez(self.ivf_path, centroids=self._centroids, assignments=self._assignments,
+                 rows=len(self._assignments), built_rows=self.ivf_rows)
+
+    def _assign_ivf(self, rows: List[int]):
+        """Put upserted rows into their nearest existing IVF list."""
+        if self._centroids is None or not rows:
+            return
+        assignments = np.resize(self._assignments, len(self.ids))
+        assignments[rows] = np.argmax(np.asarray(self.matrix[rows]) @ self._centroids.T, axis=1)
+        self._set_ivf(self._centroids, assignments, self.ivf_rows)
+        self._save_ivf()
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0):
+        """Cluster the vectors into ``n_lists`` inverted lists (spherical k-means)."""
+        if self.matrix is None or len(self.ids) < 2:
+            return
+        data = np.asarray(self.matrix)
+        n_lists = min(n_lists or max(1, int(np.sqrt(len(data)))), len(data))
+
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = data[assignments == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+        assignments = np.argmax(data @ centroids.T, axis=1)
+
+        self._set_ivf(centroids, assignments, len(data))
+        self._save_ivf()
+        logger.info(f"Built IVF index with {n_lists} lists over {len(data)} vectors")
+
+    def search(self, vector, k: int = 10, exclude: Optional[Iterable] = None,
+               n_probe: int = 8) -> List[Tuple[str, float]]:
+        """Return the ``k`` most similar products as ``(id, cosine)`` pairs."""
+        self.reload_if_changed()
+        if self.matrix is None or not self.ids:
+            return []
+        query = _normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        excluded = {str(product_id) for product_id in exclude or ()}
+
+        if self._centroids is not None:
+            probe = np.argsort(self._centroids @ query)[::-1][:n_probe]
+            rows = np.concatenate([self._lists[c] for c in probe])
+            scores = np.asarray(self.matrix[rows]) @ query
+        else:
+            rows = None
+            scores = np.asarray(self.matrix @ query)
+
+        wanted = min(k + len(excluded), len(scores))
+        if wanted <= 0:
+            return []
+        top = np.argpartition(-scores, wanted - 1)[:wanted]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for position in top:
+            row = int(rows[position]) if rows is not None else int(position)
+            product_id = self.ids[row]
+            if product_id in excluded:
+                continue
+            results.append((product_id, float(scores[position])))
+            if len(results) == k:
+                break
+        return results
+
+    def similar_to(self, product_id, k: int = 10, n_probe: int = 8) -> List[Tuple[str, float]]:
+        """Return the products most similar to an indexed product."""
+        self.reload_if_changed()
+        row = self._rows.get(str(product_id))
+        if row is None:
+            return []
+        return self.search(self.matrix[row], k, exclude=[product_id], n_probe=n_probe)
+
+
+class ProductSimilaritySearch:
+    """Keeps the product vector index in sync and answers similarity queries."""
+
+    def __init__(self, provider, index: Optional[ProductVectorIndex] = None,
+                 service: Optional[EmbeddingService] = None, ivf_threshold: int = 50000,
+                 ivf_rebuild_growth: float = 0.2):
+        self.service = service or EmbeddingService(provider)
+        self.index = index or ProductVectorIndex()
+        self.ivf_threshold = ivf_threshold
+        self.ivf_rebuild_growth = ivf_rebuild_growth
+
+    async def refresh(self, products: List[Dict[str, Any]]) -> int:
+        """Embed new or changed products and add them to the index."""
+        changed = [
+            product for product in self.index.stale(products, self.service.model)
+            if product.get('id') is not None and product_text(product)
+        ]
+        if not changed:
+            return 0
+
+        texts = [product_text(product) for product in changed]
+        vectors = await self.service.embed_texts(texts)
+        self.index.upsert(
+            [product['id'] for product in changed],
+            [content_hash(text, self.service.model) for text in texts],
+            vectors
+        )
+        if not self.index.in_batch:
+            self._maybe_build_ivf()
+
+        logger.info(f"Indexed {len(changed)} product vectors (cost ${self.service.total_cost:.4f})")
+        return len(changed)
+
+    def _maybe_build_ivf(self):
+        """Build the IVF lists for large catalogs, rebuilding them once the
+        index has grown by ``ivf_rebuild_growth`` since the last build."""
+        if len(self.index) < self.ivf_threshold:
+            return
+        if self.index.ivf_rows and len(self.index) < self.index.ivf_rows * (1 + self.ivf_rebuild_growth):
+            return
+        self.index.build_ivf()
+
+    @contextmanager
+    def batch(self):
+        """Refresh many pages with a single index write (and IVF build) at the end."""
+        with self.index.batch():
+            yield self
+        self._maybe_build_ivf()
+
+    def similar_products(self, product_id, k: int = 10) -> List[Dict[str, Any]]:
+        """Return the products most similar to an indexed product."""
+        return [
+            {'product_id': match_id, 'similarity': round(score, 4)}
+            for match_id, score in self.index.similar_to(product_id, k)
+        ]
+
+    async def search_text(self, text: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Return the products most similar to free text (one cached embedding)."""
+        vector = await self.service.embed_text(text)
+        return [
+            {'product_id': match_id, 'similarity': round(score, 4)}
+            for match_id, score in self.index.search(vector, k)
+        ]
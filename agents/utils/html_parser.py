@@ -0,0 +1,219 @@
+"""HTML parsing service with pluggable fast backends and off-loop parsing."""
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # pragma: no cover - optional dependency
+    SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_LXML = False
+
+logger = logging.getLogger(__name__)
+
+# Pages smaller than this are parsed inline; the pickling round trip to a
+# worker process costs more than parsing them on the event loop.
+DEFAULT_OFFLOAD_THRESHOLD = 256 * 1024
+
+# Elements whose text is not page content; both backends drop them
+NON_TEXT_TAGS = ('head', 'script', 'style', 'noscript')
+
+
+def detect_backend() -> str:
+    """Return the fastest parser backend installed in this environment."""
+    if SelectolaxParser is not None:
+        return 'selectolax'
+    if HAS_LXML:
+        return 'lxml'
+    return 'html.parser'
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    """Build a BeautifulSoup tree using lxml when it is available."""
+    return BeautifulSoup(html, 'lxml' if HAS_LXML else 'html.parser')
+
+
+def _classify_links(hrefs: List[str], url: str) -> Dict[str, List[str]]:
+    """Split raw hrefs into internal and external absolute links."""
+    internal, external = [], []
+    netloc = urlparse(url).netloc
+
+    for href in hrefs:
+        if href.startswith('http'):
+            if urlparse(href).netloc == netloc:
+                internal.append(href)
+            else:
+                external.append(href)
+        elif href.startswith('/'):
+            internal.append(urljoin(url, href))
+
+    return {'internal_links': internal, 'external_links': external}
+
+
+def extract_page_summary(html: str, url: str, backend: Optional[str] = None) -> Dict[str, Any]:
+    """Extract the on-page SEO elements of a document as plain data.
+
+    The result only contains strings, numbers, lists and dicts so it can be
+    returned from a worker process and stored as JSON.
+    """
+    backend = backend or detect_backend()
+
+    if backend == 'selectolax' and SelectolaxParser is not None:
+        tree = SelectolaxParser(html)
+        title_node = tree.css_first('title')
+        meta_node = tree.css_first('meta[name="description"]')
+
+        summary = {
+            'title': title_node.text() if title_node else '',
+            'meta_description': (meta_node.attributes.get('content') or '') if meta_node else '',
+            'h1_tags': [node.text(strip=True) for node in tree.css('h1')],
+            'h2_tags': [node.text(strip=True) for node in tree.css('h2')],
+            'images': [
+                {'src': node.attributes.get('src') or '', 'alt': node.attributes.get('alt') or ''}
+                for node in tree.css('img')
+            ],
+            'has_nav': bool(tree.css_first('nav') or tree.css_first('header')),
+        }
+        hrefs = [node.attributes.get('href') or '' for node in tree.css('a[href]')]
+
+        tree.strip_tags(list(NON_TEXT_TAGS))
+        text = tree.root.text(separator=' ') if tree.root else ''
+    else:
+        soup = make_soup(html)
+        title_tag = soup.find('title')
+        meta_tag = soup.find('meta', attrs={'name': 'description'})
+
+        summary = {
+            'title': title_tag.get_text() if title_tag else '',
+            'meta_description': meta_tag.get('content', '') if meta_tag else '',
+            'h1_tags': [h1.get_text(strip=True) for h1 in soup.find_all('h1')],
+            'h2_tags': [h2.get_text(strip=True) for h2 in soup.find_all('h2')],
+            'images': [
+                {'src': img.get('src', ''), 'alt': img.get('alt', '')}
+                for img in soup.find_all('img')
+            ],
+            'has_nav': bool(soup.find('nav') or soup.find('header')),
+        }
+        hrefs = [link['href'] for link in soup.find_all('a', href=True)]
+
+        for tag in soup.find_all(NON_TEXT_TAGS):
+            tag.decompose()
+        text = soup.get_text(separator=' ')
+
+    summary.update(_classify_links(hrefs, url))
+    summary['link_count'] = len(hrefs)
+    summary['text'] = ' '.join(text.split())
+    summary['word_count'] = len(summary['text'].split())
+    return summary
+
+
+def extract_items(html: str, base_url: str, selectors: Dict[str, str],
+                  limit: int = 20, backend: Optional[str] = None) -> List[Dict[str, str]]:
+    """Extract listing items (news, products) matched by CSS selectors."""
+    backend = backend or detect_backend()
+    item_selector = selectors.get('news', '.item')
+    title_selector = selectors.get('title', 'h2')
+    content_selector = selectors.get('content', '.content')
+    items = []
+
+    if backend == 'selectolax' and SelectolaxParser is not None:
+        for node in SelectolaxParser(html).css(item_selector)[:limit]:
+            title_node = node.css_first(title_selector)
+            if not title_node:
+                continue
+            content_node = node.css_first(content_selector)
+            items.append({
+                'title': title_node.text(strip=True),
+                'description': content_node.text(strip=True) if content_node else '',
+                'url': urljoin(base_url, node.attributes.get('href') or ''),
+                'raw_content': node.html or ''
+            })
+    else:
+        for node in make_soup(html).select(item_selector)[:limit]:
+            title_elem = node.select_one(title_selector)
+            if not title_elem:
+                continue
+            content_elem = node.select_one(content_selector)
+            items.append({
+                'title': title_elem.get_text(strip=True),
+                'description': content_elem.get_text(strip=True) if content_elem else '',
+                'url': urljoin(base_url, node.get('href', '')),
+                'raw_content': str(node)
+            })
+
+    return items
+
+
+class HTMLParserService:
+    """Runs HTML extractors inline or in a process pool depending on page size.
+
+    Extractors must be module-level functions taking the HTML string as their
+    first argument and returning plain (picklable) data, never parse trees.
+    """
+
+    def __init__(self, offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+                 max_workers: Optional[int] = None):
+        self.backend = detect_backend()
+        self.offload_threshold = offload_threshold
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Lazily start the worker pool."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def parse(self, html: str, extractor: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``extractor(html, *args, **kwargs)`` without blocking the event loop."""
+        call = functools.partial(extractor, html, *args, **kwargs)
+
+        if len(html) < self.offload_threshold:
+            return call()
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_pool(), call)
+        except BrokenProcessPool:
+            logger.warning("HTML parser pool crashed, parsing inline")
+            self._pool = None
+            return call()
+
+    async def page_summary(self, html: str, url: str) -> Dict[str, Any]:
+        """Extract on-page SEO elements for a page."""
+        return await self.parse(html, extract_page_summary, url, self.backend)
+
+    async def items(self, html: str, base_url: str, selectors: Dict[str, str],
+                    limit: int = 20) -> List[Dict[str, str]]:
+        """Extract listing items matched by CSS selectors."""
+        return await self.parse(html, extract_items, base_url, selectors, limit, self.backend)
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+_shared_service: Optional[HTMLParserService] = None
+
+
+def get_parser_service() -> HTMLParserService:
+    """Return the process-wide parser service shared by all agents."""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = HTMLParserService()
+    return _shared_service
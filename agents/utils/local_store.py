@@ -0,0 +1,17 @@
+"""Location of on-disk state kept locally by agents (indexes, caches, histories)."""
+
+import os
+from pathlib import Path
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent.parent / '.agent_data'
+
+
+def data_path(filename: str) -> Path:
+    """Return the path of a local store file, creating its directory.
+
+    The directory defaults to ``.agent_data/`` at the project root and can be
+    moved with the ``HEMP_AGENT_DATA_DIR`` environment variable.
+    """
+    data_dir = Path(os.environ.get('HEMP_AGENT_DATA_DIR', DEFAULT_DATA_DIR))
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir / filename
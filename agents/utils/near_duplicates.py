@@ -0,0 +1,568 @@
+"""Near-duplicate detection: MinHash LSH for catalog records, SimHash for generated content."""
+
+import hashlib
+import logging
+import random
+import re
+import sqlite3
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .local_store import data_path
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+STOPWORDS = {
+    'a', 'an', 'and', 'the', 'of', 'for', 'with', 'from', 'in', 'on', 'by', 'to', 'or'
+}
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase, split on punctuation, drop stopwords and plural endings."""
+    tokens = []
+    for token in _TOKEN_RE.findall((text or '').lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def shingles(tokens: List[str], size: int = 3) -> Set[str]:
+    """Return the set of word shingles of the given size."""
+    if len(tokens) <= size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def _hash64(feature: str) -> int:
+    """Stable 64-bit hash of a feature string."""
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(features: Iterable[str], bits: int = 64) -> int:
+    """SimHash fingerprint of a feature set; similar sets differ in few bits."""
+    # Bit-sliced counters: counters[k] holds bit k of the per-position counts,
+    # so adding a hash is a ripple-carry over a few integers instead of 64 adds
+    counters: List[int] = []
+    total = 0
+    for feature in set(features):
+        carry = _hash64(feature)
+        total += 1
+        level = 0
+        while carry:
+            if level == len(counters):
+                counters.append(0)
+            counters[level], carry = counters[level] ^ carry, counters[level] & carry
+            level += 1
+
+    fingerprint = 0
+    for bit in range(bits):
+        count = sum(((counter >> bit) & 1) << level for level, counter in enumerate(counters))
+        if 2 * count > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count('1')
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Exact Jaccard similarity of two sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures from feature sets."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Iterable[str]) -> Tuple[int, ...]:
+        """Return the MinHash signature of a feature set."""
+        hashes = [_hash64(feature) for feature in set(features)]
+        if not hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.permutations
+        )
+
+    @staticmethod
+    def estimate(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimate Jaccard similarity from two signatures."""
+        if not sig_a or not sig_b:
+            return 0.0
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class ProductDedupIndex:
+    """Incremental near-duplicate index over product names and descriptions.
+
+    Names are indexed with MinHash LSH over normalized tokens, so variants such
+    as "Hemp Seed Milk" and "Hemp-Seed Milk Beverage" land in the same bucket.
+    Candidates are verified with exact name-token Jaccard, boosted by the
+    estimated similarity of their description shingles. Entries are persisted
+    to a local SQLite file and kept in memory for sub-millisecond lookups.
+
+    Entries may carry a ``group`` (the product's ``plant_part_id``); a lookup
+    with a group only matches entries of that group, the same scope as the
+    exact-name checks, so one name may exist once per plant part.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, threshold: float = 0.7,
+                 num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.path = Path(path) if path else data_path('product_dedup.sqlite')
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+
+        self._entries: Dict[str, Dict] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = defaultdict(set)
+
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                name_sig BLOB NOT NULL,
+                desc_sig BLOB,
+                group_key TEXT
+            )"""
+        )
+        columns = {row[1] for row in self._db.execute('PRAGMA table_info(entries)')}
+        if 'group_key' not in columns:
+            # Entries from before groups are reseeded from the catalog
+            self._db.execute('ALTER TABLE entries ADD COLUMN group_key TEXT')
+            self._db.execute('DELETE FROM entries')
+            self._db.commit()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self._entries
+
+    def _load(self):
+        """Load persisted entries into memory."""
+        for key, name, name_sig, desc_sig, group in self._db.execute(
+            'SELECT key, name, name_sig, desc_sig, group_key FROM entries'
+        ):
+            self._index_entry(key, name, self._unpack(name_sig), self._unpack(desc_sig), group)
+
+        logger.info(f"Loaded {len(self._entries)} entries into near-duplicate index")
+
+    @staticmethod
+    def _pack(signature: Optional[Tuple[int, ...]]) -> Optional[bytes]:
+        return array('Q', signature).tobytes() if signature else None
+
+    @staticmethod
+    def _unpack(blob: Optional[bytes]) -> Optional[Tuple[int, ...]]:
+        if not blob:
+            return None
+        values = array('Q')
+        values.frombytes(blob)
+        return tuple(values)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def _features(self, name: str, description: str) -> Tuple[Set[str], Tuple[int, ...], Optional[Tuple[int, ...]]]:
+        tokens = set(normalize_tokens(name))
+        desc_tokens = normalize_tokens(description)[:200]
+        desc_sig = self.hasher.signature(shingles(desc_tokens)) if desc_tokens else None
+        return tokens, self.hasher.signature(tokens), desc_sig
+
+    def _index_entry(self, key: str, name: str, name_sig: Tuple[int, ...],
+                     desc_sig: Optional[Tuple[int, ...]], group: Optional[str] = None):
+        if key in self._entries:
+            self._unindex_entry(key)
+
+        self._entries[key] = {
+            'name': name,
+            'tokens': set(normalize_tokens(name)),
+            'name_sig': name_sig,
+            'desc_sig': desc_sig,
+            'group': group
+        }
+        for band_key in self._band_keys(name_sig):
+            self._buckets[band_key].add(key)
+
+    def _unindex_entry(self, key: str):
+        entry = self._entries.pop(key)
+        for band_key in self._band_keys(entry['name_sig']):
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _similarity(self, tokens: Set[str], desc_sig: Optional[Tuple[int, ...]], entry: Dict) -> float:
+        name_similarity = jaccard(tokens, entry['tokens'])
+        if desc_sig and entry['desc_sig']:
+            desc_similarity = MinHasher.estimate(desc_sig, entry['desc_sig'])
+            return max(name_similarity, 0.6 * name_similarity + 0.4 * desc_similarity)
+        return name_similarity
+
+    def _candidates(self, name_sig: Tuple[int, ...]) -> Set[str]:
+        candidates = set()
+        for band_key in self._band_keys(name_sig):
+            candidates |= self._buckets.get(band_key, set())
+        return candidates
+
+    def query(self, name: str, description: str = '', limit: int = 5,
+              exclude_key=None, group=None) -> List[Dict]:
+        """Return indexed entries similar to the given name/description.
+
+        With ``group`` only entries of that group are considered.
+        """
+        tokens, name_sig, desc_sig = self._features(name, description)
+        exclude = str(exclude_key) if exclude_key is not None else None
+        group = str(group) if group is not None else None
+        matches = []
+
+        for key in self._candidates(name_sig):
+            if key == exclude:
+                continue
+            entry = self._entries[key]
+            if group is not None and entry['group'] != group:
+                continue
+            similarity = self._similarity(tokens, desc_sig, entry)
+            if similarity >= self.threshold:
+                matches.append({'key': key, 'name': entry['name'], 'similarity': round(similarity, 3)})
+
+        matches.sort(key=lambda m: m['similarity'], reverse=True)
+        return matches[:limit]
+
+    def find_duplicate(self, name: str, description: str = '', group=None) -> Optional[Dict]:
+        """Return the closest near-duplicate (within ``group`` if given), if any."""
+        matches = self.query(name, description, limit=1, group=group)
+        return matches[0] if matches else None
+
+    def add(self, key, name: str, description: str = '', commit: bool = True, group=None):
+        """Add or replace an entry."""
+        key = str(key)
+        group = str(group) if group is not None else None
+        _, name_sig, desc_sig = self._features(name, description)
+        self._index_entry(key, name, name_sig, desc_sig, group)
+        self._db.execute(
+            'INSERT OR REPLACE INTO entries (key, name, name_sig, desc_sig, group_key) VALUES (?, ?, ?, ?, ?)',
+            (key, name, self._pack(name_sig), self._pack(desc_sig), group)
+        )
+        if commit:
+            self._db.commit()
+
+    def add_many(self, records: Iterable[Dict], key_field: str = 'id',
+                 name_field: str = 'name', description_field: str = 'description',
+                 group_field: str = 'plant_part_id') -> int:
+        """Bulk-load records (e.g. ``uses_products`` rows) with a single commit."""
+        count = 0
+        for record in records:
+            if record.get(key_field) is None or not record.get(name_field):
+                continue
+            self.add(record[key_field], record[name_field],
+                     record.get(description_field) or '', commit=False,
+                     group=record.get(group_field))
+            count += 1
+        self._db.commit()
+        return count
+
+    def remove(self, key):
+        """Remove an entry."""
+        key = str(key)
+        if key in self._entries:
+            self._unindex_entry(key)
+            self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self._db.commit()
+
+    def clusters(self, min_size: int = 2) -> List[List[Dict]]:
+        """Group all indexed entries into near-duplicate clusters."""
+        parent = {key: key for key in self._entries}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        checked = set()
+        for bucket in self._buckets.values():
+            if len(bucket) < 2:
+                continue
+            members = sorted(bucket)
+            for i, key_a in enumerate(members):
+                entry_a = self._entries[key_a]
+                for key_b in members[i + 1:]:
+                    pair = (key_a, key_b)
+                    if pair in checked:
+                        continue
+                    checked.add(pair)
+                    if find(key_a) == find(key_b):
+                        continue
+                    if entry_a['group'] != self._entries[key_b]['group']:
+                        continue
+                    if self._similarity(entry_a['tokens'], entry_a['desc_sig'],
+                                        self._entries[key_b]) >= self.threshold:
+                        parent[find(key_b)] = find(key_a)
+
+        groups = defaultdict(list)
+        for key in self._entries:
+            groups[find(key)].append({'key': key, 'name': self._entries[key]['name']})
+
+        return sorted(
+            (group for group in groups.values() if len(group) >= min_size),
+            key=len, reverse=True
+        )
+
+    def close(self):
+        """Close the backing store."""
+        self._db.close()
+
+
+class ContentDedupIndex:
+    """Near-duplicate index over generated content using 64-bit SimHash.
+
+    Content is fingerprinted from word shingles, and two texts are
+    near-duplicates when their fingerprints differ in at most
+    ``max_distance`` bits. The fingerprint is split into
+    ``max_distance + 1`` blocks; by the pigeonhole principle any match
+    shares at least one block exactly, so a lookup only compares against
+    the few entries in those block buckets. Fingerprints are persisted to a
+    local SQLite file and kept in memory.
+    """
+
+    BITS = 64
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, max_distance: int = 6,
+                 shingle_size: int = 2):
+        self.path = Path(path) if path else data_path('content_dedup.sqlite')
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+        self.blocks = max_distance + 1
+        # (shift, mask) per block; widths differ by at most one bit (9 x 6 + 10
+        # for 7 blocks) so no block is narrow enough to crowd its buckets
+        width, wider = divmod(self.BITS, self.blocks)
+        widths = [width] * (self.blocks - wider) + [width + 1] * wider
+        self._block_spans = [
+            (sum(widths[:block]), (1 << widths[block]) - 1) for block in range(self.blocks)
+        ]
+
+        self._fingerprints: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS fingerprints (
+                key TEXT PRIMARY KEY,
+                fingerprint BLOB NOT NULL
+            )"""
+        )
+        for key, blob in self._db.execute('SELECT key, fingerprint FROM fingerprints'):
+            self._index(key, int.from_bytes(blob, 'big'))
+
+        logger.info(f"Loaded {len(self._fingerprints)} content fingerprints")
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self._fingerprints
+
+    def fingerprint(self, text: str) -> int:
+        """SimHash of the text's normalized word shingles."""
+        return simhash(shingles(normalize_tokens(text), self.shingle_size), self.BITS)
+
+    def similarity(self, a: int, b: int) -> float:
+        """Share of identical bits between two fingerprints."""
+        return 1 - hamming(a, b) / self.BITS
+
+    def _block_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        return [
+            (block, (fingerprint >> shift) & mask)
+            for block, (shift, mask) in enumerate(self._block_spans)
+        ]
+
+    def _index(self, key: str, fingerprint: int):
+        if key in self._fingerprints:
+            self._unindex(key)
+        self._fingerprints[key] = fingerprint
+        for block_key in self._block_keys(fingerprint):
+            self._buckets[block_key].add(key)
+
+    def _unindex(self, key: str):
+        fingerprint = self._fingerprints.pop(key)
+        for block_key in self._block_keys(fingerprint):
+            bucket = self._buckets.get(block_key)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[block_key]
+
+    def query(self, text: Optional[str] = None, limit: int = 5, exclude_key=None,
+              fingerprint: Optional[int] = None) -> List[Dict]:
+        """Return indexed entries within ``max_distance`` bits of the text."""
+        if fingerprint is None:
+            fingerprint = self.fingerprint(text or '')
+        exclude = str(exclude_key) if exclude_key is not None else None
+        matches = []
+
+        candidates = set()
+        for block_key in self._block_keys(fingerprint):
+            candidates |= self._buckets.get(block_key, set())
+        for key in candidates:
+            if key == exclude:
+                continue
+            distance = hamming(fingerprint, self._fingerprints[key])
+            if distance <= self.max_distance:
+                matches.append({'key': key, 'distance': distance,
+                                'similarity': round(1 - distance / self.BITS, 3)})
+
+        matches.sort(key=lambda m: m['distance'])
+        return matches[:limit]
+
+    def find_duplicate(self, text: str) -> Optional[Dict]:
+        """Return the closest near-duplicate, if any."""
+        matches = self.query(text, limit=1)
+        return matches[0] if matches else None
+
+    def add(self, key, text: Optional[str] = None, commit: bool = True,
+            fingerprint: Optional[int] = None):
+        """Add or replace an entry."""
+        key = str(key)
+        if fingerprint is None:
+            fingerprint = self.fingerprint(text or '')
+        self._index(key, fingerprint)
+        self._db.execute(
+            'INSERT OR REPLACE INTO fingerprints (key, fingerprint) VALUES (?, ?)',
+            (key, fingerprint.to_bytes(8, 'big'))
+        )
+        if commit:
+            self._db.commit()
+
+    def add_many(self, records: Iterable[Dict], key_field: str = 'id',
+                 content_field: str = 'content') -> int:
+        """Bulk-load records (e.g. ``agent_generated_content`` rows) with a single commit."""
+        count = 0
+        for record in records:
+            if record.get(key_field) is None or not record.get(content_field):
+                continue
+            self.add(record[key_field], record[content_field], commit=False)
+            count += 1
+        self._db.commit()
+        return count
+
+    def remove(self, key):
+        """Remove an entry."""
+        key = str(key)
+        if key in self._fingerprints:
+            self._unindex(key)
+            self._db.execute('DELETE FROM fingerprints WHERE key = ?', (key,))
+            self._db.commit()
+
+    def clusters(self, min_size: int = 2) -> List[List[Dict]]:
+        """Group all indexed entries into near-duplicate clusters."""
+        parent = {key: key for key in self._fingerprints}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for bucket in self._buckets.values():
+            if len(bucket) < 2:
+                continue
+            members = sorted(bucket)
+            for i, key_a in enumerate(members):
+                fingerprint_a = self._fingerprints[key_a]
+                for key_b in members[i + 1:]:
+                    if find(key_a) == find(key_b):
+                        continue
+                    if hamming(fingerprint_a, self._fingerprints[key_b]) <= self.max_distance:
+                        parent[find(key_b)] = find(key_a)
+
+        groups = defaultdict(list)
+        for key in self._fingerprints:
+            groups[find(key)].append({'key': key})
+
+        return sorted(
+            (group for group in groups.values() if len(group) >= min_size),
+            key=len, reverse=True
+        )
+
+    def close(self):
+        """Close the backing store."""
+        self._db.close()
+
+
+def _catalog_page(supabase, offset: int, page_size: int):
+    """Query for one page of ``uses_products`` in a stable order."""
+    return supabase.table('uses_products')\
+        .select('id, name, description, plant_part_id')\
+        .order('id')\
+        .range(offset, offset + page_size - 1)
+
+
+def load_product_index(supabase, page_size: int = 1000, **kwargs) -> ProductDedupIndex:
+    """Open the product index, seeding it from ``uses_products`` when empty.
+
+    For synchronous Supabase clients (scripts); async agents use
+    :func:`aload_product_index`.
+    """
+    index = ProductDedupIndex(**kwargs)
+    if len(index):
+        return index
+
+    offset = 0
+    while True:
+        rows = _catalog_page(supabase, offset, page_size).execute().data or []
+        index.add_many(rows)
+        if len(rows) < page_size:
+            break
+        offset += page_size
+
+    logger.info(f"Seeded near-duplicate index with {len(index)} products")
+    return index
+
+
+async def aload_product_index(supabase, page_size: int = 1000, **kwargs) -> ProductDedupIndex:
+    """:func:`load_product_index` for async Supabase clients."""
+    index = ProductDedupIndex(**kwargs)
+    if len(index):
+        return index
+
+    offset = 0
+    while True:
+        rows = (await _catalog_page(supabase, offset, page_size).execute()).data or []
+        index.add_many(rows)
+        if len(rows) < page_size:
+            break
+        offset += page_size
+
+    logger.info(f"Seeded near-duplicate index with {len(index)} products")
+    return index
@@ -0,0 +1,187 @@
+"""Token-budgeted assembly of the data sections embedded in AI prompts."""
+
+import html
+import json
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Dict, List
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Token budgets for the data embedded in each kind of prompt; the fixed
+# instructions around it are not counted.
+PROMPT_BUDGETS = {
+    'structure_product': 600,
+    'blog_generation': 500,
+    'compliance_summary': 2500,
+}
+
+# Rough characters per token for English text when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+BOILERPLATE_RE = re.compile(
+    r'<(script|style|noscript|svg|nav|header|footer|aside|form|iframe)\b[^>]*>.*?</\1\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+BLOCK_TAG_RE = re.compile(r'<\s*(?:br|/p|/div|/li|/h[1-6]|/tr)\b[^>]*>', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+SPACES_RE = re.compile(r'[ \t\r\f\v]+')
+NEWLINES_RE = re.compile(r'\s*\n\s*')
+SPACE_BEFORE_PUNCT_RE = re.compile(r' +([.,;:!?])')
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding('cl100k_base')
+    except Exception as e:  # pragma: no cover - encoding files unavailable offline
+        logger.warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count of ``text``: exact with tiktoken, otherwise a length estimate."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` to at most ``max_tokens``, at a word boundary where possible."""
+    if max_tokens <= 0:
+        return ''
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    encoding = _encoding()
+    if encoding is not None:
+        cut = encoding.decode(encoding.encode(text)[:max_tokens - 1])
+    else:
+        cut = text[:(max_tokens - 1) * CHARS_PER_TOKEN]
+    space = cut.rfind(' ')
+    if space > len(cut) // 2:
+        cut = cut[:space]
+    return cut.rstrip() + '…'
+
+
+def strip_html(markup: str) -> str:
+    """Visible text of an HTML fragment without scripts, navigation or markup."""
+    if not markup or '<' not in markup:
+        return (markup or '').strip()
+    text = COMMENT_RE.sub(' ', markup)
+    text = BOILERPLATE_RE.sub(' ', text)
+    text = BLOCK_TAG_RE.sub('\n', text)
+    text = html.unescape(TAG_RE.sub(' ', text))
+    text = SPACE_BEFORE_PUNCT_RE.sub(r'\1', SPACES_RE.sub(' ', text))
+    return NEWLINES_RE.sub('\n', text).strip()
+
+
+def compact(value: Any) -> Any:
+    """Drop None, empty strings and empty containers at every level."""
+    if isinstance(value, dict):
+        items = ((key, compact(item)) for key, item in value.items())
+        return {key: item for key, item in items if item not in (None, '', [], {})}
+    if isinstance(value, (list, tuple)):
+        items = (compact(item) for item in value)
+        return [item for item in items if item not in (None, '', [], {})]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def compact_json(value: Any) -> str:
+    """Minified JSON of ``value`` with empty fields removed."""
+    return json.dumps(compact(value), separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def _render(value: Any) -> str:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value):
+        return ', '.join(item.strip() for item in value if item and item.strip())
+    if isinstance(value, (dict, list, tuple)):
+        return compact_json(value)
+    return '' if value is None else str(value)
+
+
+def _fit_list(items: List[Any], max_tokens: int) -> str:
+    """Leading items of a list that fit in ``max_tokens``, rendered like ``_render``."""
+    kept: List[Any] = []
+    used = 1
+    for item in items:
+        # One extra token per item for the separator
+        used += count_tokens(_render(item)) + 1
+        if used > max_tokens:
+            break
+        kept.append(item)
+    return _render(kept) if kept else ''
+
+
+class PromptBuilder:
+    """Collects prompt data fields and fits them into a token budget.
+
+    Fields are rendered compactly (strings stripped, string lists joined,
+    everything else as minified JSON without empty values) and admitted
+    in priority order, lowest number first. A field that does not fit is
+    shortened to the remaining budget - lists by dropping trailing items,
+    text at a word boundary - or left out when less than ``min_tokens``
+    would remain. ``build`` returns every added name, in the order added,
+    with an empty string for fields that were empty or left out.
+    """
+
+    def __init__(self, budget: int, min_tokens: int = 24):
+        self.budget = budget
+        self.min_tokens = min_tokens
+        self._fields: List[Dict[str, Any]] = []
+
+    @classmethod
+    def for_purpose(cls, purpose: str, **kwargs) -> 'PromptBuilder':
+        return cls(PROMPT_BUDGETS[purpose], **kwargs)
+
+    def add(self, name: str, value: Any, priority: int = 0, html_content: bool = False) -> 'PromptBuilder':
+        if html_content and isinstance(value, str):
+            value = strip_html(value)
+        self._fields.append({'name': name, 'value': compact(value), 'priority': priority})
+        return self
+
+    def build(self) -> Dict[str, str]:
+        remaining = self.budget
+        fitted: Dict[str, str] = {}
+        dropped = []
+
+        for field in sorted(self._fields, key=lambda f: f['priority']):
+            value = field['value']
+            text = _render(value)
+            if not text:
+                continue
+            tokens = count_tokens(text)
+            if tokens > remaining:
+                if remaining < self.min_tokens:
+                    dropped.append(field['name'])
+                    continue
+                if isinstance(value, (list, tuple)):
+                    text = _fit_list(list(value), remaining)
+                else:
+                    text = truncate_to_tokens(text, remaining)
+                if not text:
+                    dropped.append(field['name'])
+                    continue
+                tokens = count_tokens(text)
+            fitted[field['name']] = text
+            remaining = max(0, remaining - tokens)
+
+        if dropped:
+            logger.debug(f"Prompt budget of {self.budget} tokens dropped fields: {', '.join(dropped)}")
+        return {field['name']: fitted.get(field['name'], '') for field in self._fields}
@@ -0,0 +1,180 @@
+"""Process-wide registry of compiled prompt templates loaded from ``config/prompts``."""
+
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+from string import Formatter
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROMPTS_DIR = Path(__file__).parent.parent.parent / 'config' / 'prompts'
+
+
+class PromptTemplateError(ValueError):
+    """Raised when a prompt template is malformed or rendered without its values."""
+
+
+class PromptTemplate:
+    """A prompt string parsed once into literal and placeholder segments.
+
+    Placeholders use ``str.format`` syntax (``{product_name}``, ``{{`` for a
+    literal brace) and must be plain names. Rendering joins the
+    pre-parsed segments, so no format string is re-parsed per call.
+    """
+
+    __slots__ = ('name', 'source', 'version', 'placeholders', '_segments')
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        self.version = hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+
+        segments: List[Tuple[str, Optional[str], str]] = []
+        try:
+            for literal, field, spec, conversion in Formatter().parse(source):
+                if field is not None:
+                    if not field.isidentifier():
+                        raise PromptTemplateError(f"Prompt {name}: unsupported placeholder {{{field}}}")
+                    if conversion:
+                        raise PromptTemplateError(f"Prompt {name}: conversions are not supported in {{{field}}}")
+                segments.append((literal, field, spec or ''))
+        except ValueError as e:
+            if isinstance(e, PromptTemplateError):
+                raise
+            raise PromptTemplateError(f"Prompt {name}: {e}") from e
+
+        self._segments = tuple(segments)
+        self.placeholders: FrozenSet[str] = frozenset(field for _, field, _ in segments if field)
+
+    def render(self, **values: Any) -> str:
+        """Fill the placeholders; extra values are ignored, missing ones raise."""
+        missing = self.placeholders.difference(values)
+        if missing:
+            raise PromptTemplateError(f"Prompt {self.name} is missing values for: {', '.join(sorted(missing))}")
+        parts = []
+        for literal, field, spec in self._segments:
+            parts.append(literal)
+            if field:
+                value = values[field]
+                parts.append(format(value, spec) if spec else str(value))
+        return ''.join(parts)
+
+    def __str__(self) -> str:
+        return self.source
+
+
+class PromptRegistry:
+    """Loads every YAML file in a prompts directory once and compiles its strings.
+
+    Templates are addressed by dotted path: ``content.blog_post_generation.user``
+    is the ``user`` string of ``blog_post_generation`` in
+    ``content_prompts.yaml``. Files are checked for changes at most every
+    ``reload_interval`` seconds and recompiled when their mtime moves; a
+    file that fails to parse keeps its previous templates.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, reload_interval: float = 2.0):
+        self.directory = Path(directory) if directory else DEFAULT_PROMPTS_DIR
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._files: Dict[str, float] = {}
+        self._raw: Dict[str, Dict[str, Any]] = {}
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._checked_at = 0.0
+        self.reload()
+
+    @staticmethod
+    def namespace(path: Path) -> str:
+        """``content_prompts.yaml`` -> ``content``."""
+        stem = path.stem
+        return stem[:-len('_prompts')] if stem.endswith('_prompts') else stem
+
+    def _compile(self, prefix: str, node: Any, templates: Dict[str, PromptTemplate]):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                self._compile(f"{prefix}.{key}", value, templates)
+        elif isinstance(node, str):
+            templates[prefix] = PromptTemplate(prefix, node)
+
+    def _load_file(self, path: Path):
+        namespace = self.namespace(path)
+        try:
+            with open(path, 'r') as f:
+                raw = yaml.safe_load(f) or {}
+            templates: Dict[str, PromptTemplate] = {}
+            self._compile(namespace, raw, templates)
+        except (OSError, yaml.YAMLError, PromptTemplateError) as e:
+            logger.error(f"Keeping previous prompts for {path.name}: {e}")
+            return
+
+        stale = [name for name in self._templates if name.startswith(f"{namespace}.")]
+        for name in stale:
+            del self._templates[name]
+        self._templates.update(templates)
+        self._raw[namespace] = raw
+        logger.info(f"Loaded {len(templates)} prompt templates from {path.name}")
+
+    def reload(self, force: bool = False):
+        """Recompile files whose modification time changed (all files with ``force``)."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            paths = sorted(self.directory.glob('*.yaml')) if self.directory.exists() else []
+            for path in paths:
+                try:
+                    mtime = path.stat().st_mtime
+                except OSError:
+                    continue
+                if force or self._files.get(path.name) != mtime:
+                    self._files[path.name] = mtime
+                    self._load_file(path)
+
+    def _maybe_reload(self):
+        if time.monotonic() - self._checked_at >= self.reload_interval:
+            self.reload()
+
+    def get(self, name: str) -> PromptTemplate:
+        self._maybe_reload()
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise KeyError(f"Unknown prompt template: {name}") from None
+
+    def has(self, name: str) -> bool:
+        self._maybe_reload()
+        return name in self._templates
+
+    def render(self, name: str, **values: Any) -> str:
+        return self.get(name).render(**values)
+
+    def section(self, namespace: str) -> Dict[str, Any]:
+        """The parsed YAML of one file, as plain nested dicts and strings."""
+        self._maybe_reload()
+        return self._raw.get(namespace, {})
+
+    def version(self, prefix: str = '') -> str:
+        """Combined version hash of every template under a dotted prefix."""
+        self._maybe_reload()
+        digest = hashlib.sha256()
+        for name in sorted(self._templates):
+            if not prefix or name == prefix or name.startswith(f"{prefix}."):
+                digest.update(f"{name}:{self._templates[name].version};".encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """The registry shared by every agent in this process."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PromptRegistry()
+    return _registry
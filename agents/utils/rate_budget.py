@@ -0,0 +1,48 @@
+"""Concurrency and calls-per-window budget for fan-out of async API calls."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Iterable, List
+
+
+class RateBudget:
+    """Caps how many calls run at once and how many start per time window.
+
+    Create one per batch run; calls beyond the window budget wait until the
+    oldest call in the window ages out.
+    """
+
+    def __init__(self, max_concurrency: int = 5, max_calls: int = 30, window_seconds: float = 60.0):
+        self.max_calls = max_calls
+        self.window_seconds = window_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._started: deque = deque()
+
+    async def _wait_for_window(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._started and now - self._started[0] >= self.window_seconds:
+                    self._started.popleft()
+                if len(self._started) < self.max_calls:
+                    self._started.append(now)
+                    return
+                await asyncio.sleep(self.window_seconds - (now - self._started[0]))
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one call slot within the budget."""
+        async with self._semaphore:
+            await self._wait_for_window()
+            yield
+
+    async def map(self, func: Callable[[Any], Awaitable[Any]], items: Iterable[Any]) -> List[Any]:
+        """Run ``func`` over ``items`` within the budget, preserving order."""
+        async def run(item):
+            async with self.slot():
+                return await func(item)
+
+        return await asyncio.gather(*(run(item) for item in items))
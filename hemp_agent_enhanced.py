@@ -13,6 +13,8 @@ from openai import OpenAI
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from agents.utils.near_duplicates import load_product_index
+
 # Load environment variables
 load_dotenv()
 
@@ -33,6 +35,9 @@ class EnhancedHempResearchAgent:
         self.industry_id = None
         self.industry_sub_category_id = None
         
+        # Near-duplicate index over existing products (optional)
+        self.dedup_index = load_product_index(self.supabase)
+        
         print(f"🌿 Initialized Enhanced {plant_part} - {industry} agent")
     
     def get_or_create_plant_part(self):
@@ -221,7 +226,16 @@ class EnhancedHempResearchAgent:
                 # Check if product exists in uses_products table
                 product_result = self.supabase.table('uses_products').select('id').eq('name', product['product_name']).eq('plant_part_id', self.plant_part_id).execute()
                 
+                # Check for near-duplicates of this plant part with slightly different names
+                duplicate = None
                 if not product_result.data:
+                    duplicate = self.dedup_index.find_duplicate(
+                        product['product_name'], product.get('description', ''), group=self.plant_part_id
+                    )
+                
+                if duplicate:
+                    print(f"  ℹ️  Product is a near-duplicate of {duplicate['name']}: {product['product_name']}")
+                elif not product_result.data:
                     # Create product in main uses_products table
                     product_data = {
                         'name': product['product_name'],
@@ -244,6 +258,9 @@ class EnhancedHempResearchAgent:
                     product_id = product_result.data[0]['id']
                     print(f"  ✅ New product: {product['product_name']}")
                     
+                    self.dedup_index.add(product_id, product['product_name'], product['description'],
+                                         group=self.plant_part_id)
+                    
                     # Create product-company relationship
                     self.supabase.table('product_companies').insert({
                         'use_product_id': product_id,
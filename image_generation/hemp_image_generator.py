@@ -6,6 +6,7 @@ This script manages the image generation queue and processes products
 that need images using various providers (placeholder, AI services, etc.)
 """
 
+import asyncio
 import os
 import sys
 import json
@@ -13,8 +14,10 @@ import time
 import logging
 import requests
 import base64
+import socket
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -36,6 +39,14 @@ PROVIDERS = {
     'midjourney': 'Midjourney (Coming Soon)'
 }
 
+# Generation requests a worker keeps in flight per provider
+PROVIDER_CONCURRENCY = {
+    'placeholder': 20,
+    'stable_diffusion': 4,
+    'dall_e': 3,
+    'midjourney': 1
+}
+
 class HempImageGenerator:
     """Manages automated image generation for hemp products"""
     
@@ -54,6 +65,14 @@ class HempImageGenerator:
         self.stability_key = os.getenv('STABILITY_API_KEY')
         self.openai_key = os.getenv('OPENAI_API_KEY')
         
+        # Cost per image by provider, read once from ai_provider_config
+        self._provider_costs: Dict[str, float] = {}
+        
+        # Identifies this process's claims on queue items; a claim not finished
+        # within the lease is returned to the queue by the database
+        self.worker_id = f"py-{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = int(os.getenv('IMAGE_QUEUE_LEASE_SECONDS', '600'))
+        
     def get_queue_stats(self) -> Dict:
         """Get current queue statistics"""
         try:
@@ -138,7 +157,7 @@ class HempImageGenerator:
                 # Check if already in queue
                 existing = self.supabase.table('image_generation_queue').select(
                     'id'
-                ).eq('product_id', product['id']).in_('status', ['pending', 'processing']).execute()
+                ).eq('product_id', product['id']).in_('status', ['pending', 'retry', 'processing']).execute()
                 
                 if not existing.data:
                     # Add to queue using direct insert instead of RPC
@@ -232,167 +251,100 @@ class HempImageGenerator:
             logger.error(f"Error uploading to storage: {e}")
             raise
     
-    def process_queue(self, batch_size: int = 10) -> Dict:
-        """Process the image generation queue using actual AI APIs"""
-        logger.info(f"Processing queue with batch size {batch_size}...")
-        
-        result = {
-            'processed_count': 0,
-            'success_count': 0,
-            'failed_count': 0,
-            'retry_count': 0
-        }
+    def claim_queue_items(self, limit: int) -> List[Dict]:
+        """Atomically claim up to ``limit`` pending or retry items for this worker
         
+        Items are locked with SKIP LOCKED and marked processing in one
+        statement, so concurrent workers never receive the same item.
+        Stale claims of dead workers are reaped by the same call.
+        """
         try:
-            # Get pending items from queue - fetch with joins properly
-            response = self.supabase.table('image_generation_queue').select(
-                '*, uses_products!inner(name, plant_parts!inner(name))'
-            ).in_('status', ['pending', 'retry']).order('priority', desc=True).order('created_at').limit(batch_size).execute()
-            
-            queue_items = response.data if response.data else []
-            
-            if not queue_items:
-                logger.info("No pending items in queue")
-                return result
-            
-            # Select provider for this batch
-            provider = self.select_best_provider()
-            logger.info(f"Using provider: {provider}")
-            
-            for item in queue_items:
-                start_time = time.time()
-                
-                try:
-                    # Update status to processing
-                    self.supabase.table('image_generation_queue').update({
-                        'status': 'processing',
-                        'updated_at': datetime.now().isoformat()
-                    }).eq('id', item['id']).execute()
-                    
-                    # Generate image based on provider
-                    image_url = None
-                    actual_provider = provider
-                    
-                    logger.info(f"Generating image for product {item['product_id']}: {item['uses_products']['name']}")
-                    
-                    try:
-                        if provider == 'stable_diffusion' and self.stability_key:
-                            logger.info("Using Stable Diffusion API...")
-                            image_url = self.generate_image_stable_diffusion(
-                                item['prompt'],
-                                item.get('negative_prompt')
-                            )
-                        elif provider == 'dall_e' and self.openai_key:
-                            logger.info("Using DALL-E API...")
-                            image_url = self.generate_image_dall_e(item['prompt'])
-                        else:
-                            logger.info("Using placeholder generator...")
-                            image_url = self.generate_placeholder_url(
-                                item['uses_products']['name'],
-                                item['uses_products']['plant_parts']['name']
-                            )
-                            actual_provider = 'placeholder'
-                    except Exception as api_error:
-                        logger.error(f"API error: {api_error}")
-                        # Fallback to placeholder
-                        image_url = self.generate_placeholder_url(
-                            item['uses_products']['name'],
-                            item['uses_products']['plant_parts']['name']
-                        )
-                        actual_provider = 'placeholder'
-                    
-                    if image_url:
-                        logger.info(f"Generated image URL: {image_url}")
-                        
-                        # Update product with image
-                        self.supabase.table('uses_products').update({
-                            'image_url': image_url,
-                            'updated_at': datetime.now().isoformat()
-                        }).eq('id', item['product_id']).execute()
-                        
-                        # Update queue status
-                        self.supabase.table('image_generation_queue').update({
-                            'status': 'completed',
-                            'generated_image_url': image_url,
-                            'generation_provider': actual_provider,
-                            'completed_at': datetime.now().isoformat(),
-                            'updated_at': datetime.now().isoformat()
-                        }).eq('id', item['id']).execute()
-                        
-                        # Log to history
-                        self.supabase.table('image_generation_history').insert({
-                            'queue_id': item['id'],
-                            'product_id': item['product_id'],
-                            'action': 'completed',
-                            'details': {
-                                'image_url': image_url,
-                                'provider': actual_provider,
-                                'generation_time_ms': int((time.time() - start_time) * 1000)
-                            }
-                        }).execute()
-                        
-                        # Log cost if not placeholder
-                        if actual_provider != 'placeholder':
-                            self._log_generation_cost(
-                                actual_provider,
-                                item['product_id'],
-                                item['id'],
-                                int((time.time() - start_time) * 1000),
-                                True
-                            )
-                        
-                        result['success_count'] += 1
-                    else:
-                        raise Exception("Failed to generate image")
-                        
-                except Exception as e:
-                    logger.error(f"Error processing item {item['id']}: {e}")
-                    
-                    # Update queue status to failed
-                    self.supabase.table('image_generation_queue').update({
-                        'status': 'failed',
-                        'error_message': str(e),
-                        'attempt_count': item.get('attempt_count', 0) + 1,
-                        'updated_at': datetime.now().isoformat()
-                    }).eq('id', item['id']).execute()
-                    
-                    # Log to history
-                    self.supabase.table('image_generation_history').insert({
-                        'queue_id': item['id'],
-                        'product_id': item['product_id'],
-                        'action': 'failed',
-                        'details': {
-                            'error': str(e),
-                            'provider': provider,
-                            'attempt': item.get('attempt_count', 0) + 1
-                        }
-                    }).execute()
-                    
-                    # Log failed cost
-                    self._log_generation_cost(
-                        provider,
-                        item['product_id'],
-                        item['id'],
-                        int((time.time() - start_time) * 1000),
-                        False,
-                        str(e)
-                    )
-                    
-                    result['failed_count'] += 1
-                
-                result['processed_count'] += 1
-            
-            logger.info(
-                f"Processed {result['processed_count']} items: "
-                f"{result['success_count']} success, "
-                f"{result['failed_count']} failed"
-            )
+            response = self.supabase.rpc('claim_image_generation_items', {
+                'p_worker_id': self.worker_id,
+                'p_limit': limit,
+                'p_lease_seconds': self.lease_seconds
+            }).execute()
             
-            return result
+            return response.data if response.data else []
             
         except Exception as e:
-            logger.error(f"Error processing queue: {e}")
-            return result
+            logger.error(f"Error claiming queue items: {e}")
+            return []
+    
+    def process_queue(self, batch_size: int = 10, target_per_minute: Optional[float] = None,
+                      concurrency: Optional[int] = None) -> Dict:
+        """Process up to ``batch_size`` queued items concurrently using actual AI APIs"""
+        logger.info(f"Processing queue with batch size {batch_size}...")
+        worker = ImageWorker(self, target_per_minute=target_per_minute, concurrency=concurrency)
+        return asyncio.run(worker.run(max_items=batch_size))
+    
+    def _complete_item(self, item: Dict, image_url: str, provider: str, generation_time_ms: int) -> None:
+        """Record a generated image on the queue item, the product and the history"""
+        # Update queue status first, unless the lease expired and the item was
+        # handed on; the worker holding it then records the product image
+        response = self.supabase.table('image_generation_queue').update({
+            'status': 'completed',
+            'generated_image_url': image_url,
+            'generation_provider': provider,
+            'lease_expires_at': None,
+            'completed_at': datetime.now().isoformat(),
+            'updated_at': datetime.now().isoformat()
+        }).eq('id', item['id']).eq('claimed_by', self.worker_id).execute()
+        if not response.data:
+            logger.warning(f"Claim on queue item {item['id']} was lost before completion, discarding image")
+            return
+        
+        # Update product with image
+        self.supabase.table('uses_products').update({
+            'image_url': image_url,
+            'updated_at': datetime.now().isoformat()
+        }).eq('id', item['product_id']).execute()
+        
+        # Log to history
+        self.supabase.table('image_generation_history').insert({
+            'queue_id': item['id'],
+            'product_id': item['product_id'],
+            'action': 'completed',
+            'details': {
+                'image_url': image_url,
+                'provider': provider,
+                'generation_time_ms': generation_time_ms
+            }
+        }).execute()
+        
+        # Log cost if not placeholder
+        if provider != 'placeholder':
+            self._log_generation_cost(provider, item['product_id'], item['id'], generation_time_ms, True)
+    
+    def _fail_item(self, item: Dict, error: str, provider: str, generation_time_ms: int) -> None:
+        """Record a failed generation on the queue item and the history"""
+        # Update queue status to failed, unless the item was handed to another
+        # worker; that worker's attempt is the one to record
+        response = self.supabase.table('image_generation_queue').update({
+            'status': 'failed',
+            'error_message': error,
+            'attempt_count': (item.get('attempt_count') or 0) + 1,
+            'lease_expires_at': None,
+            'updated_at': datetime.now().isoformat()
+        }).eq('id', item['id']).eq('claimed_by', self.worker_id).execute()
+        if not response.data:
+            logger.warning(f"Claim on queue item {item['id']} was lost before failure was recorded")
+            return
+        
+        # Log to history
+        self.supabase.table('image_generation_history').insert({
+            'queue_id': item['id'],
+            'product_id': item['product_id'],
+            'action': 'failed',
+            'details': {
+                'error': error,
+                'provider': provider,
+                'attempt': (item.get('attempt_count') or 0) + 1
+            }
+        }).execute()
+        
+        # Log failed cost
+        self._log_generation_cost(provider, item['product_id'], item['id'], generation_time_ms, False, error)
     
     def generate_placeholder_url(self, product_name: str, plant_part: str) -> str:
         """Generate placeholder URL"""
@@ -414,8 +366,18 @@ class HempImageGenerator:
         formatted_name = product_name.replace(' ', '+').replace('/', '-')
         return f"https://via.placeholder.com/1024x1024/{color}/FFFFFF?text={formatted_name}"
     
+    def _storage_filename(self, prefix: str) -> str:
+        return f"hemp-product-{prefix}-{int(time.time())}-{os.urandom(4).hex()}.png"
+    
     def generate_image_stable_diffusion(self, prompt: str, negative_prompt: Optional[str] = None) -> Optional[str]:
         """Generate image using Stable Diffusion API"""
+        image_bytes = self._request_stable_diffusion(prompt, negative_prompt)
+        image_url = self.upload_to_supabase_storage(image_bytes, self._storage_filename('sd'))
+        logger.info(f"Successfully generated and uploaded image: {image_url}")
+        return image_url
+    
+    def _request_stable_diffusion(self, prompt: str, negative_prompt: Optional[str] = None) -> bytes:
+        """Call the Stable Diffusion API and return the PNG bytes"""
         if not self.stability_key:
             logger.error("Stability API key not found")
             raise Exception("Stability API key not configured")
@@ -455,12 +417,7 @@ class HempImageGenerator:
                 # Get the base64 image
                 image_base64 = data['artifacts'][0]['base64']
                 # Decode base64 to bytes
-                image_bytes = base64.b64decode(image_base64)
-                # Upload to Supabase Storage
-                filename = f"hemp-product-sd-{int(time.time())}-{os.urandom(4).hex()}.png"
-                image_url = self.upload_to_supabase_storage(image_bytes, filename)
-                logger.info(f"Successfully generated and uploaded image: {image_url}")
-                return image_url
+                return base64.b64decode(image_base64)
             else:
                 error_msg = f"Stable Diffusion API error: {response.status_code} - {response.text}"
                 logger.error(error_msg)
@@ -472,6 +429,13 @@ class HempImageGenerator:
     
     def generate_image_dall_e(self, prompt: str) -> Optional[str]:
         """Generate image using DALL-E API"""
+        image_bytes = self._download_image(self._request_dall_e(prompt))
+        image_url = self.upload_to_supabase_storage(image_bytes, self._storage_filename('dalle'))
+        logger.info(f"Successfully generated and uploaded image: {image_url}")
+        return image_url
+    
+    def _request_dall_e(self, prompt: str) -> str:
+        """Call the DALL-E API and return the temporary URL of the image"""
         if not self.openai_key:
             logger.error("OpenAI API key not found")
             raise Exception("OpenAI API key not configured")
@@ -497,18 +461,7 @@ class HempImageGenerator:
             
             if response.status_code == 200:
                 data = response.json()
-                remote_url = data['data'][0]['url']
-                
-                # Download the image
-                img_response = requests.get(remote_url, timeout=30)
-                if img_response.status_code == 200:
-                    # Upload to Supabase Storage
-                    filename = f"hemp-product-dalle-{int(time.time())}-{os.urandom(4).hex()}.png"
-                    image_url = self.upload_to_supabase_storage(img_response.content, filename)
-                    logger.info(f"Successfully generated and uploaded image: {image_url}")
-                    return image_url
-                else:
-                    raise Exception(f"Failed to download DALL-E image: {img_response.status_code}")
+                return data['data'][0]['url']
             else:
                 error_msg = f"DALL-E API error: {response.status_code} - {response.text}"
                 logger.error(error_msg)
@@ -518,16 +471,27 @@ class HempImageGenerator:
             logger.error(f"Error generating with DALL-E: {e}")
             raise
     
+    def _download_image(self, url: str) -> bytes:
+        """Download a generated image"""
+        img_response = requests.get(url, timeout=30)
+        if img_response.status_code != 200:
+            raise Exception(f"Failed to download DALL-E image: {img_response.status_code}")
+        return img_response.content
+    
+    def _cost_per_image(self, provider: str) -> float:
+        """Cost of one image from ``provider``, cached for the life of the generator"""
+        if provider not in self._provider_costs:
+            provider_config = self.supabase.table('ai_provider_config').select(
+                'cost_per_image'
+            ).eq('provider_name', provider).single().execute()
+            self._provider_costs[provider] = float(provider_config.data['cost_per_image']) if provider_config.data else 0
+        return self._provider_costs[provider]
+    
     def _log_generation_cost(self, provider: str, product_id: int, queue_id: str, 
                            generation_time_ms: int, success: bool, error_message: str = None):
         """Log generation cost to database"""
         try:
-            # Get provider config for cost
-            provider_config = self.supabase.table('ai_provider_config').select(
-                'cost_per_image'
-            ).eq('provider_name', provider).single().execute()
-            
-            cost = float(provider_config.data['cost_per_image']) if success and provider_config.data else 0
+            cost = self._cost_per_image(provider) if success else 0
             
             self.supabase.table('ai_generation_costs').insert({
                 'provider_name': provider,
@@ -575,36 +539,46 @@ class HempImageGenerator:
         except Exception as e:
             logger.error(f"Error monitoring progress: {e}")
     
-    def continuous_run(self, interval_minutes: int = 15, max_runs: int = None) -> None:
-        """Run continuously with specified interval"""
+    def continuous_run(self, interval_minutes: int = 15, max_runs: int = None,
+                       target_per_minute: Optional[float] = None, concurrency: Optional[int] = None) -> None:
+        """Run continuously, draining the queue at the target throughput between refills"""
+        asyncio.run(self._continuous_run(interval_minutes, max_runs, target_per_minute, concurrency))
+    
+    async def _continuous_run(self, interval_minutes: int, max_runs: Optional[int],
+                              target_per_minute: Optional[float], concurrency: Optional[int]) -> None:
+        worker = ImageWorker(self, target_per_minute=target_per_minute, concurrency=concurrency)
         run_count = 0
         
         while max_runs is None or run_count < max_runs:
             logger.info(f"Starting run {run_count + 1}...")
             
             # Monitor current progress
-            self.monitor_progress()
+            await asyncio.to_thread(self.monitor_progress)
             
             # Queue products without images
-            self.queue_products_without_images()
+            queued = await asyncio.to_thread(self.queue_products_without_images)
             
-            # Process the queue
-            result = self.process_queue(batch_size=50)
+            # Work the queue until it is empty
+            result = await worker.run()
             
             # Log to agent runs
-            self._log_agent_run(result)
+            await asyncio.to_thread(self._log_agent_run, result)
             
             run_count += 1
             
             # Check if all done
-            stats = self.get_queue_stats()
-            if stats.get('pending', 0) == 0:
+            if queued == 0 and result['processed_count'] == 0:
                 logger.info("All products have been processed!")
                 break
             
+            # Refill straight away while real images are being produced; wait
+            # when nothing was claimed (another worker took the items) or only
+            # placeholders came out, since those products are queued again
+            if result['success_count'] > result['placeholder_count']:
+                continue
             if max_runs is None or run_count < max_runs:
                 logger.info(f"Waiting {interval_minutes} minutes before next run...")
-                time.sleep(interval_minutes * 60)
+                await asyncio.sleep(interval_minutes * 60)
     
     def _log_agent_run(self, result: Dict) -> None:
         """Log agent run to database"""
@@ -621,6 +595,200 @@ class HempImageGenerator:
             logger.error(f"Error logging agent run: {e}")
 
 
+class ImageWorker:
+    """Processes queue items concurrently on an asyncio event loop.
+    
+    Each claimed item runs as its own task through generation, download,
+    upload and the database writes, so the stages of different items
+    overlap. The blocking API and Supabase calls run in threads; at most
+    ``PROVIDER_CONCURRENCY[provider]`` (or ``concurrency``) generation
+    requests and ``transfer_concurrency`` downloads/uploads run at once.
+    ``target_per_minute`` paces claims to a throughput target, which
+    keeps a fast provider inside its rate limits and spend; items are
+    claimed only when they can start, so none sits out its lease waiting.
+    """
+    
+    def __init__(self, generator: HempImageGenerator, target_per_minute: Optional[float] = None,
+                 concurrency: Optional[int] = None, transfer_concurrency: int = 4):
+        self.generator = generator
+        self.target_per_minute = target_per_minute
+        self.concurrency = concurrency
+        self.transfer_concurrency = transfer_concurrency
+        self._provider_slots: Dict[str, asyncio.Semaphore] = {}
+        self._transfer_slots: Optional[asyncio.Semaphore] = None
+        self._next_start = 0.0
+    
+    def _provider_slot(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._provider_slots:
+            limit = self.concurrency or PROVIDER_CONCURRENCY.get(provider, 1)
+            self._provider_slots[provider] = asyncio.Semaphore(limit)
+        return self._provider_slots[provider]
+    
+    def _until_next_claim(self) -> float:
+        """Seconds until pacing allows the next claim (0 without a target)"""
+        if not self.target_per_minute:
+            return 0.0
+        return max(0.0, self._next_start - asyncio.get_running_loop().time())
+    
+    def _claimed(self, count: int) -> None:
+        """Space the next claim ``60 / target_per_minute`` seconds per claimed item"""
+        if self.target_per_minute and count:
+            now = asyncio.get_running_loop().time()
+            self._next_start = max(now, self._next_start) + count * 60.0 / self.target_per_minute
+    
+    async def _generate(self, item: Dict, provider: str) -> str:
+        """Generate an image with an AI provider and upload it to storage"""
+        generator = self.generator
+        async with self._provider_slot(provider):
+            if provider == 'stable_diffusion':
+                logger.info("Using Stable Diffusion API...")
+                image_data = await asyncio.to_thread(
+                    generator._request_stable_diffusion, item['prompt'], item.get('negative_prompt')
+                )
+                prefix = 'sd'
+            else:
+                logger.info("Using DALL-E API...")
+                remote_url = await asyncio.to_thread(generator._request_dall_e, item['prompt'])
+                prefix = 'dalle'
+        
+        # The provider slot is free again while the image is transferred
+        async with self._transfer_slots:
+            if provider == 'dall_e':
+                image_data = await asyncio.to_thread(generator._download_image, remote_url)
+            image_url = await asyncio.to_thread(
+                generator.upload_to_supabase_storage, image_data, generator._storage_filename(prefix)
+            )
+        logger.info(f"Successfully generated and uploaded image: {image_url}")
+        return image_url
+    
+    async def _process(self, item: Dict, provider: str) -> str:
+        """Run one claimed item to completion; returns 'success', 'placeholder' or 'failed'"""
+        generator = self.generator
+        start_time = time.time()
+        product = item['uses_products']
+        
+        try:
+            logger.info(f"Generating image for product {item['product_id']}: {product['name']}")
+            image_url = None
+            actual_provider = provider
+            
+            has_key = (provider == 'stable_diffusion' and generator.stability_key) or \
+                (provider == 'dall_e' and generator.openai_key)
+            if has_key:
+                try:
+                    image_url = await self._generate(item, provider)
+                except Exception as api_error:
+                    logger.error(f"API error: {api_error}")
+            
+            if not image_url:
+                # Placeholder provider, or fallback after an API error
+                plant_part = (product.get('plant_parts') or {}).get('name') or ''
+                image_url = generator.generate_placeholder_url(product['name'], plant_part)
+                actual_provider = 'placeholder'
+            
+            await asyncio.to_thread(
+                generator._complete_item, item, image_url, actual_provider,
+                int((time.time() - start_time) * 1000)
+            )
+            return 'placeholder' if actual_provider == 'placeholder' else 'success'
+            
+        except Exception as e:
+            logger.error(f"Error processing item {item['id']}: {e}")
+            try:
+                await asyncio.to_thread(
+                    generator._fail_item, item, str(e), provider, int((time.time() - start_time) * 1000)
+                )
+            except Exception as record_error:
+                logger.error(f"Error recording failure of item {item['id']}: {record_error}")
+            return 'failed'
+    
+    async def run(self, max_items: Optional[int] = None, stop_when_empty: bool = True,
+                  idle_seconds: float = 5.0, max_idle_seconds: float = 300.0) -> Dict:
+        """Claim and process queue items until the queue is empty or ``max_items`` were claimed.
+        
+        New items are claimed as soon as earlier ones finish, keeping the
+        provider busy instead of waiting for a whole batch. With
+        ``stop_when_empty=False`` an empty queue is polled again with
+        exponential backoff from ``idle_seconds`` up to ``max_idle_seconds``.
+        """
+        generator = self.generator
+        self._transfer_slots = asyncio.Semaphore(self.transfer_concurrency)
+        
+        provider = await asyncio.to_thread(generator.select_best_provider)
+        logger.info(f"Using provider: {provider}")
+        
+        # Claim a few more items than generation slots so transfers and
+        # database writes of finished images overlap the next generations
+        capacity = (self.concurrency or PROVIDER_CONCURRENCY.get(provider, 1)) + self.transfer_concurrency
+        
+        result = {
+            'processed_count': 0,
+            'success_count': 0,
+            'failed_count': 0,
+            'retry_count': 0,
+            'placeholder_count': 0
+        }
+        started_at = time.monotonic()
+        inflight: Set[asyncio.Task] = set()
+        claimed = 0
+        drained = False
+        idle = idle_seconds
+        
+        while True:
+            room = capacity - len(inflight)
+            if max_items is not None:
+                room = min(room, max_items - claimed)
+            # With a throughput target items are claimed one at a time as
+            # pacing allows, never ahead of when they can start
+            wait = self._until_next_claim() if room > 0 and not drained else None
+            if wait == 0:
+                count = 1 if self.target_per_minute else room
+                items = await asyncio.to_thread(generator.claim_queue_items, count)
+                self._claimed(len(items))
+                claimed += len(items)
+                drained = len(items) < count
+                if items:
+                    idle = idle_seconds
+                for item in items:
+                    inflight.add(asyncio.create_task(self._process(item, provider)))
+                continue
+            
+            if inflight:
+                done, inflight = await asyncio.wait(inflight, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    outcome = task.result()
+                    result['processed_count'] += 1
+                    if outcome == 'failed':
+                        result['failed_count'] += 1
+                    else:
+                        result['success_count'] += 1
+                        if outcome == 'placeholder':
+                            result['placeholder_count'] += 1
+                continue
+            if wait:
+                await asyncio.sleep(wait)
+                continue
+            
+            if (max_items is not None and claimed >= max_items) or stop_when_empty:
+                break
+            logger.info(f"Queue empty, checking again in {idle:.0f}s")
+            await asyncio.sleep(idle)
+            idle = min(idle * 2, max_idle_seconds)
+            drained = False
+        
+        elapsed = time.monotonic() - started_at
+        result['elapsed_seconds'] = round(elapsed, 1)
+        result['images_per_minute'] = round(result['success_count'] * 60 / elapsed, 2) if elapsed else 0.0
+        
+        logger.info(
+            f"Processed {result['processed_count']} items: "
+            f"{result['success_count']} success, "
+            f"{result['failed_count']} failed "
+            f"({result['images_per_minute']} images/min)"
+        )
+        return result
+
+
 def main():
     """Main entry point"""
     import argparse
@@ -631,11 +799,15 @@ def main():
     parser.add_argument('--batch-size', type=int, default=10,
                         help='Batch size for processing')
     parser.add_argument('--interval', type=int, default=15,
-                        help='Interval between runs in continuous mode (minutes)')
+                        help='Wait between runs in continuous mode when there is no real work (minutes)')
     parser.add_argument('--max-runs', type=int,
                         help='Maximum number of runs in continuous mode')
     parser.add_argument('--provider', choices=list(PROVIDERS.keys()),
                         help='Image generation provider')
+    parser.add_argument('--target-per-minute', type=float,
+                        help='Throughput target in images per minute (default: as fast as concurrency allows)')
+    parser.add_argument('--concurrency', type=int,
+                        help='Concurrent generation requests (default: per-provider limit)')
     
     args = parser.parse_args()
     
@@ -655,12 +827,18 @@ def main():
     elif args.mode == 'continuous':
         generator.continuous_run(
             interval_minutes=args.interval,
-            max_runs=args.max_runs
+            max_runs=args.max_runs,
+            target_per_minute=args.target_per_minute,
+            concurrency=args.concurrency
         )
     else:  # once
         generator.monitor_progress()
         generator.queue_products_without_images()
-        generator.process_queue(batch_size=args.batch_size)
+        generator.process_queue(
+            batch_size=args.batch_size,
+            target_per_minute=args.target_per_minute,
+            concurrency=args.concurrency
+        )
         generator.monitor_progress()
 
 
@@ -0,0 +1,22 @@
+-- HempQuarterz SEO Keyword Upserts Migration
+-- Version: 005
+-- Description: Makes agent_seo_keywords.keyword unique so keyword metrics and rankings can be bulk upserted
+
+-- Keep only the most recently checked row of any duplicated keyword
+DELETE FROM agent_seo_keywords a
+USING agent_seo_keywords b
+WHERE a.keyword = b.keyword
+  AND (COALESCE(a.last_checked_at, '-infinity'), a.id) < (COALESCE(b.last_checked_at, '-infinity'), b.id);
+
+-- upsert(on_conflict='keyword') needs a unique constraint on the column;
+-- its index replaces the plain keyword index
+ALTER TABLE agent_seo_keywords
+    ADD CONSTRAINT agent_seo_keywords_keyword_key UNIQUE (keyword);
+
+DROP INDEX IF EXISTS idx_seo_keywords_keyword;
+
+-- Freshness checks filter on last_checked_at
+CREATE INDEX IF NOT EXISTS idx_seo_keywords_checked ON agent_seo_keywords(last_checked_at DESC);
+
+CREATE TRIGGER update_agent_seo_keywords_updated_at BEFORE UPDATE ON agent_seo_keywords
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,17 @@
+-- HempQuarterz SEO Ranking History Migration
+-- Version: 006
+-- Description: Append-only time series of keyword ranking checks
+
+CREATE TABLE IF NOT EXISTS agent_seo_ranking_history (
+    id BIGSERIAL PRIMARY KEY,
+    keyword VARCHAR(255) NOT NULL,
+    position SMALLINT, -- NULL when not ranking
+    url_ranking TEXT,
+    checked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- History is always read per keyword list over a recent time range
+CREATE INDEX IF NOT EXISTS idx_seo_ranking_history_keyword_checked
+    ON agent_seo_ranking_history(keyword, checked_at DESC);
+
+ALTER TABLE agent_seo_ranking_history ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,7 @@
+-- HempQuarterz SEO Keyword Metrics Source Migration
+-- Version: 007
+-- Description: Records where keyword metrics came from so the local estimator never trains on its own output
+
+ALTER TABLE agent_seo_keywords
+    ADD COLUMN IF NOT EXISTS metrics_source VARCHAR(20)
+    CHECK (metrics_source IN ('llm', 'model', 'heuristic'));
@@ -0,0 +1,7 @@
+-- HempQuarterz Generated Content Batches Migration
+-- Version: 008
+-- Description: Index for resuming content batches by the batch_id stored in metadata
+
+CREATE INDEX IF NOT EXISTS idx_generated_content_batch
+    ON agent_generated_content ((metadata->>'batch_id'))
+    WHERE metadata ? 'batch_id';
@@ -0,0 +1,29 @@
+-- HempQuarterz Generated Content Rescoring Migration
+-- Version: 009
+-- Description: Bulk score updates for re-scoring stored content in one round trip per page
+
+CREATE OR REPLACE FUNCTION update_generated_content_scores(
+    p_updates JSONB
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    -- p_updates: [{"id": ..., "seo_score": ..., "readability_score": ..., "word_count": ...}, ...]
+    UPDATE agent_generated_content AS c
+    SET
+        seo_score = u.seo_score,
+        readability_score = u.readability_score,
+        word_count = u.word_count
+    FROM jsonb_to_recordset(p_updates) AS u(
+        id UUID,
+        seo_score DECIMAL(4, 2),
+        readability_score DECIMAL(4, 2),
+        word_count INTEGER
+    )
+    WHERE c.id = u.id;
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,12 @@
+-- HempQuarterz Generated Content Cache Migration
+-- Version: 010
+-- Description: Index for looking up drafts by the content hash of their generation inputs
+
+CREATE INDEX IF NOT EXISTS idx_generated_content_generation_key
+    ON agent_generated_content ((metadata->>'generation_key'))
+    WHERE metadata ? 'generation_key';
+
+-- Latest cached draft per product and type, used for partial regeneration
+CREATE INDEX IF NOT EXISTS idx_generated_content_product_type_created
+    ON agent_generated_content (product_id, content_type, created_at DESC)
+    WHERE metadata ? 'generation_key';
@@ -0,0 +1,125 @@
+-- HempQuarterz Image Generation Queue Claims Migration
+-- Version: 011
+-- Description: Atomic batch claiming of queue items with worker leases, and a reaper for stale processing rows
+
+ALTER TABLE image_generation_queue
+    ADD COLUMN IF NOT EXISTS claimed_by TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_image_queue_lease
+    ON image_generation_queue (lease_expires_at)
+    WHERE status = 'processing';
+
+-- Put items whose worker died or stalled back on the queue
+CREATE OR REPLACE FUNCTION reap_stale_image_generation_items(
+    p_stale_after_seconds INTEGER DEFAULT 1800
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_reaped INTEGER;
+BEGIN
+    -- Rows marked processing before leases existed have no lease_expires_at;
+    -- they count as stale once untouched for p_stale_after_seconds
+    WITH stale AS (
+        SELECT q.id
+        FROM image_generation_queue q
+        WHERE q.status = 'processing'
+          AND COALESCE(q.lease_expires_at, q.updated_at + make_interval(secs => p_stale_after_seconds)) < NOW()
+        FOR UPDATE SKIP LOCKED
+    ),
+    reaped AS (
+        UPDATE image_generation_queue q
+        SET
+            status = CASE
+                WHEN COALESCE(q.attempt_count, 0) + 1 >= COALESCE(q.max_attempts, 3) THEN 'failed'
+                ELSE 'retry'
+            END,
+            attempt_count = COALESCE(q.attempt_count, 0) + 1,
+            error_message = 'Lease expired while processing (claimed by '
+                || COALESCE(q.claimed_by, 'unknown worker') || ')',
+            claimed_by = NULL,
+            lease_expires_at = NULL,
+            updated_at = NOW()
+        FROM stale
+        WHERE q.id = stale.id
+        RETURNING q.id, q.product_id, q.status, q.attempt_count
+    )
+    INSERT INTO image_generation_history (queue_id, product_id, action, details)
+    SELECT id, product_id, 'lease_expired', jsonb_build_object('status', status, 'attempt', attempt_count)
+    FROM reaped;
+
+    GET DIAGNOSTICS v_reaped = ROW_COUNT;
+    RETURN v_reaped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Claim up to p_limit pending/retry items for one worker in a single statement.
+-- SKIP LOCKED lets concurrent workers (the Python generator, the
+-- hemp-image-generator edge function) claim disjoint batches without waiting.
+CREATE OR REPLACE FUNCTION claim_image_generation_items(
+    p_worker_id TEXT,
+    p_limit INTEGER DEFAULT 10,
+    p_lease_seconds INTEGER DEFAULT 600
+)
+RETURNS TABLE (
+    id UUID,
+    product_id BIGINT,
+    prompt TEXT,
+    negative_prompt TEXT,
+    style_preset TEXT,
+    attempt_count INTEGER,
+    max_attempts INTEGER,
+    priority INTEGER,
+    generation_provider TEXT,
+    claimed_by TEXT,
+    lease_expires_at TIMESTAMP,
+    uses_products JSONB
+) AS $$
+#variable_conflict use_column
+BEGIN
+    PERFORM reap_stale_image_generation_items();
+
+    RETURN QUERY
+    WITH picked AS (
+        SELECT q.id
+        FROM image_generation_queue q
+        WHERE q.status IN ('pending', 'retry')
+        ORDER BY q.priority DESC, q.created_at
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    ),
+    claimed AS (
+        UPDATE image_generation_queue q
+        SET
+            status = 'processing',
+            claimed_by = p_worker_id,
+            lease_expires_at = NOW() + make_interval(secs => p_lease_seconds),
+            updated_at = NOW()
+        FROM picked
+        WHERE q.id = picked.id
+        RETURNING q.*
+    )
+    -- uses_products has the same shape as the embedded
+    -- uses_products(name, plant_parts(name)) select the clients used before
+    SELECT
+        c.id,
+        c.product_id,
+        c.prompt,
+        c.negative_prompt,
+        c.style_preset,
+        c.attempt_count,
+        c.max_attempts,
+        c.priority,
+        c.generation_provider,
+        c.claimed_by,
+        c.lease_expires_at,
+        jsonb_build_object(
+            'name', up.name,
+            'plant_parts', jsonb_build_object('name', pp.name)
+        )
+    FROM claimed c
+    JOIN uses_products up ON up.id = c.product_id
+    LEFT JOIN plant_parts pp ON pp.id = up.plant_part_id
+    ORDER BY c.priority DESC, c.created_at;
+END;
+$$ LANGUAGE plpgsql;
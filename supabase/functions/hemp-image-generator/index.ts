@@ -34,28 +34,11 @@ serve(async (req) => {
 
     const { batchSize = 10, provider = await selectBestProvider() } = await req.json();
 
-    // Fetch pending image generation tasks
+    // Atomically claim pending image generation tasks so concurrent
+    // workers (other invocations, the Python generator) never share an item
+    const workerId = `edge-${crypto.randomUUID()}`;
     const { data: queue, error: queueError } = await supabase
-      .from('image_generation_queue')
-      .select(`
-        id,
-        product_id,
-        prompt,
-        style_preset,
-        negative_prompt,
-        uses_products (
-          name,
-          plant_parts (name),
-          industry_sub_categories (
-            name,
-            industries (name)
-          )
-        )
-      `)
-      .in('status', ['pending', 'retry'])
-      .order('priority', { ascending: false })
-      .order('created_at')
-      .limit(batchSize);
+      .rpc('claim_image_generation_items', { p_worker_id: workerId, p_limit: batchSize });
 
     if (queueError) {
       throw queueError;
@@ -73,12 +56,6 @@ serve(async (req) => {
       const startTime = Date.now();
       
       try {
-        // Update status to processing
-        await supabase
-          .from('image_generation_queue')
-          .update({ status: 'processing', updated_at: new Date().toISOString() })
-          .eq('id', item.id);
-
         // Generate image based on provider
         let imageUrl = '';
         let actualProvider = provider;
@@ -113,26 +90,36 @@ serve(async (req) => {
           actualProvider = IMAGE_PROVIDERS.PLACEHOLDER;
         }
 
-        // Update product with generated image
-        await supabase
-          .from('uses_products')
-          .update({ 
-            image_url: imageUrl,
-            updated_at: new Date().toISOString()
-          })
-          .eq('id', item.product_id);
-
-        // Update queue status
-        await supabase
+        // Update queue status first; if the lease expired and the item was
+        // handed on, the worker holding it records the product image
+        const { data: completed } = await supabase
           .from('image_generation_queue')
           .update({ 
             status: 'completed',
             generated_image_url: imageUrl,
             generation_provider: actualProvider,
+            lease_expires_at: null,
             completed_at: new Date().toISOString(),
             updated_at: new Date().toISOString()
           })
-          .eq('id', item.id);
+          .eq('id', item.id)
+          .eq('claimed_by', workerId)
+          .select('id');
+
+        if (!completed?.length) {
+          console.warn(`Claim on queue item ${item.id} was lost before completion, discarding image`);
+          results.processed++;
+          continue;
+        }
+
+        // Update product with generated image
+        await supabase
+          .from('uses_products')
+          .update({ 
+            image_url: imageUrl,
+            updated_at: new Date().toISOString()
+          })
+          .eq('id', item.product_id);
 
         // Log success
         await supabase
@@ -156,14 +143,23 @@ serve(async (req) => {
         results.success++;
       } catch (error) {
         // Handle errors
-        await supabase
+        const { data: failed } = await supabase
           .from('image_generation_queue')
           .update({ 
             status: 'failed',
             error_message: error.message,
+            lease_expires_at: null,
             updated_at: new Date().toISOString()
           })
-          .eq('id', item.id);
+          .eq('id', item.id)
+          .eq('claimed_by', workerId)
+          .select('id');
+
+        if (!failed?.length) {
+          console.warn(`Claim on queue item ${item.id} was lost before failure was recorded`);
+          results.processed++;
+          continue;
+        }
 
         // Log failed cost
         await logGenerationCost(provider, item.product_id, item.id, Date.now() - startTime, false, error.message);
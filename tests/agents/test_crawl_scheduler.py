@@ -0,0 +1,183 @@
+"""Tests for per-host crawl scheduling and the robots.txt cache."""
+
+import asyncio
+import time
+from urllib.robotparser import RobotFileParser
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from agents.utils import crawl_scheduler
+from agents.utils.crawl_scheduler import CrawlDisallowed, CrawlScheduler, RobotsCache, RobotsEntry
+
+
+class StaticRobots(RobotsCache):
+    """Robots cache that serves one robots.txt for every host without network access."""
+
+    def __init__(self, content: str = ''):
+        super().__init__()
+        self.content = content
+
+    async def _download(self, origin):
+        parser = RobotFileParser()
+        parser.parse(self.content.splitlines())
+        return RobotsEntry(parser, self.content, time.monotonic() + self.ttl)
+
+
+def fake_robots_server(monkeypatch, responses):
+    """Answer robots.txt requests from ``responses`` (status codes or exceptions to raise)."""
+    requests = []
+
+    class Response:
+        def __init__(self, status):
+            self.status = status
+
+        async def text(self):
+            return 'User-agent: *\nDisallow: /private'
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    class Session:
+        def __init__(self, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        def get(self, url, **kwargs):
+            response = responses[len(requests)]
+            requests.append(url)
+            if isinstance(response, Exception):
+                raise response
+            return Response(response)
+
+    monkeypatch.setattr(crawl_scheduler.aiohttp, 'ClientSession', Session)
+    return requests
+
+
+async def _timed_requests(scheduler, urls, duration=0.0):
+    """Run one request per URL concurrently; returns ``(url, start, end)`` per request."""
+    log = []
+
+    async def fetch(url):
+        async with scheduler.slot(url):
+            start = time.monotonic()
+            await asyncio.sleep(duration)
+            log.append((url, start, time.monotonic()))
+
+    await asyncio.gather(*(fetch(url) for url in urls))
+    return sorted(log, key=lambda entry: entry[1])
+
+
+class TestCrawlScheduler:
+    """Test pacing, per-host fairness and robots.txt enforcement."""
+
+    @pytest.mark.asyncio
+    async def test_spaces_requests_to_a_host(self):
+        """Test requests to one host start at least ``default_delay`` apart."""
+        scheduler = CrawlScheduler(per_host_concurrency=4, default_delay=0.05, robots=StaticRobots())
+        log = await _timed_requests(scheduler, [f"https://a.com/{i}" for i in range(4)])
+
+        gaps = [later[1] - earlier[1] for earlier, later in zip(log, log[1:])]
+        assert min(gaps) >= 0.045
+        assert scheduler.stats()['a.com']['requests'] == 4
+
+    @pytest.mark.asyncio
+    async def test_crawl_delay_serializes_host(self):
+        """Test a robots.txt Crawl-delay limits the host to one request at a time."""
+        scheduler = CrawlScheduler(per_host_concurrency=4, default_delay=0, max_crawl_delay=0.05,
+                                   robots=StaticRobots('User-agent: *\nCrawl-delay: 5'))
+        log = await _timed_requests(scheduler, [f"https://a.com/{i}" for i in range(3)], duration=0.02)
+
+        for earlier, later in zip(log, log[1:]):
+            assert later[1] >= earlier[2]
+            assert later[1] - earlier[1] >= 0.045
+        assert scheduler.stats()['a.com']['delay'] == 0.05
+
+    @pytest.mark.asyncio
+    async def test_slow_host_does_not_block_others(self):
+        """Test a host waiting out its delay does not hold the global slots."""
+        scheduler = CrawlScheduler(per_host_concurrency=1, default_delay=0.2, global_concurrency=1,
+                                   host_overrides={'b.com': {'delay': 0}}, robots=StaticRobots())
+        urls = [f"https://a.com/{i}" for i in range(3)] + [f"https://b.com/{i}" for i in range(3)]
+        log = await _timed_requests(scheduler, urls)
+
+        a_starts = [start for url, start, _ in log if 'a.com' in url]
+        b_ends = [end for url, _, end in log if 'b.com' in url]
+        assert max(b_ends) < a_starts[1]
+
+    @pytest.mark.asyncio
+    async def test_disallowed_url_raises(self):
+        """Test URLs forbidden by robots.txt never get a slot."""
+        scheduler = CrawlScheduler(robots=StaticRobots('User-agent: *\nDisallow: /private'))
+        with pytest.raises(CrawlDisallowed):
+            async with scheduler.slot('https://a.com/private/page'):
+                pass
+        assert await scheduler.allowed('https://a.com/public')
+
+    @pytest.mark.asyncio
+    async def test_host_override_updates_live_budget(self):
+        """Test overrides resize the host's budget in place and are restored afterwards."""
+        scheduler = CrawlScheduler(per_host_concurrency=2, default_delay=0, robots=StaticRobots())
+        async with scheduler.slot('https://a.com/'):
+            pass
+        budget = scheduler._hosts['a.com']
+
+        with scheduler.host_override('a.com', concurrency=5, delay=0.5):
+            assert scheduler._hosts['a.com'] is budget
+            assert (budget.slots.limit, budget.delay) == (5, 0.5)
+        assert (budget.slots.limit, budget.delay) == (2, 0)
+
+
+class TestRobotsCache:
+    """Test robots.txt caching and expiry."""
+
+    @pytest.mark.asyncio
+    async def test_fetched_once_per_ttl(self, monkeypatch):
+        """Test concurrent lookups share one download that is reused until it expires."""
+        requests = fake_robots_server(monkeypatch, [200, 200])
+        cache = RobotsCache(ttl=0.05)
+
+        entries = await asyncio.gather(*(cache.get(f"https://a.com/{i}") for i in range(5)))
+        assert requests == ['https://a.com/robots.txt']
+        assert not entries[0].allows(cache.user_agent, 'https://a.com/private')
+
+        await asyncio.sleep(0.06)
+        await cache.get('https://a.com/')
+        assert len(requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_use_error_ttl(self, monkeypatch):
+        """Test server errors and timeouts allow crawling but are retried after ``error_ttl``."""
+        requests = fake_robots_server(monkeypatch, [503, asyncio.TimeoutError(), 200])
+        cache = RobotsCache(ttl=3600, error_ttl=0.02)
+
+        assert (await cache.get('https://a.com/')).allows(cache.user_agent, 'https://a.com/private')
+        await cache.get('https://a.com/')
+        assert len(requests) == 1
+
+        await asyncio.sleep(0.03)
+        assert (await cache.get('https://a.com/')).content is None
+        await asyncio.sleep(0.03)
+        entry = await cache.get('https://a.com/')
+        assert len(requests) == 3
+        assert not entry.allows(cache.user_agent, 'https://a.com/private')
+
+    @pytest.mark.asyncio
+    async def test_missing_robots_cached_for_ttl(self, monkeypatch):
+        """Test a 404 allows everything and is kept for the full TTL."""
+        requests = fake_robots_server(monkeypatch, [404])
+        cache = RobotsCache(ttl=3600, error_ttl=0.01)
+
+        assert (await cache.get('https://a.com/')).allows(cache.user_agent, 'https://a.com/private')
+        await asyncio.sleep(0.02)
+        await cache.get('https://a.com/')
+        assert len(requests) == 1
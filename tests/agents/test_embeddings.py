@@ -0,0 +1,63 @@
+"""Tests for the local product vector index."""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from agents.utils.embeddings import ProductVectorIndex
+
+
+def _vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+class TestProductVectorIndex:
+    """Test persistence, reloading and batched writes."""
+
+    def test_reader_sees_rewritten_files(self, tmp_path):
+        """Test an open index picks up vectors written by another instance."""
+        reader = ProductVectorIndex(tmp_path)
+        assert reader.similar_to(1) == []
+
+        writer = ProductVectorIndex(tmp_path)
+        writer.upsert([1, 2, 3], ['a', 'b', 'c'], _vectors(3))
+
+        assert 2 in reader
+        assert [product_id for product_id, _ in reader.similar_to(1, k=2)] == \
+            [product_id for product_id, _ in writer.similar_to(1, k=2)]
+
+    def test_batch_writes_once(self, tmp_path, monkeypatch):
+        """Test upserts inside a batch are buffered into a single write."""
+        index = ProductVectorIndex(tmp_path)
+        writes = []
+        original = index._write
+        monkeypatch.setattr(index, '_write', lambda *args: (writes.append(len(args[0])), original(*args)))
+
+        vectors = _vectors(30)
+        with index.batch():
+            for start in range(0, 30, 10):
+                ids = list(range(start, start + 10))
+                index.upsert(ids, [f"h{i}" for i in ids], vectors[start:start + 10])
+            assert len(index) == 0
+
+        assert writes == [30]
+        assert len(index) == 30
+        assert index.stale([{'id': 5, 'name': 'changed'}])
+
+    def test_upsert_appends_and_keeps_ivf(self, tmp_path, monkeypatch):
+        """Test later upserts update rows in place and join existing IVF lists."""
+        index = ProductVectorIndex(tmp_path)
+        vectors = _vectors(40)
+        index.upsert(list(range(30)), [f"h{i}" for i in range(30)], vectors[:30])
+        index.build_ivf(n_lists=4)
+
+        monkeypatch.setattr(index, '_write', lambda *args: pytest.fail('matrix rewritten'))
+        index.upsert([3] + list(range(30, 40)), ['new'] + [f"h{i}" for i in range(30, 40)],
+                     np.vstack([vectors[35], vectors[30:40]]))
+
+        assert len(index) == 40 and index.ivf_rows == 30
+        assert sum(len(rows) for rows in index._lists) == 40
+        reader = ProductVectorIndex(tmp_path)
+        assert reader.ivf_rows == 30
+        assert reader.hashes[3] == 'new'
+        assert [product_id for product_id, _ in reader.similar_to(35, k=1, n_probe=4)] == ['3']
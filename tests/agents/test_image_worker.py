@@ -0,0 +1,112 @@
+"""Tests for the concurrent image generation worker."""
+
+import asyncio
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+for dependency in ('supabase', 'dotenv', 'requests'):
+    pytest.importorskip(dependency)
+
+MODULE_PATH = Path(__file__).resolve().parents[2] / 'image_generation' / 'hemp_image_generator.py'
+spec = importlib.util.spec_from_file_location('hemp_image_generator', MODULE_PATH)
+hemp_image_generator = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hemp_image_generator)
+
+HempImageGenerator = hemp_image_generator.HempImageGenerator
+ImageWorker = hemp_image_generator.ImageWorker
+
+
+def queue_item(index, prompt='hemp product photo'):
+    return {'id': f"q{index}", 'product_id': index, 'prompt': prompt, 'attempt_count': 0,
+            'uses_products': {'name': f"Product {index}", 'plant_parts': {'name': 'Seed'}}}
+
+
+class FakeGenerator:
+    """Wires a ``HempImageGenerator`` to an in-memory queue and a slow fake provider."""
+
+    def __init__(self, items, generation_seconds=0.1):
+        self.queue = list(items)
+        self.generation_seconds = generation_seconds
+        self.claims = []
+        self.completed = []
+        self.failed = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+        generator = HempImageGenerator.__new__(HempImageGenerator)
+        generator.stability_key = 'key'
+        generator.openai_key = None
+        generator._provider_costs = {}
+        generator.select_best_provider = lambda: 'stable_diffusion'
+        generator.claim_queue_items = self.claim
+        generator._request_stable_diffusion = self.request
+        generator.upload_to_supabase_storage = lambda data, filename: f"https://storage/{filename}"
+        generator._complete_item = lambda item, url, provider, ms: self.completed.append((item['id'], provider))
+        generator._fail_item = lambda item, error, provider, ms: self.failed.append(item['id'])
+        self.generator = generator
+
+    def claim(self, limit):
+        with self.lock:
+            self.claims.append((time.monotonic(), limit))
+            items, self.queue = self.queue[:limit], self.queue[limit:]
+            return items
+
+    def request(self, prompt, negative_prompt=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.generation_seconds)
+        with self.lock:
+            self.active -= 1
+        if prompt == 'fail':
+            raise RuntimeError('provider error')
+        return b'png'
+
+
+class TestImageWorker:
+    """Test claim pacing and concurrency limits."""
+
+    def test_processes_concurrently_within_provider_limit(self):
+        """Test generations overlap up to the provider's concurrency and errors fall back to placeholders."""
+        fake = FakeGenerator([queue_item(i, 'fail' if i == 3 else 'hemp') for i in range(12)])
+
+        started = time.monotonic()
+        result = asyncio.run(ImageWorker(fake.generator).run(max_items=10))
+        elapsed = time.monotonic() - started
+
+        assert result['processed_count'] == 10
+        assert result['placeholder_count'] == 1
+        assert len(fake.completed) == 10 and not fake.failed
+        assert fake.peak == hemp_image_generator.PROVIDER_CONCURRENCY['stable_diffusion']
+        assert len(fake.queue) == 2
+        # One at a time would take at least 1s
+        assert elapsed < 0.8
+        # Claims never exceed the generation slots plus the transfer slots
+        assert max(limit for _, limit in fake.claims) <= fake.peak + 4
+
+    def test_concurrency_override(self):
+        """Test ``concurrency`` caps the generation requests in flight."""
+        fake = FakeGenerator([queue_item(i) for i in range(6)], generation_seconds=0.05)
+        result = asyncio.run(ImageWorker(fake.generator, concurrency=2, transfer_concurrency=1).run())
+
+        assert result['processed_count'] == 6
+        assert fake.peak == 2
+        assert max(limit for _, limit in fake.claims) <= 3
+
+    def test_target_paces_claims(self):
+        """Test a throughput target claims one item at a time, spaced by the target rate."""
+        fake = FakeGenerator([queue_item(i) for i in range(5)], generation_seconds=0.01)
+
+        started = time.monotonic()
+        result = asyncio.run(ImageWorker(fake.generator, target_per_minute=600).run())
+
+        assert result['processed_count'] == 5
+        assert {limit for _, limit in fake.claims} == {1}
+        claim_times = [claimed_at for claimed_at, _ in fake.claims]
+        assert claim_times[0] - started < 0.1
+        assert min(later - earlier for earlier, later in zip(claim_times, claim_times[1:])) >= 0.09
@@ -0,0 +1,65 @@
+"""Tests for keyword variant clustering."""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from agents.seo.keyword_clusters import cluster_key, cluster_keywords
+
+
+class FakeEmbeddings:
+    """Embedding service stand-in returning fixed vectors per text."""
+
+    def __init__(self, vectors=None, error=None):
+        self.vectors = vectors or {}
+        self.error = error
+        self.calls = []
+
+    async def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        if self.error:
+            raise self.error
+        return np.asarray([self.vectors.get(text, [1.0, 0.0]) for text in texts], dtype=np.float32)
+
+
+class TestClusterKeywords:
+    """Test token-set and semantic clustering."""
+
+    def test_cluster_key_ignores_order_and_inflection(self):
+        """Test word order, plurals, -ing forms and stopwords do not change the key."""
+        assert cluster_key('buy hemp oil') == cluster_key('hemp oil buy') == cluster_key('buying hemp oils')
+        assert cluster_key('hemp oil for dogs') == cluster_key('dog hemp oil')
+
+    @pytest.mark.asyncio
+    async def test_variants_share_a_cluster(self):
+        """Test variants group under the first phrasing while distinct keywords stay apart."""
+        clusters = await cluster_keywords([
+            'buy hemp oil', 'hemp oil buy', 'hemp seeds', 'buying hemp oils', 'Buy hemp oil ', '',
+        ])
+
+        assert [(cluster.representative, cluster.members) for cluster in clusters] == [
+            ('buy hemp oil', ['buy hemp oil', 'hemp oil buy', 'buying hemp oils', 'Buy hemp oil']),
+            ('hemp seeds', ['hemp seeds']),
+        ]
+        assert clusters[0].variants == ['hemp oil buy', 'buying hemp oils', 'Buy hemp oil']
+
+    @pytest.mark.asyncio
+    async def test_semantic_merge(self):
+        """Test clusters whose representatives embed close together are merged."""
+        embeddings = FakeEmbeddings({
+            'hemp oil': [1.0, 0.0], 'cannabis sativa oil': [0.99, 0.05], 'hemp rope': [0.0, 1.0],
+        })
+        clusters = await cluster_keywords(['hemp oil', 'hemp rope', 'cannabis sativa oil'], embeddings)
+
+        assert embeddings.calls == [['hemp oil', 'hemp rope', 'cannabis sativa oil']]
+        assert sorted(cluster.members for cluster in clusters) == [
+            ['hemp oil', 'cannabis sativa oil'], ['hemp rope'],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_keeps_token_clusters(self):
+        """Test a failing embedding service falls back to the token-set clusters."""
+        clusters = await cluster_keywords(['hemp oil', 'oil hemp', 'hemp rope'],
+                                          FakeEmbeddings(error=RuntimeError('offline')))
+
+        assert [cluster.members for cluster in clusters] == [['hemp oil', 'oil hemp'], ['hemp rope']]
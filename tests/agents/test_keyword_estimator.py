@@ -0,0 +1,79 @@
+"""Tests for the local keyword metrics estimator."""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from agents.seo.keyword_estimator import KeywordMetricsEstimator
+
+PRODUCTS = ['hemp oil', 'hemp seeds', 'cbd oil', 'hemp protein', 'hemp fabric',
+            'hemp rope', 'hemp paper', 'cbd gummies', 'hemp flour', 'hemp hearts']
+MODIFIERS = ['', 'buy ', 'best ', 'organic ', 'cheap ', 'wholesale ', 'how to use ',
+             'benefits of ', 'where to buy ', 'what is ']
+SUFFIXES = ['', ' near me', ' reviews', ' price', ' for dogs']
+
+
+def training_rows(count=200):
+    """Synthetic keyword rows: buying keywords are smaller and pricier than the rest."""
+    rows = []
+    for i in range(count):
+        product = PRODUCTS[i % len(PRODUCTS)]
+        modifier = MODIFIERS[(i // len(PRODUCTS)) % len(MODIFIERS)]
+        suffix = SUFFIXES[(i // 7) % len(SUFFIXES)]
+        keyword = f"{modifier}{product}{suffix}"
+        commercial = any(term in keyword for term in ('buy', 'cheap', 'wholesale', 'price'))
+        rows.append({
+            'keyword': keyword,
+            'search_volume': 500 if commercial else 5000,
+            'difficulty_score': 40,
+            'cpc_usd': 3.0 if commercial else 0.5,
+            'trend': 'rising' if product.startswith('cbd') else 'stable',
+        })
+    return rows
+
+
+@pytest.fixture
+def estimator(tmp_path):
+    return KeywordMetricsEstimator(path=tmp_path / 'estimator.npz').fit(training_rows())
+
+
+class TestKeywordMetricsEstimator:
+    """Test fitting, prediction, confidence and persistence."""
+
+    def test_not_ready_below_min_samples(self, tmp_path):
+        """Test too few rows leave the model untrained with zero confidence."""
+        model = KeywordMetricsEstimator(path=tmp_path / 'estimator.npz').fit(training_rows(20))
+
+        assert not model.ready
+        assert model.predict(['hemp oil']) == [{'confidence': 0.0}]
+        assert model.predict([]) == []
+
+    def test_known_keyword_is_confident(self, estimator):
+        """Test keywords like the training data get plausible metrics and high confidence."""
+        buying, informational = estimator.predict(['buy hemp oil price', 'benefits of hemp seeds'])
+
+        assert estimator.ready
+        assert buying['confidence'] > 0.6
+        assert 100 < buying['search_volume'] < informational['search_volume'] < 20000
+        assert buying['cpc'] > informational['cpc']
+        assert 0 <= buying['difficulty'] <= 99
+
+    def test_unrelated_keyword_has_low_confidence(self, estimator):
+        """Test keywords unlike anything seen before are not trusted."""
+        known, unrelated = estimator.predict(['organic hemp flour', 'quantum zebra xylophone'])
+        assert unrelated['confidence'] < 0.3 < known['confidence']
+
+    def test_trend_follows_neighbours(self, estimator):
+        """Test the trend is the majority trend of the nearest training keywords."""
+        cbd, hemp = estimator.predict(['best cbd gummies', 'best hemp rope'])
+        assert (cbd['trend'], hemp['trend']) == ('rising', 'stable')
+
+    def test_save_and_load(self, estimator, tmp_path):
+        """Test a saved model predicts the same after loading."""
+        estimator.save()
+        loaded = KeywordMetricsEstimator(path=tmp_path / 'estimator.npz')
+
+        assert loaded.load()
+        assert loaded.ready
+        assert loaded.predict(['hemp oil near me']) == estimator.predict(['hemp oil near me'])
+        assert not KeywordMetricsEstimator(path=tmp_path / 'estimator.npz', n_features=512).load()
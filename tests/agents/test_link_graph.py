@@ -0,0 +1,88 @@
+"""Tests for the internal link graph."""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('aiohttp')
+
+from agents.seo.link_graph import LinkGraph
+
+
+def page(url, *links):
+    return {'url': url, 'seo_elements': {'internal_links': list(links)}}
+
+
+def dense_pagerank(graph, damping=0.85, iterations=200):
+    """Reference PageRank using the dense transition matrix."""
+    n = len(graph)
+    matrix = np.zeros((n, n))
+    for src, dst in zip(graph.src, graph.dst):
+        matrix[dst, src] = 1.0
+    out_degree = matrix.sum(axis=0)
+    matrix[:, out_degree == 0] = 1.0 / n
+    matrix /= matrix.sum(axis=0)
+    rank = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        rank = (1 - damping) / n + damping * matrix @ rank
+    return rank / rank.sum()
+
+
+class TestLinkGraph:
+    """Test graph construction, PageRank and depth."""
+
+    def test_duplicate_and_self_links_count_once(self):
+        """Test repeated links collapse to one edge and self links are dropped."""
+        graph = LinkGraph.from_pages([
+            page('https://a.com/', 'https://a.com/b', 'https://a.com/b#top', '/b', 'https://a.com/'),
+        ])
+
+        assert len(graph) == 2
+        assert list(graph.in_degree()) == [0, 1]
+
+    def test_pagerank_uniform_on_cycle(self):
+        """Test every page of a link cycle gets the same rank."""
+        graph = LinkGraph.from_pages([
+            page('https://a.com/1', '/2'), page('https://a.com/2', '/3'), page('https://a.com/3', '/1'),
+        ])
+        rank = graph.pagerank()
+
+        assert rank.sum() == pytest.approx(1.0)
+        assert rank == pytest.approx(np.full(3, 1 / 3))
+
+    def test_hub_ranks_highest(self):
+        """Test the page every other page links to has the top rank."""
+        pages = [page('https://a.com/', *(f"/p{i}" for i in range(5)))]
+        pages += [page(f"https://a.com/p{i}", '/', f"/p{(i + 1) % 5}") for i in range(5)]
+        graph = LinkGraph.from_pages(pages)
+        rank = graph.pagerank()
+
+        assert graph.urls[int(np.argmax(rank))] == 'https://a.com/'
+
+    def test_matches_dense_power_iteration(self):
+        """Test the sparse iteration agrees with a dense reference, dangling pages included."""
+        rng = np.random.default_rng(0)
+        pages = []
+        for i in range(40):
+            # Every fifth page links nowhere, so its rank must be redistributed
+            targets = [] if i % 5 == 0 else [f"/p{j}" for j in rng.choice(40, size=4, replace=False)]
+            pages.append(page(f"https://a.com/p{i}", *targets))
+        graph = LinkGraph.from_pages(pages)
+
+        rank = graph.pagerank(tol=1e-12, max_iter=500)
+        assert rank.sum() == pytest.approx(1.0)
+        assert rank == pytest.approx(dense_pagerank(graph), abs=1e-9)
+
+    def test_depths_and_orphans(self):
+        """Test click depth from the root and orphan detection."""
+        graph = LinkGraph.from_pages([
+            page('https://a.com/', '/a'), page('https://a.com/a', '/b'), page('https://a.com/b'),
+            page('https://a.com/orphan', '/'),
+        ])
+
+        depth = graph.depths('https://a.com/')
+        assert [int(depth[graph._index[url]]) for url in
+                ('https://a.com/', 'https://a.com/a', 'https://a.com/b', 'https://a.com/orphan')] == [0, 1, 2, -1]
+
+        summary = graph.analyze('https://a.com/')
+        assert summary['orphan_pages'] == ['https://a.com/orphan']
+        assert summary['unreachable_pages'] == 1
@@ -0,0 +1,153 @@
+"""Tests for near-duplicate product detection."""
+
+import pytest
+
+from agents.utils.near_duplicates import ContentDedupIndex, ProductDedupIndex, hamming, normalize_tokens, simhash
+
+
+class TestNormalizeTokens:
+    """Test token normalization."""
+    
+    def test_splits_punctuation_and_plurals(self):
+        """Test hyphens, case and plural endings are normalized."""
+        assert normalize_tokens("Hemp-Seeds Milk") == ['hemp', 'seed', 'milk']
+    
+    def test_drops_stopwords(self):
+        """Test stopwords are removed."""
+        assert normalize_tokens("Oil of the Hemp") == ['oil', 'hemp']
+
+
+class TestProductDedupIndex:
+    """Test near-duplicate index behaviour."""
+    
+    @pytest.fixture
+    def index(self):
+        """Create an in-memory index with a few products."""
+        index = ProductDedupIndex(path=':memory:')
+        index.add_many([
+            {'id': 1, 'name': 'Hemp Seed Milk', 'description': 'Plant-based milk from hulled hemp seeds'},
+            {'id': 2, 'name': 'Hemp Seed Oil', 'description': 'Cold pressed culinary oil'},
+            {'id': 3, 'name': 'Hempcrete Blocks', 'description': 'Insulating building blocks'}
+        ])
+        yield index
+        index.close()
+    
+    def test_finds_name_variant(self, index):
+        """Test wording variants are flagged as duplicates."""
+        duplicate = index.find_duplicate('Hemp-Seed Milk Beverage')
+        assert duplicate is not None
+        assert duplicate['key'] == '1'
+    
+    def test_distinct_products_not_flagged(self, index):
+        """Test different products sharing words are not duplicates."""
+        assert index.find_duplicate('Hemp Seed Protein Powder') is None
+    
+    def test_remove_entry(self, index):
+        """Test removed entries are no longer matched."""
+        index.remove(1)
+        assert index.find_duplicate('Hemp Seed Milk') is None
+        assert len(index) == 2
+    
+    def test_clusters_existing_catalog(self, index):
+        """Test batch clustering groups near-duplicates."""
+        index.add(4, 'Hemp Seeds Milk Drink')
+        clusters = index.clusters()
+        assert len(clusters) == 1
+        assert {member['key'] for member in clusters[0]} == {'1', '4'}
+    
+    def test_scoped_to_group(self, index):
+        """Test grouped lookups only match entries of the same plant part."""
+        index.add(5, 'Hemp Flower Tea', group='flower')
+        assert index.find_duplicate('Hemp-Flower Tea', group='flower')['key'] == '5'
+        assert index.find_duplicate('Hemp-Flower Tea', group='leaves') is None
+        assert index.find_duplicate('Hemp-Flower Tea')['key'] == '5'
+        index.add(6, 'Hemp Flowers Tea', group='leaves')
+        assert index.clusters() == []
+
+
+ARTICLE = (
+    "Hemp fiber has been used for thousands of years to make rope, sails and clothing. "
+    "Modern processing turns the stalks into textiles, paper and building materials such as hempcrete. "
+    "Because the plant grows quickly without pesticides and improves soil health, "
+    "manufacturers see it as a sustainable alternative to cotton and synthetic fibers. "
+    "Farmers can harvest a crop within four months and sell both the fiber and the seeds.\n\n"
+    "Decortication separates the long bast fibers from the woody core, called hurd. "
+    "The bast is spun into yarn for denim, canvas and technical fabrics, while the hurd "
+    "is mixed with lime to cast insulating walls or pressed into animal bedding. "
+    "Nothing from the stalk goes to waste, which keeps the economics attractive for small processors.\n\n"
+    "Demand is growing in the automotive sector, where molded hemp composites replace glass fiber "
+    "in door panels and dashboards. The parts are lighter, absorb impact well and can be composted "
+    "at the end of the vehicle's life. Several European carmakers already source tens of thousands "
+    "of tonnes each year, and North American suppliers are building capacity to follow.\n\n"
+    "Challenges remain: processing plants are expensive, harvest windows are short and buyers "
+    "expect consistent quality from season to season. Cooperatives that share equipment and "
+    "pool their harvests are the most common answer, and regional hubs are starting to appear "
+    "wherever enough growers commit to the crop."
+)
+
+
+class TestSimHash:
+    """Test SimHash fingerprints."""
+    
+    def test_identical_features(self):
+        """Test the fingerprint only depends on the feature set."""
+        assert simhash(['a b', 'b c']) == simhash(['b c', 'a b', 'a b'])
+    
+    def test_hamming(self):
+        """Test differing bits are counted."""
+        assert hamming(0b1011, 0b0001) == 2
+
+
+class TestContentDedupIndex:
+    """Test near-duplicate content index behaviour."""
+    
+    @pytest.fixture
+    def index(self):
+        """Create an in-memory index with one article."""
+        index = ContentDedupIndex(path=':memory:')
+        index.add_many([{'id': 'a1', 'content': ARTICLE}])
+        yield index
+        index.close()
+    
+    def test_finds_light_edit(self, index):
+        """Test a copy with a small edit is flagged."""
+        edited = ARTICLE.replace('four months', '4 months')
+        duplicate = index.find_duplicate(edited)
+        assert duplicate is not None
+        assert duplicate['key'] == 'a1'
+    
+    def test_different_article_not_flagged(self, index):
+        """Test unrelated content is not a duplicate."""
+        other = (
+            "Hemp seed oil is cold pressed from whole seeds and is rich in omega-3 and omega-6 fatty acids. "
+            "It has a nutty flavor that suits salad dressings, and it should not be used for frying."
+        )
+        assert index.find_duplicate(other) is None
+    
+    def test_clusters_existing_corpus(self, index):
+        """Test batch clustering groups near-duplicates."""
+        index.add('a2', ARTICLE.replace('quickly', 'fast'))
+        index.add('b1', 'Hempcrete blocks insulate walls and lock away carbon for decades.')
+        clusters = index.clusters()
+        assert len(clusters) == 1
+        assert {member['key'] for member in clusters[0]} == {'a1', 'a2'}
+    
+    def test_blocks_split_bits_evenly(self, index):
+        """Test the pigeonhole blocks cover all 64 bits with near-equal widths."""
+        widths = [bin(mask).count('1') for _, mask in index._block_spans]
+        assert sum(widths) == ContentDedupIndex.BITS
+        assert max(widths) - min(widths) <= 1
+        shifts = [shift for shift, _ in index._block_spans]
+        assert shifts == [sum(widths[:block]) for block in range(index.blocks)]
+    
+    def test_matches_at_max_distance(self, index):
+        """Test a fingerprint max_distance bits away is found wherever the bits flip."""
+        base = 0x0123456789ABCDEF
+        index.add('base', fingerprint=base)
+        # One flipped bit in each of max_distance blocks, including the widest (last) one
+        flipped = base
+        for shift, _ in index._block_spans[-index.max_distance:]:
+            flipped ^= 1 << shift
+        matches = index.query(fingerprint=flipped, limit=10)
+        assert 'base' in {match['key'] for match in matches}
+        assert index.query(fingerprint=flipped ^ (1 << index._block_spans[0][0]), limit=10, exclude_key='a1') == []
@@ -0,0 +1,78 @@
+"""Tests for token-budgeted prompt assembly."""
+
+import json
+
+from agents.utils.prompt_budget import (
+    PromptBuilder, compact, compact_json, count_tokens, strip_html, truncate_to_tokens
+)
+
+
+class TestCompaction:
+    """Test HTML stripping and JSON compaction."""
+
+    def test_strip_html_drops_boilerplate(self):
+        """Test scripts, navigation and tags are removed but text is kept."""
+        markup = (
+            "<html><head><style>p {color: red}</style><script>track()</script></head>"
+            "<body><nav><a href='/'>Home</a> | <a href='/shop'>Shop</a></nav>"
+            "<!-- banner --><h1>Hempcrete&nbsp;Blocks</h1><p>Carbon   negative <b>walls</b>.</p>"
+            "<footer>&copy; 2024 Example</footer></body></html>"
+        )
+        text = strip_html(markup)
+        assert text == "Hempcrete\xa0Blocks\nCarbon negative walls."
+        assert strip_html("Plain text ") == "Plain text"
+
+    def test_compact_json_removes_empty_fields(self):
+        """Test null and empty values are dropped and whitespace removed."""
+        report = {'summary': {'score': 92, 'notes': None}, 'violations': [], 'tags': ['a', '', None],
+                  'period': {'start': '2024-01-01', 'end': ''}}
+        assert compact(report) == {'summary': {'score': 92}, 'tags': ['a'], 'period': {'start': '2024-01-01'}}
+        text = compact_json(report)
+        assert ' ' not in text and '\n' not in text
+        assert json.loads(text) == compact(report)
+
+
+class TestPromptBuilder:
+    """Test fitting fields into a token budget."""
+
+    def test_fields_within_budget_are_kept(self):
+        """Test fields that fit are rendered whole and in insertion order."""
+        fields = PromptBuilder(200)\
+            .add('industry', 'Construction', priority=1)\
+            .add('benefits', ['Insulating', 'Fire resistant'], priority=0)\
+            .add('specs', {'density': 330, 'unit': None})\
+            .add('missing', None)\
+            .build()
+        assert list(fields) == ['industry', 'benefits', 'specs', 'missing']
+        assert fields['benefits'] == 'Insulating, Fire resistant'
+        assert fields['specs'] == '{"density":330}'
+        assert fields['missing'] == ''
+
+    def test_low_priority_fields_are_cut_first(self):
+        """Test the budget goes to high priority fields before long content."""
+        content = ' '.join(['hemp fiber insulation'] * 400)
+        fields = PromptBuilder(120)\
+            .add('content', content, priority=2)\
+            .add('title', 'Hemp wool batts', priority=0)\
+            .add('benefits', [f"benefit number {i}" for i in range(50)], priority=1)\
+            .build()
+        assert fields['title'] == 'Hemp wool batts'
+        assert 0 < len(fields['benefits'].split(', ')) < 50
+        assert sum(count_tokens(text) for text in fields.values()) <= 120
+
+    def test_field_dropped_below_min_tokens(self):
+        """Test a field is left out rather than cut to a useless stub."""
+        fields = PromptBuilder(40, min_tokens=24)\
+            .add('description', 'word ' * 30, priority=0)\
+            .add('content', 'more words ' * 50, priority=1)\
+            .build()
+        assert fields['description']
+        assert fields['content'] == ''
+
+    def test_truncate_to_tokens(self):
+        """Test truncation respects the limit and marks the cut."""
+        text = ' '.join(f"word{i}" for i in range(500))
+        cut = truncate_to_tokens(text, 50)
+        assert cut.endswith('…')
+        assert count_tokens(cut) <= 50
+        assert truncate_to_tokens('short text', 50) == 'short text'
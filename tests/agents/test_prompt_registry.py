@@ -0,0 +1,82 @@
+"""Tests for the compiled prompt template registry."""
+
+import os
+
+import pytest
+
+from agents.utils.prompt_registry import PromptRegistry, PromptTemplate, PromptTemplateError
+
+
+class TestPromptTemplate:
+    """Test template compilation and rendering."""
+
+    def test_render_matches_format(self):
+        """Test rendering gives the same text as str.format."""
+        source = "Write about {product_name} in {word_count:,} words.\nOutput: {{\"title\": \"...\"}}"
+        template = PromptTemplate('test.prompt', source)
+        assert template.placeholders == {'product_name', 'word_count'}
+        assert template.render(product_name='Hempcrete', word_count=1500) == \
+            source.format(product_name='Hempcrete', word_count=1500)
+
+    def test_missing_value_raises(self):
+        """Test rendering without a placeholder value fails loudly."""
+        template = PromptTemplate('test.prompt', "About {product_name} for {audience}")
+        with pytest.raises(PromptTemplateError, match='audience'):
+            template.render(product_name='Hemp oil')
+
+    def test_invalid_placeholder_rejected(self):
+        """Test attribute and index placeholders are rejected at compile time."""
+        with pytest.raises(PromptTemplateError):
+            PromptTemplate('test.prompt', "About {product[name]}")
+        with pytest.raises(PromptTemplateError):
+            PromptTemplate('test.prompt', "Unbalanced { brace")
+
+    def test_version_tracks_source(self):
+        """Test the version hash changes only with the source text."""
+        assert PromptTemplate('a', "Hi {name}").version == PromptTemplate('b', "Hi {name}").version
+        assert PromptTemplate('a', "Hi {name}").version != PromptTemplate('a', "Hello {name}").version
+
+
+class TestPromptRegistry:
+    """Test loading and hot reloading prompt files."""
+
+    @pytest.fixture
+    def prompts_dir(self, tmp_path):
+        """Create a prompts directory with one file."""
+        (tmp_path / 'content_prompts.yaml').write_text(
+            "blog:\n  system: You write about hemp.\n  user: Write about {product_name}.\n"
+        )
+        return tmp_path
+
+    def test_dotted_names(self, prompts_dir):
+        """Test templates are addressed by namespace and YAML path."""
+        registry = PromptRegistry(prompts_dir)
+        assert registry.render('content.blog.user', product_name='Hemp oil') == 'Write about Hemp oil.'
+        assert registry.section('content')['blog']['system'] == 'You write about hemp.'
+        with pytest.raises(KeyError):
+            registry.get('content.missing')
+
+    def test_hot_reload(self, prompts_dir):
+        """Test a changed file is recompiled and changes the version."""
+        registry = PromptRegistry(prompts_dir, reload_interval=0)
+        version = registry.version('content')
+
+        path = prompts_dir / 'content_prompts.yaml'
+        path.write_text("blog:\n  user: Describe {product_name} briefly.\n")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+
+        assert registry.render('content.blog.user', product_name='Hemp oil') == 'Describe Hemp oil briefly.'
+        assert not registry.has('content.blog.system')
+        assert registry.version('content') != version
+
+    def test_broken_file_keeps_previous(self, prompts_dir):
+        """Test a malformed template does not replace the loaded ones."""
+        registry = PromptRegistry(prompts_dir, reload_interval=0)
+
+        path = prompts_dir / 'content_prompts.yaml'
+        path.write_text("blog:\n  user: Broken {product_name\n")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+
+        assert registry.render('content.blog.user', product_name='Hemp oil') == 'Write about Hemp oil.'
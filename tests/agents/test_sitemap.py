@@ -0,0 +1,155 @@
+"""Tests for the streaming sitemap reader."""
+
+import asyncio
+import gzip
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from agents.seo.sitemap import SitemapReader, SitemapStreamParser
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(*locs):
+    entries = ''.join(f"<url><loc>{loc}</loc><lastmod>2024-01-01</lastmod></url>" for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{entries}</urlset>'.encode()
+
+
+def sitemap_index(*locs):
+    entries = ''.join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {NS}>{entries}</sitemapindex>'.encode()
+
+
+class FakeCrawler:
+    """Crawl scheduler stand-in that records the fetched sitemaps."""
+
+    headers = {'User-Agent': 'test'}
+
+    def __init__(self, robots=''):
+        self.robots = robots
+        self.fetched = []
+
+    async def robots_txt(self, url):
+        return self.robots
+
+    @asynccontextmanager
+    async def slot(self, url):
+        self.fetched.append(url)
+        yield
+
+
+class FakeSession:
+    """Serves documents in small chunks so entries span chunk boundaries."""
+
+    def __init__(self, documents, chunk_size=7):
+        self.documents = documents
+        self.chunk_size = chunk_size
+        self.chunks_served = 0
+
+    def get(self, url, **kwargs):
+        session = self
+
+        class Content:
+            async def iter_chunked(self, size):
+                body = session.documents[url]
+                for start in range(0, len(body), session.chunk_size):
+                    session.chunks_served += 1
+                    await asyncio.sleep(0)
+                    yield body[start:start + session.chunk_size]
+
+        class Response:
+            status = 200 if url in session.documents else 404
+            content = Content()
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        return Response()
+
+
+class TestSitemapStreamParser:
+    """Test incremental parsing."""
+
+    def test_gzip_in_chunks(self):
+        """Test gzipped sitemaps are inflated and parsed as bytes arrive."""
+        body = gzip.compress(urlset('https://a.com/1', 'https://a.com/2'))
+        parser = SitemapStreamParser()
+        entries = []
+        for start in range(0, len(body), 5):
+            entries += parser.feed(body[start:start + 5])
+        entries += parser.close()
+
+        assert parser.kind == 'urlset'
+        assert [(entry.loc, entry.lastmod) for entry in entries] == [
+            ('https://a.com/1', '2024-01-01'), ('https://a.com/2', '2024-01-01')
+        ]
+
+
+class TestSitemapReader:
+    """Test following sitemap indexes and streaming entries."""
+
+    @pytest.fixture
+    def documents(self):
+        return {
+            'https://a.com/sitemap.xml': sitemap_index('https://a.com/pages.xml', 'https://a.com/posts.xml.gz'),
+            'https://a.com/pages.xml': urlset('https://a.com/', 'https://a.com/about'),
+            'https://a.com/posts.xml.gz': gzip.compress(urlset(*(f"https://a.com/post/{i}" for i in range(50)))),
+        }
+
+    @pytest.mark.asyncio
+    async def test_follows_index_and_gzip_children(self, documents):
+        """Test every URL of an index and its (gzipped) children is streamed once."""
+        crawler = FakeCrawler('User-agent: *\nSitemap: https://a.com/sitemap.xml')
+        reader = SitemapReader(FakeSession(documents), crawler)
+
+        locs = [entry.loc async for entry in reader.iter_entries('https://a.com/')]
+
+        assert len(locs) == len(set(locs)) == 52
+        assert set(crawler.fetched) == set(documents)
+        assert reader.stats == {'sitemaps_fetched': 3, 'index_files': 1, 'errors': 0}
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_sitemap_xml(self, documents):
+        """Test ``/sitemap.xml`` is read when robots.txt lists no sitemaps."""
+        reader = SitemapReader(FakeSession(documents), FakeCrawler())
+        assert len(await reader.read_all('https://a.com/')) == 52
+
+    @pytest.mark.asyncio
+    async def test_stops_streaming_early(self, documents):
+        """Test closing the stream stops the downloads instead of reading every sitemap."""
+        documents['https://a.com/posts.xml.gz'] = gzip.compress(
+            urlset(*(f"https://a.com/post/{i}" for i in range(5000)))
+        )
+        session = FakeSession(documents)
+        reader = SitemapReader(session, FakeCrawler(), concurrency=1)
+
+        stream = reader.iter_entries('https://a.com/')
+        locs = []
+        async for entry in stream:
+            locs.append(entry.loc)
+            if len(locs) == 3:
+                break
+        await stream.aclose()
+        served = session.chunks_served
+        await asyncio.sleep(0.01)
+
+        assert len(locs) == 3
+        assert session.chunks_served == served
+        assert served < len(documents['https://a.com/posts.xml.gz']) // session.chunk_size
+
+    @pytest.mark.asyncio
+    async def test_malformed_child_is_skipped(self, documents):
+        """Test a broken child sitemap is counted as an error without stopping the others."""
+        documents['https://a.com/pages.xml'] = b'<urlset><url><loc>broken</urlset>'
+        reader = SitemapReader(FakeSession(documents), FakeCrawler())
+
+        locs = await reader.read_all('https://a.com/')
+
+        assert len(locs) == 50
+        assert reader.stats['errors'] == 1
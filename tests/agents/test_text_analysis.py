@@ -0,0 +1,113 @@
+"""Tests for single-pass SEO text analysis."""
+
+import pytest
+
+from agents.content.seo_optimizer import SEOOptimizer
+from agents.content.text_analysis import TextDocument, count_syllables
+
+
+ARTICLE = """# Hemp Oil Guide
+
+Hemp oil is pressed from hemp seeds. It is rich in omega fatty acids!
+
+## Benefits of Hemp Oil
+
+Many people use hemp oil for cooking. Is it healthy? Yes.
+
+## How to Use It
+
+Add it to salads and smoothies.
+
+## Storage
+
+Keep the bottle somewhere cool and dark.
+"""
+
+
+class TestCountSyllables:
+    """Test the syllable heuristic."""
+
+    def test_vowel_groups(self):
+        """Test consecutive vowels count once."""
+        assert count_syllables('beautiful') == 3
+
+    def test_silent_e_and_minimum(self):
+        """Test a trailing e is dropped but words keep one syllable."""
+        assert count_syllables('make') == 1
+        assert count_syllables('the') == 1
+        assert count_syllables('Rhythm') == 1
+
+
+class TestTextDocument:
+    """Test the shared document object."""
+
+    @pytest.fixture
+    def document(self):
+        """Analyze the sample article."""
+        return TextDocument(ARTICLE)
+
+    def test_headings(self, document):
+        """Test headings are parsed with their level."""
+        assert document.headings == [
+            (1, 'Hemp Oil Guide'),
+            (2, 'Benefits of Hemp Oil'),
+            (2, 'How to Use It'),
+            (2, 'Storage')
+        ]
+
+    def test_counts(self, document):
+        """Test words and sentences are counted once."""
+        assert document.word_count == len(ARTICLE.split())
+        assert document.sentence_count == 7
+
+    def test_keyword_density(self, document):
+        """Test density is case-insensitive occurrences per word."""
+        assert document.keyword_density('HEMP OIL') == pytest.approx(4 / document.word_count)
+        assert document.keyword_density('') == 0
+
+    def test_empty_document(self):
+        """Test empty text scores zero instead of dividing by zero."""
+        document = TextDocument('')
+        assert document.readability == 0
+        assert document.keyword_density('hemp') == 0
+
+
+class TestSEOOptimizerScores:
+    """Test SEOOptimizer scores derive from the document."""
+
+    @pytest.fixture
+    def optimizer(self):
+        """Create an optimizer."""
+        return SEOOptimizer()
+
+    def test_string_and_document_agree(self, optimizer):
+        """Test the string API matches the document API."""
+        document = optimizer.analyze(ARTICLE)
+        assert optimizer.calculate_readability_score(ARTICLE) == document.readability
+        assert optimizer._calculate_keyword_density(ARTICLE, 'hemp') == document.keyword_density('hemp')
+
+    def test_score_articles(self, optimizer):
+        """Test batch scoring matches scoring one article at a time."""
+        article = {
+            'id': 7,
+            'title': 'Hemp Oil Guide: Benefits, Uses and Storage Tips',
+            'meta_description': 'Everything about hemp oil.',
+            'content': ARTICLE,
+            'seo_keywords': ['hemp oil', 'hemp seeds']
+        }
+        [scores] = optimizer.score_articles([article])
+
+        document = TextDocument(ARTICLE)
+        expected = optimizer.calculate_seo_score(
+            {
+                'title': article['title'],
+                'meta_description': article['meta_description'],
+                'content': ARTICLE,
+                'keyword_density': document.keyword_density('hemp oil'),
+                'readability_score': document.readability
+            },
+            {'primary_keyword': 'hemp oil'}
+        )
+        assert scores['id'] == 7
+        assert scores['word_count'] == document.word_count
+        assert scores['seo_score'] == expected
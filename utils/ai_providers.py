@@ -28,6 +28,10 @@ class AIProvider(ABC):
     def get_cost(self, tokens: int, operation: str = 'generation') -> float:
         """Calculate cost for token usage."""
         pass
+    
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts (one call per text by default)."""
+        return [await self.embed(text) for text in texts]
 
 
 class OpenAIProvider(AIProvider):
@@ -59,6 +63,14 @@ class OpenAIProvider(AIProvider):
             input=text
         )
         return response.data[0].embedding
+    
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for many texts in a single request."""
+        response = await self.client.embeddings.create(
+            model=self.embedding_model,
+            input=texts
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
         
     def get_cost(self, tokens: int, operation: str = 'generation') -> float:
         """Calculate OpenAI costs."""
@@ -185,4 +197,11 @@ class MultiProviderAI:
         openai_provider = OpenAIProvider()
         embeddings = await openai_provider.embed(text)
         cost = openai_provider.get_cost(len(text) // 4, 'embedding')
-        return embeddings, cost
\ No newline at end of file
+        return embeddings, cost
+    
+    async def embed_batch(self, texts: List[str]) -> tuple[List[List[float]], float]:
+        """Generate embeddings for many texts in one request per provider call."""
+        provider = next((p for p in self.providers if isinstance(p, OpenAIProvider)), None) or OpenAIProvider()
+        embeddings = await provider.embed_batch(texts)
+        cost = provider.get_cost(sum(len(text) for text in texts) // 4, 'embedding')
+        return embeddings, cost
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from supabase import create_client
 from dotenv import load_dotenv
 
+from agents.utils.near_duplicates import load_product_index
+
 # Load environment variables
 load_dotenv()
 
@@ -174,6 +176,26 @@ class HempDataValidator:
         else:
             print("✅ No duplicates in main products")
     
+    def check_near_duplicates(self, threshold=0.7):
+        """Cluster products whose names/descriptions are near-identical"""
+        print("\n🧬 CHECKING FOR NEAR-DUPLICATES")
+        print("=" * 50)
+        
+        # Build a throwaway in-memory index over the whole catalog
+        index = load_product_index(self.supabase, path=':memory:', threshold=threshold)
+        clusters = index.clusters()
+        index.close()
+        
+        if clusters:
+            print(f"\n⚠️  Near-duplicate clusters in main products: {len(clusters)}")
+            for cluster in clusters[:5]:
+                names = ', '.join(member['name'] for member in cluster[:4])
+                print(f"   - {len(cluster)} products: {names}")
+        else:
+            print("✅ No near-duplicates in main products")
+        
+        return clusters
+    
     def generate_report(self):
         """Generate a comprehensive validation report"""
         print("\n" + "="*60)
@@ -192,6 +214,7 @@ class HempDataValidator:
         
         # Check duplicates
         self.check_duplicates()
+        self.check_near_duplicates()
         
         # Summary
         print("\n" + "="*60)